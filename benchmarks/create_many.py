@@ -0,0 +1,56 @@
+"""Benchmark building a 10k row `create_many` query.
+
+Usage: python benchmarks/create_many.py [rows] [repeat]
+
+Only the query builder is measured, no query engine is spawned.
+"""
+
+import sys
+import timeit
+import tracemalloc
+
+from miniature.prisma import models
+from miniature.prisma._builder import QueryBuilder
+from miniature.prisma.metadata import PRISMA_MODELS, RELATIONAL_FIELD_MAPPINGS
+
+
+def make_rows(count: int):
+    return [
+        {
+            'name': f'player-{i}',
+            'rating': i % 3000,
+            'rank': {'connect': {'id': i % 8}},
+        }
+        for i in range(count)
+    ]
+
+
+def build(rows) -> str:
+    builder = QueryBuilder(
+        method='create_many',
+        arguments={'data': rows, 'skip_duplicates': None},
+        model=models.Player,
+        root_selection=['count'],
+        prisma_models=PRISMA_MODELS,
+        relational_field_mappings=RELATIONAL_FIELD_MAPPINGS,
+    )
+    return builder.build()
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    rows = make_rows(count)
+
+    timings = timeit.repeat(lambda: build(rows), number=1, repeat=repeat)
+    print(f'create_many rows={count}: best {min(timings) * 1000:.1f} ms, worst {max(timings) * 1000:.1f} ms')
+
+    tracemalloc.start()
+    payload = build(rows)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f'payload {len(payload) / 1024:.0f} KiB, peak allocations {peak / 1024:.0f} KiB')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""Benchmark concurrent reads while a single writer updates players, per SQLite profile.
+
+Usage: python benchmarks/sqlite_profile.py [seconds] [readers] [engines]
+
+Every profile runs against its own copy of `src/miniature/database.sqlite` so the
+journal mode of the real database is left untouched. Requires the query engine binary.
+"""
+
+import sys
+import time
+import shutil
+import asyncio
+import tempfile
+from pathlib import Path
+from statistics import quantiles
+
+from miniature.prisma import SQLITE_DEFAULT, SQLITE_CONCURRENT, Prisma, SQLiteProfile
+
+DATABASE = Path(__file__).resolve().parent.parent / 'src' / 'miniature' / 'database.sqlite'
+
+PROFILES = {
+    'default': SQLITE_DEFAULT,
+    'concurrent': SQLITE_CONCURRENT,
+}
+
+
+async def reader(db: Prisma, deadline: float, latencies: list) -> None:
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        await db.player.find_many(take=100, order={'rating': 'desc'}, include={'rank': True})
+        latencies.append(time.perf_counter() - start)
+
+
+async def writer(db: Prisma, deadline: float, errors: list) -> int:
+    writes = 0
+    while time.perf_counter() < deadline:
+        try:
+            await db.player.update_many(data={'rating': {'increment': 1}}, where={'rating': {'lt': 1000}})
+        except Exception as exc:
+            errors.append(exc)
+        writes += 1
+    return writes
+
+
+async def run(name: str, profile: SQLiteProfile, seconds: float, readers: int, engines: int) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / 'database.sqlite'
+        shutil.copyfile(DATABASE, path)
+
+        db = Prisma(
+            datasource={'url': f'file:{path}'},
+            sqlite_profile=profile,
+            engine_pool_size=engines,
+        )
+        await db.connect()
+        try:
+            latencies: list = []
+            errors: list = []
+            deadline = time.perf_counter() + seconds
+            results = await asyncio.gather(
+                writer(db, deadline, errors),
+                *(reader(db, deadline, latencies) for _ in range(readers)),
+            )
+        finally:
+            await db.disconnect()
+
+    p50, p95 = (quantiles(latencies, n=100)[i] for i in (49, 94)) if len(latencies) > 1 else (0.0, 0.0)
+    print(
+        f'{name:<10} reads/s {len(latencies) / seconds:8.1f}  p50 {p50 * 1000:6.1f} ms  p95 {p95 * 1000:6.1f} ms'
+        f'  writes/s {results[0] / seconds:6.1f}  write errors {len(errors)}'
+    )
+
+
+def main() -> None:
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 10.0
+    readers = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    engines = int(sys.argv[3]) if len(sys.argv) > 3 else 1
+
+    print(f'{readers} readers & 1 writer for {seconds:.0f}s, {engines} engine(s) per client')
+    for name, profile in PROFILES.items():
+        asyncio.run(run(name, profile, seconds, readers, engines))
+
+
+if __name__ == '__main__':
+    main()
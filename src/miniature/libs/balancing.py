@@ -0,0 +1,216 @@
+import heapq
+import time
+from bisect import bisect_left
+from itertools import combinations
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple, TypeVar
+
+T = TypeVar('T')
+
+# Lobbies up to this many players (10v10 + headroom) are solved exactly with
+# meet-in-the-middle; anything larger goes through differencing + local search.
+EXACT_MAX_PLAYERS = 24
+DEFAULT_TIME_BUDGET_MS = 50.0
+
+Partition = Tuple[List[int], List[int]]
+Solver = Callable[[Sequence[int], float], Partition]
+
+
+class BalanceResult(NamedTuple):
+    team_1: list
+    team_2: list
+    diff: int
+    solver: str
+
+
+def _partition_diff(ratings: Sequence[int], partition: Partition) -> int:
+    left, right = partition
+    return abs(sum(ratings[i] for i in left) - sum(ratings[i] for i in right))
+
+
+def _greedy(ratings: Sequence[int], deadline: float) -> Partition:
+    """Sort-then-greedy with an equal size cap, kept as a baseline solver."""
+    order = sorted(range(len(ratings)), key=lambda i: ratings[i], reverse=True)
+    max_per_team = (len(ratings) + 1) // 2
+
+    left: List[int] = []
+    right: List[int] = []
+    sum_l = sum_r = 0
+    for i in order:
+        if len(left) >= max_per_team:
+            right.append(i)
+            sum_r += ratings[i]
+        elif len(right) >= max_per_team or sum_l <= sum_r:
+            left.append(i)
+            sum_l += ratings[i]
+        else:
+            right.append(i)
+            sum_r += ratings[i]
+    return left, right
+
+
+def _karmarkar_karp(ratings: Sequence[int], deadline: float) -> Partition:
+    """Balanced largest differencing method followed by pairwise swap refinement.
+
+    Players are paired off by rating (1 vs 1) and the pairs are merged by
+    repeatedly differencing the two largest gaps, which keeps team sizes equal.
+    The result is then improved with best-improvement swaps until no swap
+    reduces the gap or the time budget runs out.
+    """
+    n = len(ratings)
+    order = sorted(range(n), key=lambda i: ratings[i], reverse=True)
+    if n % 2:
+        # a virtual zero-rated player keeps the pairing step balanced
+        order.append(-1)
+
+    def value(i: int) -> int:
+        return ratings[i] if i >= 0 else 0
+
+    heap: List[Tuple[int, int, List[int], List[int]]] = []
+    for seq, k in enumerate(range(0, len(order), 2)):
+        a, b = order[k], order[k + 1]
+        heapq.heappush(heap, (-(value(a) - value(b)), seq, [a], [b]))
+
+    seq = len(heap)
+    while len(heap) > 1:
+        d1, _, a1, b1 = heapq.heappop(heap)
+        d2, _, a2, b2 = heapq.heappop(heap)
+        # both diffs are stored negated; the larger side absorbs the smaller's light side
+        heapq.heappush(heap, (d1 - d2, seq, a1 + b2, b1 + a2))
+        seq += 1
+
+    _, _, left, right = heap[0]
+    left = [i for i in left if i >= 0]
+    right = [i for i in right if i >= 0]
+    return _refine_swaps(ratings, (left, right), deadline)
+
+
+def _refine_swaps(ratings: Sequence[int], partition: Partition, deadline: float) -> Partition:
+    left, right = list(partition[0]), list(partition[1])
+    diff = sum(ratings[i] for i in left) - sum(ratings[i] for i in right)
+
+    while diff and time.perf_counter() < deadline:
+        # swapping a (left) with b (right) changes the diff by -2 * (a - b),
+        # so the best swap has a - b as close to diff / 2 as possible
+        by_rating = sorted(range(len(right)), key=lambda j: ratings[right[j]])
+        right_values = [ratings[right[j]] for j in by_rating]
+
+        best: Optional[Tuple[int, int, int]] = None
+        for li, player in enumerate(left):
+            target = ratings[player] - diff / 2
+            pos = bisect_left(right_values, target)
+            for k in (pos - 1, pos):
+                if 0 <= k < len(right_values):
+                    new_diff = diff - 2 * (ratings[player] - right_values[k])
+                    if best is None or abs(new_diff) < abs(best[0]):
+                        best = (new_diff, li, by_rating[k])
+
+        if best is None or abs(best[0]) >= abs(diff):
+            break
+
+        diff, li, rj = best
+        left[li], right[rj] = right[rj], left[li]
+
+    return left, right
+
+
+def _subset_sums(ratings: Sequence[int], indices: Sequence[int]) -> Dict[int, List[Tuple[int, Tuple[int, ...]]]]:
+    """All subset sums of `indices` grouped by subset size."""
+    sums: Dict[int, List[Tuple[int, Tuple[int, ...]]]] = {}
+    for size in range(len(indices) + 1):
+        sums[size] = [(sum(ratings[i] for i in combo), combo) for combo in combinations(indices, size)]
+    return sums
+
+
+def _meet_in_the_middle(ratings: Sequence[int], deadline: float) -> Partition:
+    """Exact equal-size partition minimising the rating gap.
+
+    Both halves of the lobby enumerate their subset sums per size; for every
+    left subset the matching right subset is found by bisecting the sorted
+    sums, giving O(2^(n/2) * n) work instead of O(2^n).
+    """
+    n = len(ratings)
+    team_size = n // 2
+    total = sum(ratings)
+    mid = n // 2
+    left_sums = _subset_sums(ratings, range(mid))
+    right_sums = _subset_sums(ratings, range(mid, n))
+
+    # seed with the heuristic answer so a blown budget still returns something sane
+    best_partition = _karmarkar_karp(ratings, deadline)
+    best_diff = _partition_diff(ratings, best_partition)
+    best_team: Optional[Tuple[int, ...]] = None
+
+    for k, left_options in left_sums.items():
+        needed = team_size - k
+        if needed < 0 or needed not in right_sums:
+            continue
+
+        candidates = sorted(right_sums[needed])
+        values = [s for s, _ in candidates]
+        for left_sum, left_combo in left_options:
+            # we want left_sum + right_sum as close to total / 2 as possible
+            target = total / 2 - left_sum
+            pos = bisect_left(values, target)
+            for j in (pos - 1, pos):
+                if 0 <= j < len(values):
+                    diff = abs(total - 2 * (left_sum + values[j]))
+                    if diff < best_diff:
+                        best_diff = diff
+                        best_team = left_combo + candidates[j][1]
+
+            if best_diff <= total % 2 or time.perf_counter() >= deadline:
+                break
+        else:
+            continue
+        break
+
+    if best_team is None:
+        return best_partition
+
+    chosen = set(best_team)
+    return [i for i in range(n) if i in chosen], [i for i in range(n) if i not in chosen]
+
+
+SOLVERS: Dict[str, Solver] = {
+    'greedy': _greedy,
+    'karmarkar_karp': _karmarkar_karp,
+    'exact': _meet_in_the_middle,
+}
+
+
+def register_solver(name: str, solver: Solver) -> None:
+    SOLVERS[name] = solver
+
+
+def balance_teams(
+    players: Sequence[T],
+    *,
+    key: Callable[[T], int] = lambda p: p.rating,  # type: ignore[attr-defined]
+    mode: str = 'auto',
+    time_budget_ms: float = DEFAULT_TIME_BUDGET_MS,
+) -> BalanceResult:
+    """Split `players` into two teams of equal size (differing by at most one)
+    with the smallest possible rating gap.
+
+    `mode` is either a key of `SOLVERS` or `'auto'`, which picks the exact
+    solver for lobbies up to `EXACT_MAX_PLAYERS` and Karmarkar-Karp otherwise.
+    Every solver stops refining once `time_budget_ms` has elapsed.
+    """
+    if mode == 'auto':
+        mode = 'exact' if len(players) <= EXACT_MAX_PLAYERS else 'karmarkar_karp'
+
+    try:
+        solver = SOLVERS[mode]
+    except KeyError:
+        raise ValueError(f'Unknown balancing mode {mode!r}, expected one of {sorted(SOLVERS)}') from None
+
+    ratings = [key(p) for p in players]
+    deadline = time.perf_counter() + time_budget_ms / 1000
+    left, right = solver(ratings, deadline) if players else ([], [])
+
+    return BalanceResult(
+        team_1=[players[i] for i in left],
+        team_2=[players[i] for i in right],
+        diff=_partition_diff(ratings, (left, right)),
+        solver=mode,
+    )
@@ -1,11 +1,209 @@
-from miniature.prisma import Prisma
+import asyncio
+import atexit
+import concurrent.futures
+import os
+import threading
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Optional
+
+from miniature.prisma import SQLITE_CONCURRENT, Prisma, QueryCache, QueryDispatcher
+from miniature.prisma.engine import EngineAddress, SyncQueryEngine
+
+
+# a single engine process saturates one core, reads are spread over a few of them
+ENGINE_POOL_SIZE = max(1, min(4, (os.cpu_count() or 1) // 2))
+
+# seconds the engines are kept warm after the last session using them ends, long
+# enough to span reruns and page switches
+ENGINE_IDLE_TIMEOUT = 300.0
+
+
+class _SharedEngine:
+    def __init__(self, engines: List[SyncQueryEngine]) -> None:
+        self.engines = engines
+        self.refs = 0
+        self.idle_timer: Optional[threading.Timer] = None
+
+    @property
+    def addresses(self) -> List[EngineAddress]:
+        return [engine.address for engine in self.engines]
+
+    def is_alive(self) -> bool:
+        return all(engine.process is not None and engine.process.poll() is None for engine in self.engines)
+
+    def close(self) -> None:
+        for engine in self.engines:
+            engine.close()
+
+
+# warm query engines for the whole process, every session uses the same client
+# settings so they all share these and Streamlit reruns only borrow them.
+# Engines are only ever stopped once no session references them, dead engines
+# that are still referenced are replaced here and stopped when their last
+# session ends. `_lock` is never held while an engine starts or stops
+_shared: Optional[_SharedEngine] = None
+_spawning: Optional['concurrent.futures.Future[None]'] = None
+_lock = threading.Lock()
+
+# shared by every session so identical reads, e.g. the leaderboard on a dashboard
+# refresh, are only sent once and the engine is not flooded by concurrent reruns.
+# Reads that are auto-batched with other reads are only deduplicated within a session
+dispatcher = QueryDispatcher(max_concurrency=32)
+
+# reads are served from here until they expire or a session changes the models they
+# read, every write in the app goes through these clients
+cache = QueryCache(ttl=30)
+
 
 def get_db_client():
-    db = Prisma()
+    db = Prisma(
+        engine_transport='uds',
+        hydration='trusted',
+        dispatcher=dispatcher,
+        auto_batch=True,
+        cache=cache,
+        # WAL so that reruns keep reading while a session writes, one connection per engine
+        sqlite_profile=SQLITE_CONCURRENT,
+    )
     return db
 
 async def connect():
     db = get_db_client()
     if not db.is_connected():
         await db.connect()
-    return db
\ No newline at end of file
+    return db
+
+
+async def _acquire_engines(db: Prisma) -> _SharedEngine:
+    """Returns a reference to the shared engines, starting them in the background if needed."""
+    global _shared, _spawning
+
+    while True:
+        dead = None
+        with _lock:
+            shared = _shared
+            if shared is not None and not shared.is_alive():
+                _shared = None
+                if shared.refs == 0:
+                    _cancel_idle_timer(shared)
+                    dead = shared
+                shared = None
+
+            if shared is not None:
+                _cancel_idle_timer(shared)
+                shared.refs += 1
+                return shared
+
+            spawning = _spawning
+            if spawning is None:
+                spawning = _spawning = concurrent.futures.Future()
+                threading.Thread(target=_spawn_engines, args=(db, spawning), daemon=True).start()
+
+        if dead is not None:
+            _close_in_background(dead)
+
+        # raises if the engines could not be started, the next session tries again
+        await asyncio.wrap_future(spawning)
+
+
+def _spawn_engines(db: Prisma, spawning: 'concurrent.futures.Future[None]') -> None:
+    global _shared, _spawning
+
+    # started concurrently as each engine takes a while to boot
+    with concurrent.futures.ThreadPoolExecutor(max_workers=ENGINE_POOL_SIZE) as executor:
+        futures = [executor.submit(db.spawn_shared_engine) for _ in range(ENGINE_POOL_SIZE)]
+
+    engines = [future.result() for future in futures if future.exception() is None]
+    error = next((future.exception() for future in futures if future.exception() is not None), None)
+    if error is not None:
+        for engine in engines:
+            engine.close()
+
+    with _lock:
+        _spawning = None
+        if error is None:
+            _shared = _SharedEngine(engines)
+
+    if error is not None:
+        spawning.set_exception(error)
+    else:
+        spawning.set_result(None)
+
+
+def _release_engines(shared: _SharedEngine) -> None:
+    with _lock:
+        assert shared.refs > 0, 'engines released more often than they were acquired'
+        shared.refs -= 1
+        if shared.refs:
+            return
+
+        if _shared is not shared:
+            # replaced while in use as it died, nothing else can reach it anymore
+            stop = True
+        else:
+            stop = False
+            shared.idle_timer = timer = threading.Timer(ENGINE_IDLE_TIMEOUT, _stop_idle, args=(shared,))
+            timer.daemon = True
+            timer.start()
+
+    if stop:
+        _close_in_background(shared)
+
+
+def _close_in_background(shared: _SharedEngine) -> None:
+    # stopping an engine waits for its process to exit
+    threading.Thread(target=shared.close, daemon=True).start()
+
+
+def _cancel_idle_timer(shared: _SharedEngine) -> None:
+    if shared.idle_timer is not None:
+        shared.idle_timer.cancel()
+        shared.idle_timer = None
+
+
+def _stop_idle(shared: _SharedEngine) -> None:
+    global _shared
+
+    with _lock:
+        # a session may have acquired the engines while the timer was firing
+        if shared.refs or shared.idle_timer is None:
+            return
+
+        shared.idle_timer = None
+        if _shared is shared:
+            _shared = None
+
+    shared.close()
+
+
+@atexit.register
+def shutdown() -> None:
+    global _shared
+
+    with _lock:
+        shared = _shared
+        _shared = None
+        if shared is not None:
+            _cancel_idle_timer(shared)
+
+    if shared is not None:
+        shared.close()
+
+
+@asynccontextmanager
+async def session() -> AsyncIterator[Prisma]:
+    """Yields a client attached to the process-wide query engines.
+
+    Unlike `async with Prisma():` this does not spawn (and tear down) query
+    engines per script rerun; every session gets its own HTTP connection pools,
+    bound to the current event loop, talking to the same warm engines.
+    """
+    db = get_db_client()
+    shared = await _acquire_engines(db)
+    try:
+        # the engine processes belong to the shared owner, the client only holds HTTP sessions
+        db.attach_to(shared.addresses)
+        yield db
+    finally:
+        await db.disconnect()
+        _release_engines(shared)
@@ -1,18 +1,71 @@
-from typing import Tuple, Union, Optional, List, Unpack
+import time
+from bisect import bisect_right
+from typing import Any, Dict, Mapping, Tuple, Union, Optional, List, Sequence, Unpack
 
 from miniature.prisma import Prisma
 from miniature.prisma.models import Rank as RankModel, Player as PlayerModel
 from miniature.prisma.types import RankUpdateInput, PlayerUpdateInput
+from miniature.libs.pool import PlayerPool, PoolPlayer
+
+
+class _RankTable:
+    """Ranks sorted by `min_rating` so a rating resolves with a single bisect."""
+
+    def __init__(self, ranks: Sequence[RankModel]) -> None:
+        self._ranks = sorted(ranks, key=lambda r: r.min_rating)
+        self._min_ratings = [r.min_rating for r in self._ranks]
+
+    def lookup(self, rating: int) -> Optional[RankModel]:
+        i = bisect_right(self._min_ratings, rating) - 1
+        return self._ranks[i] if i >= 0 else None
+
+
+# process-wide caches, loaded lazily on first use and kept in sync (or
+# dropped) by the mutation helpers below
+_rank_table: Optional[_RankTable] = None
+_player_pool: Optional[PlayerPool] = None
+
+# writes that bypass the helpers (other processes, raw SQL) are only picked up
+# once the pool is reloaded, so it is never kept for longer than this
+PLAYER_POOL_TTL = 30.0
+_player_pool_expires_at = 0.0
+
+
+async def _get_rank_table(db: Prisma) -> _RankTable:
+    global _rank_table
+    if _rank_table is None:
+        _rank_table = _RankTable(await db.rank.find_many())
+    return _rank_table
+
+
+def _invalidate_rank_caches() -> None:
+    # player pool entries carry the rank name, so they go stale with the ranks
+    global _rank_table, _player_pool
+    _rank_table = None
+    _player_pool = None
+
+
+def _sync_player_pool(player: Optional[PlayerModel]) -> None:
+    # read once, the global can be dropped by another session at any time
+    pool = _player_pool
+    if pool is not None and player is not None:
+        pool.update(PoolPlayer.from_model(player))
+
 
 class Rank:
     @staticmethod
     async def get_by_mmr(db: Prisma, rating: int) -> Tuple[bool, Union[Exception, Optional[RankModel]]]:
         try:
-            rank = await db.rank.find_first(
-                where={'min_rating': {'lte': rating}}, 
-                order={'min_rating': 'desc'}
-            )
-            return True, rank
+            table = await _get_rank_table(db)
+            return True, table.lookup(rating)
+        except Exception as e:
+            return False, e
+
+    @staticmethod
+    async def ranks_for_ratings(db: Prisma, ratings: List[int]) -> Tuple[bool, Union[Exception, List[Optional[RankModel]]]]:
+        try:
+            table = await _get_rank_table(db)
+            return True, [table.lookup(rating) for rating in ratings]
         except Exception as e:
             return False, e
         
@@ -24,6 +77,15 @@ class Rank:
         except Exception as e:
             return False, e
 
+    @staticmethod
+    async def get_table(db: Prisma) -> Tuple[bool, Union[Exception, Dict[str, List[Any]]]]:
+        """All ranks as columns, ready for `pd.DataFrame`."""
+        try:
+            columns = await db.rank.find_many_columns()
+            return True, columns
+        except Exception as e:
+            return False, e
+
     @staticmethod
     async def get_by_name(db: Prisma, value: str) -> Tuple[bool, Union[Exception, Optional[RankModel]]]:
         try:
@@ -36,6 +98,7 @@ class Rank:
     async def create(db: Prisma, name: str, min_rating: int) -> Tuple[bool, Union[Exception, RankModel]]:
         try:
             rank = await db.rank.create(data={'name': name, 'min_rating': min_rating})
+            _invalidate_rank_caches()
             return True, rank
         except Exception as e:
             return False, e 
@@ -44,6 +107,7 @@ class Rank:
     async def delete_by_name(db: Prisma, name: str) -> Tuple[bool, Union[Exception, Optional[RankModel]]]:
         try:
             rank = await db.rank.delete(where={'name': name})
+            _invalidate_rank_caches()
             return True, rank
         except Exception as e:
             return False, e
@@ -52,6 +116,7 @@ class Rank:
     async def update_by_name(db: Prisma, name: str, **kwargs: Unpack[RankUpdateInput]) -> Tuple[bool, Union[Exception, Optional[RankModel]]]:
         try:
             rank = await db.rank.update(where={'name': name}, data=kwargs)
+            _invalidate_rank_caches()
             return True, rank
         except Exception as e:
             return False, e
@@ -60,6 +125,7 @@ class Rank:
     async def update(db: Prisma, rank_id: int, **kwargs: Unpack[RankUpdateInput]) -> Tuple[bool, Union[Exception, Optional[RankModel]]]:
         try:
             rank = await db.rank.update(where={'id': rank_id}, data=kwargs)
+            _invalidate_rank_caches()
             return True, rank
         except Exception as e:
             return False, e
@@ -74,11 +140,38 @@ class Player:
         except Exception as e:
             return False, e
 
+    @staticmethod
+    async def get_table(db: Prisma) -> Tuple[bool, Union[Exception, Dict[str, List[Any]]]]:
+        """All players by rating as `id`, `name`, `rating`, `rank_id` & `rank_name` columns.
+
+        Built straight from the engine response, no model is created per player.
+        """
+        try:
+            columns = await db.player.find_many_columns(include={'rank': True}, order={'rating': 'desc'})
+            table = {key: columns[key] for key in ('id', 'name', 'rating', 'rank_id')}
+            table['rank_name'] = [name if name is not None else 'Unranked' for name in columns['rank.name']]
+            return True, table
+        except Exception as e:
+            return False, e
+
+    @staticmethod
+    async def get_pool(db: Prisma) -> Tuple[bool, Union[Exception, PlayerPool]]:
+        global _player_pool, _player_pool_expires_at
+        try:
+            pool = _player_pool
+            if pool is None or time.monotonic() >= _player_pool_expires_at:
+                players = await db.player.find_many(include={'rank': True})
+                pool = _player_pool = PlayerPool.from_models(players)
+                _player_pool_expires_at = time.monotonic() + PLAYER_POOL_TTL
+            return True, pool
+        except Exception as e:
+            return False, e
         
     @staticmethod
     async def update_by_name(db: Prisma, name: str, **kwargs: Unpack[PlayerUpdateInput]) -> Tuple[bool, Union[Exception, Optional[PlayerModel]]]:
         try:
-            player = await db.player.update(where={'name': name}, data=kwargs)
+            player = await db.player.update(where={'name': name}, data=kwargs, include={'rank': True})
+            _sync_player_pool(player)
             return True, player
         except Exception as e:
             return False, e
@@ -86,11 +179,115 @@ class Player:
     @staticmethod
     async def update(db: Prisma, player_id: int, **kwargs: Unpack[PlayerUpdateInput]) -> Tuple[bool, Union[Exception, Optional[PlayerModel]]]:
         try:
-            player = await db.player.update(where={'id': player_id}, data=kwargs)
+            player = await db.player.update(where={'id': player_id}, data=kwargs, include={'rank': True})
+            _sync_player_pool(player)
             return True, player
         except Exception as e:
             return False, e
 
+    @staticmethod
+    async def apply_edits(
+        db: Prisma,
+        player_ids: Sequence[int],
+        edited_rows: Mapping[Union[int, str], Mapping[str, Any]],
+    ) -> Tuple[bool, Union[Exception, Dict[int, Optional[Exception]]]]:
+        """Apply a `st.data_editor` `edited_rows` diff in a single batch request.
+
+        `player_ids` is the id column the editor was rendered from, `edited_rows` maps
+        their positions to the changed columns. Every row is applied on its own, the
+        result maps the id of each edited player to None or the error it failed with.
+        """
+        try:
+            changes: List[Tuple[int, Dict[str, Any]]] = []
+            for index, edits in edited_rows.items():
+                player_id = int(player_ids[int(index)])
+                data: Dict[str, Any] = {}
+                if 'name' in edits:
+                    data['name'] = edits['name']
+                if 'rating' in edits:
+                    data['rating'] = int(edits['rating'])
+                if data:
+                    changes.append((player_id, data))
+
+            outcomes: Dict[int, Optional[Exception]] = {}
+            if not changes:
+                return True, outcomes
+
+            rated = [data for _, data in changes if 'rating' in data]
+            success, ranks = await Rank.ranks_for_ratings(db, [data['rating'] for data in rated])
+            if not success:
+                raise ranks
+            for data, rank in zip(rated, ranks):
+                if rank is not None:
+                    data['rank_id'] = rank.id
+                    data['rank_name'] = rank.name
+
+            valid: List[Tuple[int, Dict[str, Any]]] = []
+            for player_id, data in changes:
+                if 'rating' in data and 'rank_id' not in data:
+                    outcomes[player_id] = ValueError(f"No valid rank found for rating {data['rating']}")
+                else:
+                    valid.append((player_id, data))
+
+            if not valid:
+                return True, outcomes
+
+            async with db.batch_(transaction=False) as batch:
+                results = [
+                    (player_id, data, batch.player.update(
+                        where={'id': player_id},
+                        data={k: v for k, v in data.items() if k != 'rank_name'},
+                    ))
+                    for player_id, data in valid
+                ]
+
+            pool = _player_pool
+            for player_id, data, result in results:
+                outcomes[player_id] = result.error
+                if result.ok and pool is not None:
+                    pool.patch(player_id, **data)
+
+            return True, outcomes
+        except Exception as e:
+            return False, e
+
+    @staticmethod
+    async def rerank_all(db: Prisma, batch_size: int = 1000) -> Tuple[bool, Union[Exception, int]]:
+        """Re-resolve the rank of every player, one page of players at a time.
+
+        Only pages with changed ranks are written, each in its own batched transaction.
+        Returns the number of players that changed rank.
+        """
+        try:
+            table = await _get_rank_table(db)
+            changed = 0
+            async for players in db.player.iter_batches(batch_size=batch_size):
+                updates: List[Tuple[int, RankModel]] = []
+                for player in players:
+                    rank = table.lookup(player.rating)
+                    if rank is None:
+                        raise ValueError(f'No valid rank found for rating {player.rating}')
+                    if rank.id != player.rank_id:
+                        updates.append((player.id, rank))
+
+                if not updates:
+                    continue
+
+                async with db.batch_() as batch:
+                    for player_id, rank in updates:
+                        batch.player.update(where={'id': player_id}, data={'rank_id': rank.id})
+
+                pool = _player_pool
+                if pool is not None:
+                    for player_id, rank in updates:
+                        pool.patch(player_id, rank_id=rank.id, rank_name=rank.name)
+
+                changed += len(updates)
+
+            return True, changed
+        except Exception as e:
+            return False, e
+
     @staticmethod
     async def get_by_name(db: Prisma, value: str) -> Tuple[bool, Union[Exception, Optional[PlayerModel]]]:
         try:
@@ -107,10 +304,33 @@ class Player:
                 raise Exception(f'Could not find the player named {name}')
             
             deleted_player = await db.player.delete(where={'id': player.id})
+            pool = _player_pool
+            if pool is not None:
+                pool.delete(player.id)
             return True, deleted_player
         except Exception as e:
             return False, e
     
+    @staticmethod
+    async def delete_many_by_name(db: Prisma, names: Sequence[str]) -> Tuple[bool, Union[Exception, Dict[str, Optional[Exception]]]]:
+        """Delete the named players in a single batch request, each on its own.
+
+        The result maps every name to None or the error its deletion failed with.
+        """
+        try:
+            async with db.batch_(transaction=False) as batch:
+                results = {name: batch.player.delete(where={'name': name}) for name in names}
+
+            pool = _player_pool
+            outcomes: Dict[str, Optional[Exception]] = {}
+            for name, result in results.items():
+                outcomes[name] = result.error
+                if result.ok and pool is not None:
+                    pool.delete(result.value.id)
+            return True, outcomes
+        except Exception as e:
+            return False, e
+
     @staticmethod
     async def create(db: Prisma, name: str, rating: int) -> Tuple[bool, Union[Exception, PlayerModel]]:
         try:
@@ -123,7 +343,8 @@ class Player:
                 'name': name, 
                 'rating': rating, 
                 'rank_id': rank.id
-            })
+            }, include={'rank': True})
+            _sync_player_pool(player)
             return True, player
         except Exception as e:
             return False, e
\ No newline at end of file
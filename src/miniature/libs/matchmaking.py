@@ -0,0 +1,60 @@
+from typing import Callable, Generic, List, NamedTuple, Optional, Sequence, TypeVar
+
+from miniature.libs.balancing import balance_teams
+
+T = TypeVar('T')
+
+DEFAULT_MATCH_TIME_BUDGET_MS = 5.0
+
+
+class Match(NamedTuple, Generic[T]):
+    team_1: List[T]
+    team_2: List[T]
+    diff: int
+
+
+class MatchmakingResult(NamedTuple, Generic[T]):
+    matches: List[Match[T]]
+    leftovers: List[T]
+
+
+def form_matches(
+    players: Sequence[T],
+    team_size: int,
+    *,
+    key: Callable[[T], int] = lambda p: p.rating,  # type: ignore[attr-defined]
+    max_spread: Optional[int] = None,
+    time_budget_ms: float = DEFAULT_MATCH_TIME_BUDGET_MS,
+) -> MatchmakingResult[T]:
+    """Partition the whole pool into as many `team_size` vs `team_size` matches as possible.
+
+    Players are sorted by rating once and consumed in consecutive windows of
+    `2 * team_size`, so everyone in a match is a rating neighbour. If
+    `max_spread` is given, a window whose highest and lowest ratings differ by
+    more than that is shifted by one player and the skipped player is left
+    over. Each window is then split by the balancing engine, which keeps the
+    whole pass at O(n log n) for a fixed team size.
+    """
+    if team_size < 1:
+        raise ValueError(f'team_size must be at least 1, got {team_size}')
+
+    match_size = team_size * 2
+    ordered = sorted(players, key=key)
+    ratings = [key(p) for p in ordered]
+
+    matches: List[Match[T]] = []
+    leftovers: List[T] = []
+
+    i = 0
+    while i + match_size <= len(ordered):
+        if max_spread is not None and ratings[i + match_size - 1] - ratings[i] > max_spread:
+            leftovers.append(ordered[i])
+            i += 1
+            continue
+
+        result = balance_teams(ordered[i : i + match_size], key=key, time_budget_ms=time_budget_ms)
+        matches.append(Match(team_1=result.team_1, team_2=result.team_2, diff=result.diff))
+        i += match_size
+
+    leftovers.extend(ordered[i:])
+    return MatchmakingResult(matches=matches, leftovers=leftovers)
@@ -0,0 +1,175 @@
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from miniature.prisma.models import Player as PlayerModel
+
+# inclusive (low, high) rating bounds, None means unbounded
+RATING_BUCKETS: Dict[str, Tuple[Optional[int], Optional[int]]] = {
+    'All': (None, None),
+    'Low': (None, 999),
+    'Mid': (1000, 2000),
+    'High': (2001, None),
+}
+
+
+class PoolPlayer(NamedTuple):
+    id: int
+    name: str
+    rating: int
+    rank_id: Optional[int]
+    rank_name: str
+
+    @classmethod
+    def from_model(cls, player: PlayerModel) -> 'PoolPlayer':
+        return cls(
+            id=player.id,
+            name=player.name,
+            rating=player.rating,
+            rank_id=player.rank_id,
+            rank_name=player.rank.name if player.rank else 'Unranked',
+        )
+
+
+class PlayerPool:
+    """In-memory player index ordered by (rating, id).
+
+    Ratings and ids are kept in parallel sorted `array`s so rating windows are
+    answered with two bisects plus a slice, i.e. O(log n + k), and inserts,
+    updates and deletes only shift the arrays instead of rebuilding them.
+
+    The pool is shared by every session, so reads and mutations hold a lock and
+    reads return copies that later mutations can't change.
+    """
+
+    def __init__(self, players: Iterable[PoolPlayer] = ()) -> None:
+        self._lock = threading.Lock()
+        self._players: Dict[int, PoolPlayer] = {p.id: p for p in players}
+        ordered = sorted(self._players.values(), key=lambda p: (p.rating, p.id))
+        self._ratings = array('q', (p.rating for p in ordered))
+        self._ids = array('q', (p.id for p in ordered))
+
+    @classmethod
+    def from_models(cls, players: Iterable[PlayerModel]) -> 'PlayerPool':
+        return cls(PoolPlayer.from_model(p) for p in players)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._ids)
+
+    def __iter__(self) -> Iterator[PoolPlayer]:
+        return iter(self.window())
+
+    def __contains__(self, player_id: object) -> bool:
+        with self._lock:
+            return player_id in self._players
+
+    @property
+    def ratings(self) -> array:
+        """Copy of the sorted rating column."""
+        with self._lock:
+            return array('q', self._ratings)
+
+    @property
+    def ids(self) -> array:
+        """Copy of the player ids in the same order as `ratings`."""
+        with self._lock:
+            return array('q', self._ids)
+
+    def get(self, player_id: int) -> Optional[PoolPlayer]:
+        with self._lock:
+            return self._players.get(player_id)
+
+    def _position(self, player: PoolPlayer) -> int:
+        # ratings can repeat, so walk the (short) run of equal ratings for the id
+        ids = self._ids
+        start = bisect_left(self._ratings, player.rating)
+        end = bisect_right(self._ratings, player.rating)
+        for i in range(start, end):
+            if ids[i] == player.id:
+                return i
+        raise KeyError(player.id)
+
+    def insert(self, player: PoolPlayer) -> None:
+        with self._lock:
+            self._update(player)
+
+    def update(self, player: PoolPlayer) -> None:
+        with self._lock:
+            self._update(player)
+
+    def patch(self, player_id: int, **changes: Any) -> Optional[PoolPlayer]:
+        """Replace fields of a pooled player, returns the new entry or None if it isn't pooled."""
+        with self._lock:
+            current = self._players.get(player_id)
+            if current is None:
+                return None
+
+            player = current._replace(**changes)
+            self._update(player)
+            return player
+
+    def delete(self, player_id: int) -> Optional[PoolPlayer]:
+        with self._lock:
+            return self._delete(player_id)
+
+    # the methods below expect the lock to be held
+
+    def _insert(self, player: PoolPlayer) -> None:
+        ratings = self._ratings
+        lo = bisect_left(ratings, player.rating)
+        hi = bisect_right(ratings, player.rating)
+        # keep ties ordered by id
+        pos = lo + bisect_left(self._ids[lo:hi], player.id)
+        ratings.insert(pos, player.rating)
+        self._ids.insert(pos, player.id)
+        self._players[player.id] = player
+
+    def _update(self, player: PoolPlayer) -> None:
+        current = self._players.get(player.id)
+        if current is None:
+            self._insert(player)
+            return
+
+        if current.rating == player.rating:
+            self._players[player.id] = player
+            return
+
+        self._delete(player.id)
+        self._insert(player)
+
+    def _delete(self, player_id: int) -> Optional[PoolPlayer]:
+        player = self._players.pop(player_id, None)
+        if player is None:
+            return None
+
+        pos = self._position(player)
+        del self._ratings[pos]
+        del self._ids[pos]
+        return player
+
+    def window(self, low: Optional[int] = None, high: Optional[int] = None) -> List[PoolPlayer]:
+        """All players with `low <= rating <= high`, ordered by rating."""
+        with self._lock:
+            start, end = self._span(low, high)
+            players = self._players
+            return [players[i] for i in self._ids[start:end]]
+
+    def count(self, low: Optional[int] = None, high: Optional[int] = None) -> int:
+        with self._lock:
+            start, end = self._span(low, high)
+            return max(end - start, 0)
+
+    def _span(self, low: Optional[int], high: Optional[int]) -> Tuple[int, int]:
+        ratings = self._ratings
+        start = 0 if low is None else bisect_left(ratings, low)
+        end = len(ratings) if high is None else bisect_right(ratings, high)
+        return start, end
+
+    def bucket(self, name: str) -> List[PoolPlayer]:
+        try:
+            low, high = RATING_BUCKETS[name]
+        except KeyError:
+            raise ValueError(f'Unknown rating bucket {name!r}, expected one of {list(RATING_BUCKETS)}') from None
+        return self.window(low, high)
@@ -5,52 +5,17 @@ import streamlit as st
 import pandas as pd
 
 from miniature.libs.database import Player
-from miniature.libs.connection import get_db_client
-from miniature.prisma.models import Player as PlayerModel
+from miniature.libs.balancing import balance_teams
+from miniature.libs.matchmaking import form_matches
+from miniature.libs.connection import session
+from miniature.libs.pool import PoolPlayer
 
 PAGE_CONFIG = {"title": "Auto Matchmaking", "icon": ":material/diversity_3:"}
 
 st.header(":material/all_match: Auto Matchmaking System")
 st.caption("Sistem pencarian match otomatis dengan penyeimbangan jumlah pemain & MMR.")
 
-def greedy_balance_teams(players: list[PlayerModel]) -> tuple[list[PlayerModel], list[PlayerModel]]:
-    """
-    Algoritma Greedy dengan Batasan Kapasitas (Equal Size Partitioning):
-    1. Urutkan player dari MMR tertinggi.
-    2. Tentukan kapasitas maksimal per tim (Total Pemain / 2).
-    3. Jika tim penuh, paksa masuk ke tim lawan.
-    4. Jika belum penuh, masukkan ke tim dengan MMR terendah.
-    """
-    sorted_players = sorted(players, key=lambda x: x.rating, reverse=True)
-    
-    team_1 = []
-    team_2 = []
-    sum_1 = 0
-    sum_2 = 0
-
-    max_per_team = (len(sorted_players) + 1) // 2
-
-    for player in sorted_players:
-        len_1 = len(team_1)
-        len_2 = len(team_2)
-
-        if len_1 >= max_per_team:
-            team_2.append(player)
-            sum_2 += player.rating
-        elif len_2 >= max_per_team:
-            team_1.append(player)
-            sum_1 += player.rating
-        else:
-            if sum_1 <= sum_2:
-                team_1.append(player)
-                sum_1 += player.rating
-            else:
-                team_2.append(player)
-                sum_2 += player.rating
-            
-    return team_1, team_2
-
-def display_team_stats(team_name: str, players: list[PlayerModel]):
+def display_team_stats(team_name: str, players: list[PoolPlayer]):
     """Menampilkan statistik tim dalam bentuk metrics dan dataframe."""
     count_p = len(players)
     if not players:
@@ -65,11 +30,10 @@ def display_team_stats(team_name: str, players: list[PlayerModel]):
 
     data = []
     for p in players:
-        rank_name = p.rank.name if p.rank else "Unranked"
         data.append({
             "Nickname": p.name,
             "MMR": p.rating,
-            "Rank": f"{rank_name}"
+            "Rank": p.rank_name
         })
     
     df = pd.DataFrame(data)
@@ -86,13 +50,11 @@ def display_team_stats(team_name: str, players: list[PlayerModel]):
     )
 
 async def main():
-    db = get_db_client()
-
-    async with db:
+    async with session() as db:
 
-        success, all_players = await Player.get_all(db)
+        success, player_pool = await Player.get_pool(db)
         if not success:
-            st.error(f"Gagal mengambil data database: {all_players}")
+            st.error(f"Gagal mengambil data database: {player_pool}")
             return
 
         with st.container(border=True):
@@ -116,22 +78,43 @@ async def main():
                     help="Contoh: Jika diisi 5, sistem akan mencari 10 pemain untuk 5 vs 5."
                 )
 
-        pool_players = []
-        if "Low" in rank_filter:
-            pool_players = [p for p in all_players if p.rating < 1000]
-        elif "Mid" in rank_filter:
-            pool_players = [p for p in all_players if 1000 <= p.rating <= 2000]
-        elif "High" in rank_filter:
-            pool_players = [p for p in all_players if p.rating > 2000]
-        else:
-            pool_players = all_players # All Ranks
+        pool_players = player_pool.bucket(rank_filter.split(" ")[0])
 
         total_needed = team_size * 2
         available_count = len(pool_players)
 
         st.caption(f"Status Pool: Ditemukan **{available_count}** pemain yang sesuai kriteria filter.")
 
-        if st.button(":material/search: Find Match", type="primary", width='stretch'):
+        col_btn_1, col_btn_2 = st.columns(2)
+        with col_btn_1:
+            find_one = st.button(":material/search: Find Match", type="primary", width='stretch')
+        with col_btn_2:
+            find_all = st.button(":material/stacks: Find All Matches", width='stretch')
+
+        if find_all:
+            result = form_matches(pool_players, team_size)
+            if not result.matches:
+                st.warning(f"Pemain tidak cukup untuk membentuk match {team_size} vs {team_size}.", icon=":material/warning:")
+            else:
+                st.success(f"{len(result.matches)} match terbentuk, {len(result.leftovers)} pemain tersisa.", icon=":material/check:")
+                st.dataframe(
+                    pd.DataFrame([
+                        {
+                            "Match": i + 1,
+                            "Team Red": ", ".join(p.name for p in match.team_1),
+                            "Team Blue": ", ".join(p.name for p in match.team_2),
+                            "Diff": match.diff,
+                        }
+                        for i, match in enumerate(result.matches)
+                    ]),
+                    column_config={
+                        "Diff": st.column_config.NumberColumn("Selisih MMR"),
+                    },
+                    hide_index=True,
+                    width='stretch'
+                )
+
+        if find_one:
             if available_count == 0:
                 st.warning("Tidak ada pemain sama sekali di kategori rank ini.", icon=":material/warning:")
             else:
@@ -145,7 +128,8 @@ async def main():
                     else:
                         match_participants = random.sample(pool_players, total_needed)
 
-                    team_a, team_b = greedy_balance_teams(match_participants)
+                    result = balance_teams(match_participants)
+                    team_a, team_b = result.team_1, result.team_2
 
                     st.success(f"Match Found! {len(team_a)} vs {len(team_b)}", icon=":material/check:")
                     
@@ -155,8 +139,7 @@ async def main():
                     with col_res_2:
                         display_team_stats("Team Blue", team_b)
 
-                    diff = abs(sum(p.rating for p in team_a) - sum(p.rating for p in team_b))
-                    st.info(f"Selisih Total MMR kedua tim: **{diff}** poin.", icon=":material/info:")
+                    st.info(f"Selisih Total MMR kedua tim: **{result.diff}** poin.", icon=":material/info:")
 
 if __name__ == "__main__":
     nest_asyncio.apply()
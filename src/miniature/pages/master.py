@@ -4,16 +4,14 @@ import streamlit as st
 import pandas as pd
 
 from miniature.libs.database import Player, Rank
-from miniature.libs.connection import get_db_client
+from miniature.libs.connection import session
 
 PAGE_CONFIG = {"title": "My Master Page", "icon": ":material/database:"}
 
 st.header(":material/database: Master Page")
 
 async def main():
-    db = get_db_client()
-
-    async with db:
+    async with session() as db:
         tab_1, tab_2 = st.tabs([':material/account_box: Players', ':material/badge: Ranks'])
         with tab_1:
             col_1, col_2, col_3 = st.columns(3)
@@ -47,37 +45,35 @@ async def main():
                                 st.warning('Please choose selected player.', icon=':material/warning:')
                                 return
                             
-                            for player_name in players_selected:
-                                success_p, player = await Player.delete_by_name(db, player_name)
-                                if not result or not player:
-                                    st.error(f'Error: {player}', icon=':material/warning:')
-                                    break
-                            
-                            st.success(f'Successfully removing {list(map(lambda name: name, players_selected))}', icon=':material/check:')
+                            success_p, outcomes = await Player.delete_many_by_name(db, players_selected)
+                            if not success_p:
+                                st.error(f'Error: {outcomes}', icon=':material/warning:')
+                                return
+
+                            for player_name, error in outcomes.items():
+                                if error is not None:
+                                    st.error(f'Error removing {player_name}: {error}', icon=':material/warning:')
+
+                            deleted = [name for name, error in outcomes.items() if error is None]
+                            if deleted:
+                                st.success(f'Successfully removing {deleted}', icon=':material/check:')
 
             st.divider()
 
-            success_p, list_p = await Player.get_all(db)
+            success_p, table_p = await Player.get_table(db)
 
             if not success_p:
-                st.error(f'Error {list_p}', icon=':material/error:')
+                st.error(f'Error {table_p}', icon=':material/error:')
             else:
-                if len(list_p) <= 0:
+                if len(table_p['id']) <= 0:
                     st.info('There is no player in the database.', icon=':material/info:')
-                
-                table_data = []
-                for p in list_p.copy():
-                    p_dict = p.model_dump()
-                    p_dict['rank_name'] = p.rank.name if p.rank else "Unranked"
-                    table_data.append(p_dict)
 
-                df_players = pd.DataFrame(table_data)
+                df_players = pd.DataFrame(table_p)
 
-                edited_players = st.data_editor(
+                st.data_editor(
                     df_players,
                     column_config={
                         "rank_id": None,
-                        "rank": None,
 
                         "id": st.column_config.TextColumn("ID", disabled=True),
                         "name": st.column_config.TextColumn("Name (Editable)", required=True),
@@ -96,25 +92,18 @@ async def main():
                     with col_3:
                         if st.button("Save Player Changes", icon=':material/edit:', width='stretch'):
                             with st.spinner("Updating database..."):
-                                for _, row in edited_players.iterrows():
-                                    success, rank = await Rank.get_by_mmr(db, int(row['rating']))
-                                    
-                                    if not success or not rank:
-                                        st.error(f"Error calculating rank for {row['name']}: {rank}", icon=':material/error:')
-                                        continue
-                                    
-                                    update_success, update_result = await Player.update(
-                                        db, 
-                                        int(row['id']),
-                                        id=int(row['id']),
-                                        name=row['name'],
-                                        rating=int(row['rating']),
-                                        rank_id=rank.id
-                                    )
+                                update_success, update_result = await Player.apply_edits(db, table_p['id'], edited_rows)
+
+                                if not update_success:
+                                    st.error(f"Failed to update players: {update_result}", icon=':material/error:')
+                                    return
+
+                                failed = {player_id: error for player_id, error in update_result.items() if error is not None}
+                                for player_id, error in failed.items():
+                                    st.error(f"Failed to update player {player_id}: {error}", icon=':material/error:')
+                                if failed:
+                                    return
 
-                                    if not update_success:
-                                        st.error(f"Failed to update {row['name']}: {update_result}", icon=':material/error:')
-                                
                                 st.success("All changes saved!", icon=':material/check:')
                                 st.rerun()
 
@@ -160,15 +149,15 @@ async def main():
 
             st.divider()
 
-            success_r, list_r = await Rank.get_all(db)
+            success_r, table_r = await Rank.get_table(db)
 
             if not success_r:
-                st.error(f'Error {list_r}', icon=':material/error:')
+                st.error(f'Error {table_r}', icon=':material/error:')
             else:
-                if len(list_r) <= 0:
+                if len(table_r['id']) <= 0:
                     st.info('There is no player in the database.', icon=':material/info:')
                 
-                df_ranks = pd.DataFrame([r.model_dump() for r in list_r.copy()])
+                df_ranks = pd.DataFrame(table_r)
 
                 edited_ranks = st.data_editor(
                     df_ranks,
@@ -11,6 +11,25 @@ from typing import TYPE_CHECKING
 from . import errors as errors
 from .utils import setup_logging
 from ._types import PrismaMethod as PrismaMethod
+from ._cache import (
+    CacheStats as CacheStats,
+    QueryCache as QueryCache,
+)
+from ._dispatch import (
+    DispatchStats as DispatchStats,
+    QueryDispatcher as QueryDispatcher,
+)
+from ._hydration import hydration as hydration
+from ._instrumentation import (
+    Instrumentation as Instrumentation,
+    HistogramSnapshot as HistogramSnapshot,
+    instrumentation as instrumentation,
+)
+from ._sqlite import (
+    SQLITE_DEFAULT as SQLITE_DEFAULT,
+    SQLITE_CONCURRENT as SQLITE_CONCURRENT,
+    SQLiteProfile as SQLiteProfile,
+)
 from ._config import config as config
 from ._metrics import (
     Metric as Metric,
@@ -1,27 +1,48 @@
 from __future__ import annotations
 
+import time
 import logging
 import warnings
+import functools
 from types import TracebackType
-from typing import Any, Generic, TypeVar, overload
+from typing import Any, Generic, TypeVar, Sequence, overload
 from pathlib import Path
 from datetime import timedelta
 from typing_extensions import Self, Literal
 
 from pydantic import BaseModel
 
-from ._types import Datasource, HttpConfig, PrismaMethod, MetricsFormat, TransactionId, DatasourceOverride
+from ._types import (
+    Datasource,
+    HttpConfig,
+    PrismaMethod,
+    MetricsFormat,
+    Hydration,
+    TransactionId,
+    EngineTransport,
+    DatasourceOverride,
+)
 from .engine import (
+    SyncEnginePool,
     SyncQueryEngine,
+    AsyncEnginePool,
     AsyncQueryEngine,
     BaseAbstractEngine,
     SyncAbstractEngine,
+    EngineAddress,
     AsyncAbstractEngine,
+    AlreadyConnectedError,
 )
 from .errors import ClientNotConnectedError, ClientNotRegisteredError
 from ._compat import model_parse, removeprefix
-from ._builder import QueryBuilder
+from ._builder import RAW_METHODS, QueryBuilder
+from ._cache import QueryCache, related_models
+from ._sqlite import SQLiteProfile, profile_url, apply_pragmas, pragma_statements, async_apply_pragmas
+from ._batching import AutoBatcher
+from ._dispatch import READ_METHODS, QueryDispatcher
+from ._hydration import hydrate, hydrate_many, current_hydration
 from ._metrics import Metrics
+from ._instrumentation import set_labels, current_labels, current_instrumentation
 from ._registry import get_client
 from .generator.models import EngineType
 
@@ -66,6 +87,7 @@ def load_env(*, override: bool = False, **kwargs: Any) -> None:
 
 
 _EngineT = TypeVar('_EngineT', bound=BaseAbstractEngine)
+_ModelT = TypeVar('_ModelT', bound=BaseModel)
 
 
 class BasePrisma(Generic[_EngineT]):
@@ -74,6 +96,14 @@ class BasePrisma(Generic[_EngineT]):
     _connect_timeout: int | timedelta
     _tx_id: TransactionId | None
     _http_config: HttpConfig
+    _engine_transport: EngineTransport
+    _hydration: Hydration
+    _dispatcher: QueryDispatcher | None
+    _batcher: AutoBatcher | None
+    _cache: QueryCache | None
+    _engine_pool_size: int
+    _sqlite_profile: SQLiteProfile | None
+    _tx_changes: list[frozenset[str] | None]
     _internal_engine: _EngineT | None
     _copied: bool
 
@@ -92,6 +122,14 @@ class BasePrisma(Generic[_EngineT]):
         '_datasource',
         '_log_queries',
         '_http_config',
+        '_engine_transport',
+        '_hydration',
+        '_dispatcher',
+        '_batcher',
+        '_cache',
+        '_engine_pool_size',
+        '_sqlite_profile',
+        '_tx_changes',
         '_schema_path',
         '_engine_type',
         '_prisma_models',
@@ -112,12 +150,31 @@ class BasePrisma(Generic[_EngineT]):
         datasource: DatasourceOverride | None,
         connect_timeout: int | timedelta,
         http: HttpConfig | None,
+        engine_transport: EngineTransport = 'tcp',
+        hydration: Hydration = 'validate',
+        dispatcher: QueryDispatcher | None = None,
+        auto_batch: bool = False,
+        cache: QueryCache | None = None,
+        engine_pool_size: int = 1,
+        sqlite_profile: SQLiteProfile | None = None,
     ) -> None:
         # NOTE: if you add any more properties here then you may also need to forward
         # them in the `_copy()` method.
         self._internal_engine = None
         self._log_queries = log_queries
         self._datasource = datasource
+        self._engine_transport = engine_transport
+        self._hydration = hydration
+        self._dispatcher = dispatcher
+        self._batcher = AutoBatcher() if auto_batch else None
+        self._cache = cache
+
+        if engine_pool_size < 1:
+            raise ValueError(f'engine_pool_size must be at least 1, got {engine_pool_size}')
+
+        self._engine_pool_size = engine_pool_size
+        self._sqlite_profile = sqlite_profile
+        self._tx_changes = []
 
         if isinstance(connect_timeout, int):
             message = (
@@ -181,6 +238,61 @@ class BasePrisma(Generic[_EngineT]):
         """Returns True if the client is connected to the query engine, False otherwise."""
         return self._internal_engine is not None
 
+    def attach(self, engine: _EngineT) -> None:
+        """Send queries to an engine that is already connected and is owned by something else.
+
+        This replaces `connect()`, the client never stops the engine when it is garbage collected.
+        `disconnect()` still closes the engine, for engines returned by `SyncQueryEngine.attach()`
+        or `AsyncQueryEngine.attach()` that only closes their HTTP session.
+        """
+        if self._internal_engine is not None:
+            raise AlreadyConnectedError('Already connected to the query engine')
+
+        self._internal_engine = engine
+        self._copied = True
+
+    def attach_to(self, addresses: Sequence[EngineAddress]) -> None:
+        """Send queries to running engine processes, e.g. ones started by `spawn_shared_engine()`.
+
+        Queries are spread over the engines if more than one address is given, see `attach()`.
+        """
+        if not addresses:
+            raise ValueError('At least one engine address is required')
+
+        self.attach(self._create_attached_engine(addresses))
+
+    def spawn_shared_engine(
+        self,
+        timeout: int | timedelta | UseClientDefault = USE_CLIENT_DEFAULT,
+    ) -> SyncQueryEngine:
+        """Start a query engine process configured like this client that any number of clients can attach to.
+
+        The engine is connected and has the SQLite profile applied when this returns. It blocks
+        until the engine is ready so asyncio code should call it with `asyncio.to_thread()`.
+        The caller owns the process and must `close()` the engine, clients reach it using
+        `attach_to([engine.address])` from any thread or event loop.
+        """
+        timeout, datasources = self._prepare_connect_args(timeout=timeout)
+        engine = SyncQueryEngine(
+            dml_path=self._packaged_schema_path,
+            log_queries=self._log_queries,
+            http_config=self._http_config,
+            transport=self._engine_transport,
+        )
+        try:
+            engine.connect(timeout=timeout, datasources=datasources)
+            pragmas = self._sqlite_pragmas()
+            if pragmas:
+                apply_pragmas(functools.partial(engine.query, tx_id=None), pragmas)
+        except Exception:
+            engine.close()
+            raise
+
+        return engine
+
+    def _create_attached_engine(self, addresses: Sequence[EngineAddress]) -> _EngineT:
+        raise NotImplementedError('`_create_attached_engine` should be implemented in a subclass')
+
     def __del__(self) -> None:
         # Note: as the transaction manager holds a reference to the original
         # client as well as the transaction client the original client cannot
@@ -214,6 +326,13 @@ class BasePrisma(Generic[_EngineT]):
             datasource=self._datasource,
             log_queries=self._log_queries,
             connect_timeout=self._connect_timeout,
+            engine_transport=self._engine_transport,
+            hydration=self._hydration,
+            dispatcher=self._dispatcher,
+            auto_batch=self._batcher is not None,
+            cache=self._cache,
+            engine_pool_size=self._engine_pool_size,
+            sqlite_profile=self._sqlite_profile,
         )
         new._copied = True
 
@@ -283,9 +402,44 @@ class BasePrisma(Generic[_EngineT]):
             # https://github.com/RobertCraigie/prisma-client-py/issues/409
             datasources = [self._make_sqlite_datasource()]
 
+        profile = self._sqlite_profile
+        if profile is not None and datasources is not None and self._active_provider == 'sqlite':
+            datasources = [{**ds, 'url': profile_url(ds['url'], profile)} for ds in datasources]  # type: ignore[typeddict-item]
+
         log.debug('datasources: %s', datasources)
         return timeout, datasources
 
+    def _sqlite_pragmas(self) -> list[tuple[str, str | int]]:
+        """Returns the PRAGMAs of the SQLite profile that should be set on connect"""
+        if self._sqlite_profile is None or self._active_provider != 'sqlite':
+            return []
+        return pragma_statements(self._sqlite_profile)
+
+    def _model_parse(self, model: type[_ModelT], data: Any) -> _ModelT:
+        """Convert a query engine result to a model instance using the current hydration mode"""
+        instrumentation = current_instrumentation()
+        if instrumentation is None:
+            return hydrate(model, data, mode=current_hydration(self._hydration))
+
+        start = time.perf_counter()
+        try:
+            return hydrate(model, data, mode=current_hydration(self._hydration))
+        finally:
+            _, method = current_labels()
+            instrumentation.record('hydrate', time.perf_counter() - start, model=model.__name__, method=method)
+
+    def _model_parse_many(self, model: type[_ModelT], items: list[Any]) -> list[_ModelT]:
+        instrumentation = current_instrumentation()
+        if instrumentation is None:
+            return hydrate_many(model, items, mode=current_hydration(self._hydration))
+
+        start = time.perf_counter()
+        try:
+            return hydrate_many(model, items, mode=current_hydration(self._hydration))
+        finally:
+            _, method = current_labels()
+            instrumentation.record('hydrate', time.perf_counter() - start, model=model.__name__, method=method)
+
     def _make_query_builder(
         self,
         *,
@@ -303,6 +457,46 @@ class BasePrisma(Generic[_EngineT]):
             relational_field_mappings=self._relational_field_mappings,
         )
 
+    def _cache_key(self, method: PrismaMethod, model: type[BaseModel] | None, content: bytes) -> tuple[Any, ...] | None:
+        """Returns the key to cache the result of this query under or None if it cannot be cached"""
+        if self._cache is None or self._tx_id is not None or model is None or method not in READ_METHODS:
+            return None
+
+        return (self._engine.endpoint, content)
+
+    def _invalidate_reads(self, method: PrismaMethod, model: type[BaseModel] | None) -> None:
+        """Stop sharing or caching reads that a finished `method` query on `model` may have changed"""
+        if method in READ_METHODS or (self._cache is None and self._dispatcher is None):
+            return
+
+        # raw queries can touch any table, even when their results are parsed into a model
+        models = None if method in RAW_METHODS or model is None else related_models(model)
+        self._invalidate(models)
+
+        if self._tx_id is not None:
+            # other connections still see the old data until the transaction is committed
+            # so the results they cache in the meantime must be dropped again on commit
+            self._tx_changes.append(models)
+
+    def _invalidate_committed(self) -> None:
+        """Stop sharing or caching reads that the now committed transaction may have changed"""
+        changes = self._tx_changes
+        self._tx_changes = []
+        if not changes:
+            return
+
+        if None in changes:
+            self._invalidate(None)
+        else:
+            self._invalidate(frozenset().union(*changes))  # type: ignore[arg-type]
+
+    def _invalidate(self, models: frozenset[str] | None) -> None:
+        # in-flight reads may have been sent before the write so they must not be joined
+        if self._dispatcher is not None:
+            self._dispatcher.mutated()
+        if self._cache is not None:
+            self._cache.invalidate(models)
+
 
 class SyncBasePrisma(BasePrisma[SyncAbstractEngine]):
     __slots__ = ()
@@ -325,6 +519,17 @@ class SyncBasePrisma(BasePrisma[SyncAbstractEngine]):
             datasources=datasources,
         )
 
+        pragmas = self._sqlite_pragmas()
+        if pragmas:
+            engine = self._internal_engine
+            try:
+                # every engine of a pool has its own connections
+                for member in engine.engines if isinstance(engine, SyncEnginePool) else [engine]:
+                    apply_pragmas(functools.partial(member.query, tx_id=None), pragmas)
+            except Exception:
+                self.disconnect()
+                raise
+
     def disconnect(self, timeout: float | timedelta | None = None) -> None:
         """Disconnect the Prisma query engine."""
         if self._internal_engine is not None:
@@ -394,14 +599,30 @@ class SyncBasePrisma(BasePrisma[SyncAbstractEngine]):
 
     def _create_engine(self, dml_path: Path | None = None) -> SyncAbstractEngine:
         if self._engine_type == EngineType.binary:
-            return SyncQueryEngine(
-                dml_path=dml_path or self._packaged_schema_path,
-                log_queries=self._log_queries,
-                http_config=self._http_config,
-            )
+            engines = [
+                SyncQueryEngine(
+                    dml_path=dml_path or self._packaged_schema_path,
+                    log_queries=self._log_queries,
+                    http_config=self._http_config,
+                    transport=self._engine_transport,
+                )
+                for _ in range(self._engine_pool_size)
+            ]
+            if len(engines) == 1:
+                return engines[0]
+            return SyncEnginePool(engines)
 
         raise NotImplementedError(f'Unsupported engine type: {self._engine_type}')
 
+    def _create_attached_engine(self, addresses: Sequence[EngineAddress]) -> SyncAbstractEngine:
+        engines = [
+            SyncQueryEngine.attach(address, dml_path=self._packaged_schema_path, http_config=self._http_config)
+            for address in addresses
+        ]
+        if len(engines) == 1:
+            return engines[0]
+        return SyncEnginePool(engines)
+
     @property
     def _engine_class(self) -> type[SyncAbstractEngine]:
         if self._engine_type == EngineType.binary:
@@ -416,11 +637,44 @@ class SyncBasePrisma(BasePrisma[SyncAbstractEngine]):
         arguments: dict[str, Any],
         model: type[BaseModel] | None = None,
         root_selection: list[str] | None = None,
+        cache: bool = True,
     ) -> Any:
         builder = self._make_query_builder(
             method=method, model=model, arguments=arguments, root_selection=root_selection
         )
-        return self._engine.query(builder.build(), tx_id=self._tx_id)
+        content = builder.build()
+        instrumentation = current_instrumentation()
+        if instrumentation is None:
+            return self._execute_content(method, model, content, cache=cache)
+
+        name = model.__name__ if model is not None else None
+        set_labels(name, method)
+        start = time.perf_counter()
+        try:
+            return self._execute_content(method, model, content, cache=cache)
+        finally:
+            instrumentation.record('execute', time.perf_counter() - start, model=name or '-', method=method)
+
+    def _execute_content(
+        self, method: PrismaMethod, model: type[BaseModel] | None, content: bytes, *, cache: bool
+    ) -> Any:
+        key = self._cache_key(method, model, content) if cache else None
+        if key is not None:
+            assert self._cache is not None and model is not None
+            response = self._cache.get(key)
+            if response is None:
+                version = self._cache.version
+                response = self._engine.query(content, tx_id=None)
+                self._cache.set(key, response, model=model.__name__, version=version)
+            return response
+
+        try:
+            return self._engine.query(content, tx_id=self._tx_id)
+        finally:
+            self._invalidate_reads(method, model)
+
+    def _send_batch(self, content: bytes) -> Any:
+        return self._engine.query(content, tx_id=self._tx_id)
 
 
 class AsyncBasePrisma(BasePrisma[AsyncAbstractEngine]):
@@ -444,6 +698,17 @@ class AsyncBasePrisma(BasePrisma[AsyncAbstractEngine]):
             datasources=datasources,
         )
 
+        pragmas = self._sqlite_pragmas()
+        if pragmas:
+            engine = self._internal_engine
+            try:
+                # every engine of a pool has its own connections
+                for member in engine.engines if isinstance(engine, AsyncEnginePool) else [engine]:
+                    await async_apply_pragmas(functools.partial(member.query, tx_id=None), pragmas)
+            except Exception:
+                await self.disconnect()
+                raise
+
     async def disconnect(self, timeout: float | timedelta | None = None) -> None:
         """Disconnect the Prisma query engine."""
         if self._internal_engine is not None:
@@ -513,14 +778,30 @@ class AsyncBasePrisma(BasePrisma[AsyncAbstractEngine]):
 
     def _create_engine(self, dml_path: Path | None = None) -> AsyncAbstractEngine:
         if self._engine_type == EngineType.binary:
-            return AsyncQueryEngine(
-                dml_path=dml_path or self._packaged_schema_path,
-                log_queries=self._log_queries,
-                http_config=self._http_config,
-            )
+            engines = [
+                AsyncQueryEngine(
+                    dml_path=dml_path or self._packaged_schema_path,
+                    log_queries=self._log_queries,
+                    http_config=self._http_config,
+                    transport=self._engine_transport,
+                )
+                for _ in range(self._engine_pool_size)
+            ]
+            if len(engines) == 1:
+                return engines[0]
+            return AsyncEnginePool(engines)
 
         raise NotImplementedError(f'Unsupported engine type: {self._engine_type}')
 
+    def _create_attached_engine(self, addresses: Sequence[EngineAddress]) -> AsyncAbstractEngine:
+        engines = [
+            AsyncQueryEngine.attach(address, dml_path=self._packaged_schema_path, http_config=self._http_config)
+            for address in addresses
+        ]
+        if len(engines) == 1:
+            return engines[0]
+        return AsyncEnginePool(engines)
+
     @property
     def _engine_class(self) -> type[AsyncAbstractEngine]:
         if self._engine_type == EngineType.binary:
@@ -536,8 +817,65 @@ class AsyncBasePrisma(BasePrisma[AsyncAbstractEngine]):
         arguments: dict[str, Any],
         model: type[BaseModel] | None = None,
         root_selection: list[str] | None = None,
+        cache: bool = True,
     ) -> Any:
         builder = self._make_query_builder(
             method=method, model=model, arguments=arguments, root_selection=root_selection
         )
-        return await self._engine.query(builder.build(), tx_id=self._tx_id)
+        content = builder.build()
+        instrumentation = current_instrumentation()
+        if instrumentation is None:
+            return await self._execute_content(method, model, content, cache=cache)
+
+        name = model.__name__ if model is not None else None
+        set_labels(name, method)
+        start = time.perf_counter()
+        try:
+            return await self._execute_content(method, model, content, cache=cache)
+        finally:
+            instrumentation.record('execute', time.perf_counter() - start, model=name or '-', method=method)
+
+    async def _execute_content(
+        self, method: PrismaMethod, model: type[BaseModel] | None, content: bytes, *, cache: bool
+    ) -> Any:
+        key = self._cache_key(method, model, content) if cache else None
+        if key is not None:
+            assert self._cache is not None and model is not None
+            response = self._cache.get(key)
+            if response is None:
+                version = self._cache.version
+                response = await self._query(method, content, version=version)
+                self._cache.set(key, response, model=model.__name__, version=version)
+            return response
+
+        try:
+            return await self._query(method, content)
+        finally:
+            self._invalidate_reads(method, model)
+
+    async def _query(self, method: PrismaMethod, content: bytes, *, version: int | None = None) -> Any:
+        batcher = self._batcher
+        if batcher is not None and self._tx_id is None and method in READ_METHODS:
+            return await batcher.query(
+                content,
+                send=functools.partial(self._dispatch, method, version=version),
+                send_batch=self._send_batch,
+                version=version,
+            )
+
+        return await self._dispatch(method, content, version=version)
+
+    async def _dispatch(self, method: PrismaMethod, content: bytes, *, version: int | None = None) -> Any:
+        dispatcher = self._dispatcher
+        if dispatcher is not None:
+            return await dispatcher.query(self._engine, content, tx_id=self._tx_id, method=method, version=version)
+
+        return await self._engine.query(content, tx_id=self._tx_id)
+
+    async def _send_batch(self, content: bytes) -> Any:
+        # batches are not coalesced as they are very unlikely to be identical
+        dispatcher = self._dispatcher
+        if dispatcher is not None:
+            return await dispatcher.send(self._engine, content, tx_id=self._tx_id)
+
+        return await self._engine.query(content, tx_id=self._tx_id)
@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Set, Dict, List, Tuple, Generic, TypeVar, Callable, Hashable, Iterable, Optional, Awaitable
+
+from . import _codec
+from .engine import utils as engine_utils
+from .errors import BatchResultMismatchError
+from ._instrumentation import set_labels, current_instrumentation
+
+__all__ = (
+    'DEFAULT_MAX_BATCH_SIZE',
+    'DEFAULT_CHUNK_SIZE',
+    'AutoBatcher',
+    'BatchResult',
+    'batch_payload',
+)
+
+log: logging.Logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BATCH_SIZE = 100
+"""Maximum number of queries that are sent in a single batch request"""
+
+DEFAULT_CHUNK_SIZE = 500
+"""Maximum number of operations of a `Batch` that are sent in a single request"""
+
+_T = TypeVar('_T')
+
+Send = Callable[[bytes], Awaitable[Any]]
+
+
+class _PendingQuery:
+    __slots__ = ('content', 'send', 'futures')
+
+    def __init__(self, content: bytes, send: Send) -> None:
+        self.content = content
+        self.send = send
+        self.futures: List[asyncio.Future[Any]] = []
+
+
+class AutoBatcher:
+    """Collects the queries that are issued in the same event loop tick & sends them as one batch request.
+
+    This is the DataLoader pattern, e.g. both of these queries are sent in a single request
+    and each caller receives its own result, as if the queries were sent separately.
+
+    ```py
+    players, ranks = await asyncio.gather(
+        db.player.find_many(),
+        db.rank.find_many(),
+    )
+    ```
+
+    Identical queries issued in the same tick are only sent once, every caller gets its own
+    copy of the response. A tick that only issued one distinct query sends it on its own,
+    through the `QueryDispatcher` if the client uses one, so it can be coalesced with the
+    queries of other clients.
+
+    The batch is not transactional, each query succeeds or fails on its own.
+    """
+
+    __slots__ = ('max_batch_size', '_loop', '_pending', '_tasks')
+
+    def __init__(self, *, max_batch_size: int = DEFAULT_MAX_BATCH_SIZE) -> None:
+        if max_batch_size < 1:
+            raise ValueError(f'max_batch_size must be at least 1, got {max_batch_size}')
+
+        self.max_batch_size = max_batch_size
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending: Dict[Tuple[bytes, Hashable], _PendingQuery] = {}
+        # the event loop only keeps weak references to tasks
+        self._tasks: Set[asyncio.Task[None]] = set()
+
+    async def query(self, content: bytes, *, send: Send, send_batch: Send, version: Hashable = None) -> Any:
+        """Queue `content`, which must be a single query payload, and return its response.
+
+        `send` is used if the query ends up being sent on its own and `send_batch` is used
+        to send batch requests. Only queries with the same `version` are deduplicated,
+        see `QueryDispatcher.query()`.
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not None and self._loop is not loop:
+            # a batch is being collected on another event loop, it cannot be joined
+            return await send(content)
+
+        future: asyncio.Future[Any] = loop.create_future()
+        key = (content, version)
+        query = self._pending.get(key)
+        if query is None:
+            query = self._pending[key] = _PendingQuery(content, send)
+        query.futures.append(future)
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush(send_batch)
+        elif self._loop is None:
+            self._loop = loop
+            loop.call_soon(self._flush, send_batch)
+
+        return await future
+
+    def _flush(self, send_batch: Send) -> None:
+        pending = self._pending
+        if not pending:
+            # already flushed as the batch was full
+            return
+
+        self._pending = {}
+        self._loop = None
+        task = asyncio.ensure_future(self._send(send_batch, list(pending.values())))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, send_batch: Send, pending: List[_PendingQuery]) -> None:
+        if len(pending) == 1:
+            query = pending[0]
+            try:
+                response = await query.send(query.content)
+            except Exception as exc:
+                _fail(query, exc)
+            else:
+                _resolve(query, response)
+            return
+
+        log.debug('Sending %i queries in a single batch request', len(pending))
+        if current_instrumentation() is not None:
+            set_labels(None, 'batch')
+
+        try:
+            response = await send_batch(batch_payload((query.content for query in pending), transaction=False))
+            results = response['batchResult']
+            if len(results) != len(pending):
+                raise BatchResultMismatchError(expected=len(pending), got=len(results))
+        except Exception as exc:
+            for query in pending:
+                _fail(query, exc)
+            return
+
+        for query, result in zip(pending, results):
+            errors = result.get('errors')
+            if errors:
+                _fail(query, engine_utils.response_error(None, errors))
+            else:
+                _resolve(query, result)
+
+
+class BatchResult(Generic[_T]):
+    """The outcome of a single operation of a `Batch`, available once the batch is committed"""
+
+    __slots__ = ('_committed', '_value', '_error')
+
+    def __init__(self) -> None:
+        self._committed = False
+        self._value: Optional[_T] = None
+        self._error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        """True if the operation succeeded"""
+        self._check_committed()
+        return self._error is None
+
+    @property
+    def error(self) -> Optional[Exception]:
+        """The exception the operation failed with, only set for non-transactional batches"""
+        self._check_committed()
+        return self._error
+
+    @property
+    def value(self) -> _T:
+        """The result of the operation, raises the exception the operation failed with if it did"""
+        self._check_committed()
+        if self._error is not None:
+            raise self._error
+        return self._value  # type: ignore[return-value]
+
+    def _set(self, value: _T) -> None:
+        self._committed = True
+        self._value = value
+
+    def _fail(self, error: Exception) -> None:
+        self._committed = True
+        self._error = error
+
+    def _check_committed(self) -> None:
+        if not self._committed:
+            raise RuntimeError('The batch has not been committed yet')
+
+    def __repr__(self) -> str:
+        if not self._committed:
+            return f'<{self.__class__.__name__} pending>'
+        if self._error is not None:
+            return f'<{self.__class__.__name__} error={self._error!r}>'
+        return f'<{self.__class__.__name__} value={self._value!r}>'
+
+
+def batch_payload(queries: Iterable[bytes], *, transaction: bool) -> bytes:
+    """Returns a batch request for already encoded single query payloads.
+
+    The queries are spliced into the payload as-is instead of being decoded & encoded again.
+    """
+    return b'{"batch":[' + b','.join(queries) + (b'],"transaction":true}' if transaction else b'],"transaction":false}')
+
+
+def _resolve(query: _PendingQuery, response: Any) -> None:
+    first, *rest = query.futures
+    _set_result(first, response)
+    for future in rest:
+        # responses are updated in place when they are hydrated
+        _set_result(future, _codec.clone(response))
+
+
+def _fail(query: _PendingQuery, exc: BaseException) -> None:
+    for future in query.futures:
+        _set_exception(future, exc)
+
+
+def _set_result(future: asyncio.Future[Any], result: Any) -> None:
+    # the caller may have been cancelled while the batch was in-flight
+    if not future.done():
+        future.set_result(result)
+
+
+def _set_exception(future: asyncio.Future[Any], exc: BaseException) -> None:
+    if not future.done():
+        future.set_exception(exc)
@@ -3,10 +3,14 @@ from __future__ import annotations
 import json
 import decimal
 import inspect
+import time
 import logging
 import datetime
+import threading
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING, Any, Union, Mapping, Iterable, ForwardRef, cast
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Union, Mapping, ClassVar, Iterable, ForwardRef, cast
+from collections import OrderedDict
 from datetime import timezone
 from textwrap import indent
 from functools import singledispatch
@@ -15,8 +19,9 @@ from typing_extensions import Literal, TypeGuard, override
 from pydantic import BaseModel
 from pydantic.fields import FieldInfo
 
-from . import fields
+from . import fields, _codec
 from ._types import PrismaMethod
+from ._instrumentation import Instrumentation, current_instrumentation
 from .errors import InvalidModelError, UnknownModelError, UnknownRelationalFieldError
 from ._compat import get_args, is_union, get_origin, model_fields, model_field_type
 from ._typing import is_list_type
@@ -76,6 +81,20 @@ METHOD_FORMAT_MAPPING: dict[PrismaMethod, str] = {
 MISSING = object()
 Operation = Literal['query', 'mutation']
 
+RAW_METHODS: frozenset[PrismaMethod] = frozenset({'query_raw', 'query_first', 'execute_raw'})
+
+TEMPLATE_CACHE_SIZE = 1024
+"""Maximum number of query shapes to keep compiled templates for"""
+
+TEMPLATE_MAX_NODES = 512
+"""Arguments with more nodes than this (e.g. large `create_many` payloads) are not templated"""
+
+# slot markers can never clash with rendered content as JSON escapes control characters
+_SLOT_MARKER = '\x00'
+
+# transforms dict keys to match global aliases, e.g. order_by -> orderBy
+_alias = QUERY_BUILDER_ALIASES.get
+
 
 class QueryBuilder:
     method: PrismaMethod
@@ -97,7 +116,11 @@ class QueryBuilder:
     """Mapping of relational fields to include in the result"""
 
     arguments: dict[str, Any]
-    """Arguments to pass to the query"""
+    """Arguments to pass to the query
+
+    Only the top level keys are aliased up front, nested keys are aliased while rendering
+    so that the caller's data is never copied.
+    """
 
     root_selection: list[str] | None
     """List of fields to select"""
@@ -111,6 +134,9 @@ class QueryBuilder:
     e.g. {'User': {'posts': 'Post'}}
     """
 
+    _slots: list[bool] | None
+    """Set while compiling a query template, records whether each literal slot is raw encoded"""
+
     __slots__ = (
         'method',
         'method_format',
@@ -121,6 +147,7 @@ class QueryBuilder:
         'root_selection',
         'prisma_models',
         'relational_field_mappings',
+        '_slots',
     )
 
     def __init__(
@@ -139,8 +166,10 @@ class QueryBuilder:
         self.root_selection = root_selection
         self.prisma_models = prisma_models
         self.relational_field_mappings = relational_field_mappings
-        self.arguments = args = self._transform_aliases(arguments)
+        # shallow copy so that popping `include` does not mutate the caller's arguments
+        self.arguments = args = {_alias(key, key): value for key, value in arguments.items()}
         self.include = args.pop('include', None)
+        self._slots = None
 
         # Note: we ignore the `model` argument for raw queries as users may want to pass in a model
         # that isn't a `PrismaModel` because they've defined it manually & enforcing that
@@ -153,19 +182,62 @@ class QueryBuilder:
 
             self.model = model
 
-    def build(self) -> str:
-        """Build the payload that should be sent to the QueryEngine"""
+    def build(self) -> bytes:
+        """Build the payload that should be sent to the QueryEngine, encoded as UTF-8
+
+        Literal values are always inlined into the query as the engine's GraphQL protocol
+        does not support variables. Instead queries with the same shape share a template
+        that already contains the JSON encoded payload, so only the literal values are
+        encoded for each query.
+        """
+        instrumentation = current_instrumentation()
+        if instrumentation is None:
+            template, values = self._get_template()
+            if template is None:
+                payload = self._serialize(self._create_root_node().compact())
+            else:
+                payload = template.render_payload(values)
+        else:
+            payload = self._build_instrumented(instrumentation)
+
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug('Generated query: \n%s', self.build_pretty_query())
+
+        return payload
+
+    def _build_instrumented(self, instrumentation: Instrumentation) -> bytes:
+        start = time.perf_counter()
+        template, values = self._get_template()
+        if template is None:
+            query = self._create_root_node().compact()
+            built = time.perf_counter()
+            payload = self._serialize(query)
+        else:
+            built = time.perf_counter()
+            payload = template.render_payload(values)
+
+        end = time.perf_counter()
+        model = self.model.__name__ if self.model is not None else '-'
+        instrumentation.record('build', built - start, model=model, method=self.method)
+        instrumentation.record('serialize', end - built, model=model, method=self.method)
+        instrumentation.record_size('request', len(payload), model=model, method=self.method)
+        return payload
+
+    def _serialize(self, query: str) -> bytes:
         data: dict[str, object] = {
             'variables': {},
             'operation_name': self.operation,
-            'query': self.build_query(),
+            'query': query,
         }
-        return dumps(data)
+        return dumpb(data)
 
     def build_query(self) -> str:
         """Build the GraphQL query
 
-        Example query:
+        The query is rendered compactly, without any indentation or newlines, as the
+        engine does not need them. The pretty printed form is only rendered for debug logs.
+
+        Example query (pretty printed):
 
         query {
           result: findUniqueUser
@@ -185,10 +257,78 @@ class QueryBuilder:
           }
         }
         """
-        query = self._create_root_node().render()
-        log.debug('Generated query: \n%s', query)
+        template, values = self._get_template()
+        if template is None:
+            query = self._create_root_node().compact()
+        else:
+            query = template.render(values)
+
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug('Generated query: \n%s', self.build_pretty_query())
+
         return query
 
+    def build_pretty_query(self) -> str:
+        """Build the GraphQL query with indentation, this is only intended for debugging"""
+        return self._create_root_node().render()
+
+    def _get_template(self) -> tuple[QueryTemplate | None, list[Any]]:
+        """Returns the compiled template for the shape of this query & its literal values.
+
+        None is returned for queries that are too large to be templated.
+        """
+        try:
+            key, values = self._shape()
+        except _UncacheableShape:
+            return None, []
+
+        template = _template_cache.get(key)
+        if template is None:
+            template = self._compile_template()
+            _template_cache.put(key, template)
+        return template, values
+
+    def _compile_template(self) -> QueryTemplate:
+        """Render the query with every literal value replaced by a numbered slot marker"""
+        self._slots = []
+        try:
+            rendered = self._create_root_node().compact()
+            return QueryTemplate.parse(rendered, raw=self._slots, operation=self.operation)
+        finally:
+            self._slots = None
+
+    def _literal(self, value: Any, *, raw: bool = False) -> str:
+        """Encode a literal argument value for the query.
+
+        Raw query parameters are encoded twice as the engine expects them as a JSON string.
+        """
+        slots = self._slots
+        if slots is not None:
+            slots.append(raw)
+            return f'{_SLOT_MARKER}{len(slots) - 1}{_SLOT_MARKER}'
+
+        if raw:
+            return dumps(dumps(value))
+        return dumps(value)
+
+    def _shape(self) -> tuple[tuple[Any, ...], list[Any]]:
+        """Returns a hashable key describing the structure of the query and its literal values.
+
+        Two builders with the same key render the same query text apart from the literal
+        values, which are returned in the same order the nodes encode them in.
+        """
+        values: list[Any] = []
+        budget = [TEMPLATE_MAX_NODES]
+        root_selection = tuple(self.root_selection) if self.root_selection is not None else None
+        key = (
+            self.method,
+            self.model,
+            root_selection,
+            _arguments_shape(self.arguments, values, budget, raw=self.method in RAW_METHODS),
+            _include_shape(self.include, values, budget, raw=self.method in RAW_METHODS),
+        )
+        return key, values
+
     def _create_root_node(self) -> 'RootNode':
         root = RootNode(builder=self)
         root.add(ResultNode.create(self))
@@ -207,21 +347,17 @@ class QueryBuilder:
 
         Raises UnknownModelError if the current model cannot be found.
         """
-        name = getattr(model, '__prisma_model__', MISSING)
-        if name is MISSING:
-            raise InvalidModelError(model)
+        return list(self._get_metadata(model).scalar_fields)
 
-        name = model.__prisma_model__
-        if name not in self.prisma_models:
-            raise UnknownModelError(name)
+    def _get_metadata(self, model: type[PrismaModel]) -> ModelMetadata:
+        """Returns the cached metadata for a model that is part of the current schema
 
-        # by default we exclude every field that points to a PrismaModel as that indicates that it is a relational field
-        # we explicitly keep fields that point to anything else, even other pydantic.BaseModel types, as they can be used to deserialize JSON
-        return [
-            field
-            for field, info in model_fields(model).items()
-            if not _field_is_prisma_model(info, name=field, parent=model)
-        ]
+        Raises UnknownModelError if the current model cannot be found.
+        """
+        metadata = get_model_metadata(model)
+        if metadata.name not in self.prisma_models:
+            raise UnknownModelError(metadata.name)
+        return metadata
 
     def get_relational_model(self, current_model: type[PrismaModel], field: str) -> type[PrismaModel]:
         """Returns the model that the field is related to.
@@ -243,12 +379,11 @@ class QueryBuilder:
         if field not in mappings:
             raise UnknownRelationalFieldError(model=current_model.__name__, field=field)
 
-        try:
-            info = model_fields(current_model)[field]
-        except KeyError as exc:
-            raise UnknownRelationalFieldError(model=current_model.__name__, field=field) from exc
+        metadata = get_model_metadata(current_model)
+        if field not in metadata.fields:
+            raise UnknownRelationalFieldError(model=current_model.__name__, field=field)
 
-        model = _prisma_model_for_field(info, name=field, parent=current_model)
+        model = metadata.relations.get(field)
         if not model:
             raise RuntimeError(
                 f"The `{field}` field doesn't appear to be a Prisma Model type. "
@@ -257,26 +392,260 @@ class QueryBuilder:
 
         return model
 
-    def _transform_aliases(self, arguments: dict[str, Any]) -> dict[str, Any]:
-        """Transform dict keys to match global aliases
 
-        e.g. order_by -> orderBy
-        """
-        transformed = dict()
-        for key, value in arguments.items():
-            alias = QUERY_BUILDER_ALIASES.get(key, key)
-            if isinstance(value, dict):
-                transformed[alias] = self._transform_aliases(arguments=value)
-            elif isinstance(value, ITERABLES):
-                # it is safe to map any iterable type to a list here as it is only being used
-                # to serialise the query and we only officially support lists anyway
-                transformed[alias] = [
-                    self._transform_aliases(data) if isinstance(data, dict) else data  # type: ignore
-                    for data in value
-                ]
+class ModelMetadata:
+    """Field information for a Prisma model, derived once from its pydantic definition"""
+
+    name: str
+    """The name of the model in the Prisma schema, i.e. `__prisma_model__`"""
+
+    fields: frozenset[str]
+    """The names of every field defined on the pydantic model"""
+
+    scalar_fields: tuple[str, ...]
+    """Fields selected by default, i.e. every field that does not point to another Prisma model"""
+
+    relations: Mapping[str, type[PrismaModel]]
+    """Mapping of relational field names to the model they point to"""
+
+    list_relations: frozenset[str]
+    """Relational fields that hold a list of models"""
+
+    default_selection: str
+    """The pre-rendered selection of `scalar_fields`, one field per line"""
+
+    compact_selection: str
+    """The pre-rendered selection of `scalar_fields` for compact queries"""
+
+    __slots__ = (
+        'name',
+        'fields',
+        'scalar_fields',
+        'relations',
+        'list_relations',
+        'default_selection',
+        'compact_selection',
+    )
+
+    def __init__(self, model: type[PrismaModel]) -> None:
+        scalar_fields: list[str] = []
+        relations: dict[str, type[PrismaModel]] = {}
+        list_relations: set[str] = set()
+
+        fields = model_fields(model)
+        for field, info in fields.items():
+            # by default we exclude every field that points to a PrismaModel as that indicates that it is a relational field
+            # we explicitly keep fields that point to anything else, even other pydantic.BaseModel types, as they can be used to deserialize JSON
+            related = _prisma_model_for_field(info, name=field, parent=model)
+            if related is None:
+                scalar_fields.append(field)
+                continue
+
+            relations[field] = related
+            if _field_is_list(info):
+                list_relations.add(field)
+
+        self.name = model.__prisma_model__
+        self.fields = frozenset(fields)
+        self.scalar_fields = tuple(scalar_fields)
+        self.relations = MappingProxyType(relations)
+        self.list_relations = frozenset(list_relations)
+        self.default_selection = '\n'.join(scalar_fields)
+        self.compact_selection = ' '.join(scalar_fields)
+
+
+_model_metadata: dict[type[Any], ModelMetadata] = {}
+
+
+def get_model_metadata(model: type[PrismaModel]) -> ModelMetadata:
+    """Returns the metadata for the given model, computing it on first use"""
+    try:
+        return _model_metadata[model]
+    except KeyError:
+        pass
+
+    if getattr(model, '__prisma_model__', MISSING) is MISSING:
+        raise InvalidModelError(model)
+
+    metadata = _model_metadata[model] = ModelMetadata(model)
+    return metadata
+
+
+class QueryTemplate:
+    """A compiled query with slots for literal values, see `QueryBuilder._shape()`"""
+
+    fragments: list[str]
+    order: list[int]
+    raw: list[bool]
+    payload: list[bytes]
+    """The fragments encoded as parts of the JSON payload, see `QueryBuilder.build()`"""
+
+    __slots__ = ('fragments', 'order', 'raw', 'payload')
+
+    def __init__(self, fragments: list[str], order: list[int], raw: list[bool], operation: Operation) -> None:
+        self.fragments = fragments
+        self.order = order
+        self.raw = raw
+
+        payload = [_encode_fragment(fragment) for fragment in fragments]
+        payload[0] = b'{"variables":{},"operation_name":"' + operation.encode() + b'","query":"' + payload[0]
+        payload[-1] += b'"}'
+        self.payload = payload
+
+    @classmethod
+    def parse(cls, rendered: str, *, raw: list[bool], operation: Operation) -> QueryTemplate:
+        parts = rendered.split(_SLOT_MARKER)
+        return cls(fragments=parts[0::2], order=[int(i) for i in parts[1::2]], raw=raw, operation=operation)
+
+    def _encode(self, values: list[Any]) -> list[str]:
+        raw = self.raw
+        return [dumps(dumps(value)) if raw[i] else dumps(value) for i, value in enumerate(values)]
+
+    def render(self, values: list[Any]) -> str:
+        encoded = self._encode(values)
+        fragments = self.fragments
+        out = [fragments[0]]
+        for position, slot in enumerate(self.order, start=1):
+            out.append(encoded[slot])
+            out.append(fragments[position])
+        return ''.join(out)
+
+    def render_payload(self, values: list[Any]) -> bytes:
+        """Like `render()` but returns the complete payload, only the literal values are JSON encoded"""
+        encoded = [_encode_fragment(value) for value in self._encode(values)]
+        payload = self.payload
+        out = [payload[0]]
+        for position, slot in enumerate(self.order, start=1):
+            out.append(encoded[slot])
+            out.append(payload[position])
+        return b''.join(out)
+
+
+def _encode_fragment(fragment: str) -> bytes:
+    """Encode part of the query as it appears within the JSON string of the payload"""
+    return _codec.dumpb(fragment)[1:-1]
+
+
+class _TemplateCache:
+    """Thread safe LRU mapping of query shapes to compiled templates"""
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._data: OrderedDict[tuple[Any, ...], QueryTemplate] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple[Any, ...]) -> QueryTemplate | None:
+        with self._lock:
+            template = self._data.get(key)
+            if template is not None:
+                self._data.move_to_end(key)
+            return template
+
+    def put(self, key: tuple[Any, ...], template: QueryTemplate) -> None:
+        with self._lock:
+            self._data[key] = template
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+_template_cache = _TemplateCache(TEMPLATE_CACHE_SIZE)
+
+
+class _UncacheableShape(Exception):
+    pass
+
+
+# NOTE: the following shape functions must walk the arguments in exactly the same
+# order as the nodes below create their children, as slot values are matched by position
+
+
+def _spend(budget: list[int]) -> None:
+    budget[0] -= 1
+    if budget[0] < 0:
+        raise _UncacheableShape()
+
+
+def _arguments_shape(arguments: Mapping[str, Any], values: list[Any], budget: list[int], *, raw: bool) -> tuple[Any, ...]:
+    shape: list[Any] = []
+    for key, value in arguments.items():
+        if value is None:
+            continue
+
+        _spend(budget)
+        if isinstance(value, dict):
+            shape.append((key, _data_shape(value, values, budget)))
+        elif isinstance(value, ITERABLES):
+            if raw:
+                values.append(list(value))
+                shape.append((key, 'r'))
             else:
-                transformed[alias] = value
-        return transformed
+                shape.append((key, _list_shape(value, values, budget)))
+        else:
+            values.append(value)
+            shape.append(key)
+    return tuple(shape)
+
+
+def _data_shape(data: Mapping[str, Any], values: list[Any], budget: list[int]) -> tuple[Any, ...]:
+    shape: list[Any] = ['d']
+    for key, value in data.items():
+        _spend(budget)
+        if isinstance(value, dict):
+            shape.append((key, _data_shape(value, values, budget)))
+        elif isinstance(value, ITERABLES):
+            shape.append((key, _list_shape(value, values, budget)))
+        else:
+            values.append(value)
+            shape.append(key)
+    return tuple(shape)
+
+
+def _list_shape(items: Iterable[Any], values: list[Any], budget: list[int]) -> tuple[Any, ...]:
+    shape: list[Any] = ['l']
+    for item in items:
+        _spend(budget)
+        if isinstance(item, dict):
+            shape.append(_data_shape(item, values, budget))
+        else:
+            values.append(item)
+            shape.append(None)
+    return tuple(shape)
+
+
+def _include_shape(
+    include: Mapping[str, Any] | None,
+    values: list[Any],
+    budget: list[int],
+    *,
+    raw: bool,
+) -> tuple[Any, ...] | None:
+    if include is None:
+        return None
+
+    shape: list[Any] = []
+    for key, value in include.items():
+        _spend(budget)
+        if isinstance(value, dict):
+            args = {_alias(arg, arg): arg_value for arg, arg_value in value.items()}
+            nested = args.pop('include', None)
+            shape.append(
+                (
+                    key,
+                    _arguments_shape(args, values, budget, raw=raw),
+                    _include_shape(nested, values, budget, raw=raw),
+                )
+            )
+        elif isinstance(value, bool):
+            shape.append((key, value))
+        else:
+            # invalid include values are reported when the nodes are created
+            raise _UncacheableShape()
+    return tuple(shape)
 
 
 def _prisma_model_for_field(
@@ -311,6 +680,12 @@ def _prisma_model_for_field(
     return None
 
 
+def _field_is_list(field: FieldInfo) -> bool:
+    type_ = model_field_type(field)
+    types = get_args(type_) if is_union(get_origin(type_)) else [type_]
+    return any(is_list_type(t) for t in types if t is not None)
+
+
 def _field_is_prisma_model(field: FieldInfo, *, name: str, parent: type[BaseModel]) -> bool:
     """Whether or not the given field info represents a model at the database level.
 
@@ -336,6 +711,16 @@ class AbstractNode(ABC):
         """
         ...
 
+    @abstractmethod
+    def write(self, out: list[str]) -> None:
+        """Write the compact form of the node to the given buffer
+
+        Compact rendering happens in a single traversal and does not
+        include any indentation or newlines. Nothing is written if the
+        node should not be rendered.
+        """
+        ...
+
     def should_render(self) -> bool:
         """If True, rendering of the node is skipped
 
@@ -348,6 +733,9 @@ class AbstractNode(ABC):
 class Node(AbstractNode):
     """Base node handling rendering of child nodes"""
 
+    separator: ClassVar[str] = ' '
+    """Used instead of `joiner` to separate children when rendering compactly"""
+
     joiner: str
     indent: str
     builder: QueryBuilder
@@ -418,6 +806,38 @@ class Node(AbstractNode):
 
         return self.joiner.join(strings)
 
+    @override
+    def write(self, out: list[str]) -> None:
+        if not self.should_render():
+            return
+
+        entered = self.enter()
+        if entered is not None:
+            out.append(entered)
+
+        separator = self.separator
+        start = len(out)
+        for child in self.children:
+            # only separate children that actually wrote something
+            if separator and len(out) > start:
+                out.append(separator)
+                mark = len(out)
+            else:
+                mark = -1
+
+            if isinstance(child, str):
+                if child:
+                    out.append(child)
+            else:
+                child.write(out)
+
+            if len(out) == mark:
+                out.pop()
+
+        departed = self.depart()
+        if departed is not None:
+            out.append(departed)
+
     def add(self, child: ChildType) -> None:
         """Add a child"""
         self.children.append(child)
@@ -457,6 +877,8 @@ class RootNode(Node):
     }
     """
 
+    separator = ''
+
     __slots__ = ()
 
     @override
@@ -479,6 +901,12 @@ class RootNode(Node):
             raise RuntimeError('Could not generate query.')
         return content
 
+    def compact(self) -> str:
+        """Render the query in a single pass, without any indentation or newlines"""
+        out: list[str] = []
+        self.write(out)
+        return ''.join(out)
+
 
 class ResultNode(Node):
     """Rendered node examples:
@@ -492,6 +920,8 @@ class ResultNode(Node):
         <children>
     """
 
+    separator = ''
+
     __slots__ = ()
 
     def __init__(self, indent: str = '', **kwargs: Any) -> None:
@@ -564,6 +994,7 @@ class Arguments(Node):
                 # ignore None values for convenience
                 continue
 
+            arg = _alias(arg, arg)
             if isinstance(value, dict):
                 children.append(Key(arg, node=Data.create(self.builder, data=value)))
             elif isinstance(value, ITERABLES):
@@ -571,12 +1002,12 @@ class Arguments(Node):
                 # here as prisma expects parameters to be passed as a json string
                 # value like "[\"John\",\"123\"]", and we encode twice to ensure
                 # that only the inner quotes are escaped
-                if self.builder.method in {'query_raw', 'query_first', 'execute_raw'}:
-                    children.append(f'{arg}: {dumps(dumps(value))}')
+                if self.builder.method in RAW_METHODS:
+                    children.append(f'{arg}: {self.builder._literal(list(value), raw=True)}')
                 else:
                     children.append(Key(arg, node=ListNode.create(self.builder, data=value)))
             else:
-                children.append(f'{arg}: {dumps(value)}')
+                children.append(f'{arg}: {self.builder._literal(value)}')
 
         return children
 
@@ -614,17 +1045,20 @@ class Data(Node):
         children: list[ChildType] = []
 
         for key, value in self.data.items():
+            key = _alias(key, key)
             if isinstance(value, dict):
                 children.append(Key(key, node=Data.create(self.builder, data=value)))
             elif isinstance(value, (list, tuple, set)):
                 children.append(Key(key, node=ListNode.create(self.builder, data=value)))
             else:
-                children.append(f'{key}: {dumps(value)}')
+                children.append(f'{key}: {self.builder._literal(value)}')
 
         return children
 
 
 class ListNode(Node):
+    separator = ','
+
     data: Iterable[Any]
 
     __slots__ = ('data',)
@@ -649,7 +1083,7 @@ class ListNode(Node):
             if isinstance(item, dict):
                 children.append(Data.create(self.builder, data=item))
             else:
-                children.append(dumps(item))
+                children.append(self.builder._literal(item))
 
         return children
 
@@ -742,13 +1176,16 @@ class Selection(Node):
         if root_selection is not None:
             children.extend(root_selection)
         elif model is not None:
-            children.extend(builder.get_default_fields(model))
+            metadata = builder._get_metadata(model)
+            if metadata.scalar_fields:
+                children.append(Fields(metadata))
 
         if include is not None:
             if model is None:
                 raise ValueError('Cannot include fields when model is None.')
 
             for key, value in include.items():
+                key = _alias(key, key)
                 if value is True:
                     # e.g. posts { post_fields }
                     children.append(
@@ -765,7 +1202,7 @@ class Selection(Node):
                 elif isinstance(value, dict):
                     # e.g. given {'posts': {where': {'published': True}}} return
                     # posts( where: { published: true }) { post_fields }
-                    args = value.copy()
+                    args = {_alias(arg, arg): arg_value for arg, arg_value in value.items()}
                     nested_include = args.pop('include', None)
                     children.extend(
                         [
@@ -814,6 +1251,30 @@ class Key(AbstractNode):
             return f'{self.key}{self.sep}{content}'
         return f'{self.key}{self.sep}'
 
+    @override
+    def write(self, out: list[str]) -> None:
+        out.append(f'{self.key}{self.sep.strip()}')
+        self.node.write(out)
+
+
+class Fields(AbstractNode):
+    """Node for rendering the pre-rendered default selection of a model"""
+
+    metadata: ModelMetadata
+
+    __slots__ = ('metadata',)
+
+    def __init__(self, metadata: ModelMetadata) -> None:
+        self.metadata = metadata
+
+    @override
+    def render(self) -> str:
+        return self.metadata.default_selection
+
+    @override
+    def write(self, out: list[str]) -> None:
+        out.append(self.metadata.compact_selection)
+
 
 @singledispatch
 def serializer(obj: Any) -> Serializable:
@@ -869,10 +1330,19 @@ def serialize_decimal(obj: decimal.Decimal) -> str:
 
 
 def dumps(obj: Any, **kwargs: Any) -> str:
+    if not kwargs:
+        return _codec.dumps(obj, default=serializer)
+
+    # custom encoding options are only supported by the standard library
     kwargs.setdefault('default', serializer)
     kwargs.setdefault('ensure_ascii', False)
     return json.dumps(obj, **kwargs)
 
 
+def dumpb(obj: Any) -> bytes:
+    """Like `dumps()` but encodes straight to UTF-8 bytes"""
+    return _codec.dumpb(obj, default=serializer)
+
+
 # black does not respect the fmt: off comment without this
 # fmt: on
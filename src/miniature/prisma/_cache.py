@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import time
+import logging
+import threading
+from typing import TYPE_CHECKING, Any, Type, Tuple, Union, Hashable, Iterable, Optional, FrozenSet, NamedTuple
+from datetime import timedelta
+from functools import lru_cache
+from collections import OrderedDict
+
+from . import _codec
+from ._builder import get_model_metadata
+
+if TYPE_CHECKING:
+    from pydantic import BaseModel
+
+__all__ = (
+    'CacheStats',
+    'QueryCache',
+    'related_models',
+)
+
+log: logging.Logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_SIZE = 1024
+DEFAULT_TTL = timedelta(seconds=60)
+
+
+class CacheStats(NamedTuple):
+    hits: int
+    """Number of reads that were answered from the cache"""
+
+    misses: int
+    """Number of reads that were sent to the query engine"""
+
+    evictions: int
+    """Number of entries that were dropped as they expired or the cache was full"""
+
+    invalidations: int
+    """Number of entries that were dropped as their models were mutated"""
+
+    size: int
+    """Number of entries that are currently cached"""
+
+
+class _Entry(NamedTuple):
+    expires_at: float
+    model: str
+    data: bytes
+
+
+class QueryCache:
+    """Read-through cache for the results of read queries, keyed by the rendered query.
+
+    A cache can be shared by any number of clients, across threads, e.g.
+
+    ```py
+    cache = QueryCache(ttl=timedelta(seconds=30))
+    db = Prisma(cache=cache)
+    ```
+
+    Reads within a transaction are never cached. Any mutation made through a client
+    using the cache, including within batches and transactions, drops the cached results
+    of the mutated model and of every model it is related to, as relations can be
+    included in reads and be changed by cascades. Raw queries drop every cached result.
+
+    A result is only stored if the cache was not invalidated while it was fetched, reads
+    that are coalesced by a `QueryDispatcher` only share queries sent at the same `version`.
+
+    Changes that are made to the database by anything else are only picked up once the
+    cached results expire.
+
+    Pages fetched by `iter_many()` & `iter_batches()` bypass the cache as they are only
+    read once and would otherwise evict every other result when iterating a large table.
+    """
+
+    __slots__ = (
+        'max_size',
+        'ttl',
+        '_lock',
+        '_entries',
+        '_version',
+        '_hits',
+        '_misses',
+        '_evictions',
+        '_invalidations',
+    )
+
+    def __init__(
+        self,
+        *,
+        max_size: int = DEFAULT_MAX_SIZE,
+        ttl: Union[timedelta, float] = DEFAULT_TTL,
+    ) -> None:
+        if max_size < 1:
+            raise ValueError(f'max_size must be at least 1, got {max_size}')
+
+        self.max_size = max_size
+        self.ttl = ttl.total_seconds() if isinstance(ttl, timedelta) else float(ttl)
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[Tuple[Hashable, Any], _Entry] = OrderedDict()
+        self._version = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                invalidations=self._invalidations,
+                size=len(self._entries),
+            )
+
+    @property
+    def version(self) -> int:
+        """Incremented on every invalidation, results are only stored if it did not change while they were fetched"""
+        return self._version
+
+    def get(self, key: Tuple[Hashable, Any]) -> Optional[Any]:
+        """Returns a copy of the cached response or None if there is none"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+
+            if entry.expires_at <= time.monotonic():
+                del self._entries[key]
+                self._evictions += 1
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+            data = entry.data
+
+        # a copy is returned every time as responses are updated in place when hydrated
+        return _codec.loads(data)
+
+    def set(self, key: Tuple[Hashable, Any], response: Any, *, model: str, version: int) -> None:
+        """Store the response of a read on `model` that was sent when the cache was at `version`"""
+        data = _codec.dumpb(response)
+        with self._lock:
+            if version != self._version:
+                log.debug('Not caching result as %s was invalidated while it was fetched', model)
+                return
+
+            self._entries[key] = _Entry(expires_at=time.monotonic() + self.ttl, model=model, data=data)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self, models: Optional[Iterable[str]] = None) -> None:
+        """Drop the cached results for the given model names or every result if None is given"""
+        with self._lock:
+            self._version += 1
+            if models is None:
+                self._invalidations += len(self._entries)
+                self._entries.clear()
+                return
+
+            names = frozenset(models)
+            stale = [key for key, entry in self._entries.items() if entry.model in names]
+            for key in stale:
+                del self._entries[key]
+            self._invalidations += len(stale)
+
+    def clear(self) -> None:
+        """Drop every cached result without counting them as invalidations"""
+        with self._lock:
+            self._version += 1
+            self._entries.clear()
+
+    def __repr__(self) -> str:
+        return f'<{self.__class__.__name__} max_size={self.max_size} ttl={self.ttl}>'
+
+
+@lru_cache(maxsize=None)
+def related_models(model: Type[BaseModel]) -> FrozenSet[str]:
+    """Returns the names of `model` and every model it is directly or indirectly related to"""
+    seen = {model}
+    stack = [model]
+    while stack:
+        for related in get_model_metadata(stack.pop()).relations.values():
+            if related not in seen:
+                seen.add(related)
+                stack.append(related)
+
+    return frozenset(m.__name__ for m in seen)
@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import json
+import math
+import logging
+from typing import Any, Dict, Type, Union, Callable, Optional
+
+__all__ = (
+    'JSONCodec',
+    'OrjsonCodec',
+    'MsgspecCodec',
+    'CODECS',
+    'get_codec',
+    'set_codec',
+    'dumps',
+    'dumpb',
+    'loads',
+    'clone',
+)
+
+log: logging.Logger = logging.getLogger(__name__)
+
+Default = Optional[Callable[[Any], Any]]
+JSONInput = Union[str, bytes, bytearray, memoryview]
+
+
+def _stdlib_dumps(obj: Any, default: Default) -> str:
+    # the engine cannot parse NaN or Infinity so they are rejected before anything is sent
+    return json.dumps(obj, default=default, ensure_ascii=False, allow_nan=False)
+
+
+def _has_non_finite(obj: Any) -> bool:
+    if isinstance(obj, float):
+        return not math.isfinite(obj)
+    if isinstance(obj, dict):
+        return any(_has_non_finite(value) for value in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return any(_has_non_finite(value) for value in obj)
+    return False
+
+
+class JSONCodec:
+    """Encodes and decodes JSON for engine traffic using the standard library.
+
+    Subclasses swap in faster backends, they must produce output that the engine
+    parses to the same values and must call `default` for every type that the
+    standard library would pass to it, most importantly `datetime` objects, so
+    that the serializers registered in `_builder` stay authoritative.
+
+    Non-finite floats (NaN, Infinity) raise a ValueError with every codec.
+    """
+
+    name: str = 'stdlib'
+
+    __slots__ = ()
+
+    def dumps(self, obj: Any, *, default: Default = None) -> str:
+        return _stdlib_dumps(obj, default)
+
+    def dumpb(self, obj: Any, *, default: Default = None) -> bytes:
+        """Encode straight to UTF-8 bytes, which is what is sent over the wire"""
+        return self.dumps(obj, default=default).encode('utf-8')
+
+    def loads(self, data: JSONInput) -> Any:
+        if isinstance(data, memoryview):
+            data = bytes(data)
+        return json.loads(data)
+
+    def __repr__(self) -> str:
+        return f'<{self.__class__.__name__} name={self.name!r}>'
+
+
+class OrjsonCodec(JSONCodec):
+    """orjson backed codec.
+
+    Datetimes are passed through to `default` as the engine expects them to be converted
+    to UTC and truncated to milliseconds. Objects orjson refuses to encode, e.g. integers
+    outside of the 64 bit range, are retried with the standard library so that behaviour
+    and error messages match the `JSONCodec`. orjson writes non-finite floats as null, so
+    output containing null is checked for them and re-encoded by the standard library,
+    which raises.
+
+    Note that orjson decodes integers outside of the 64 bit range as floats, the engine
+    never returns these as BigInt values are limited to 64 bits.
+    """
+
+    name = 'orjson'
+
+    __slots__ = ('_orjson', '_options')
+
+    def __init__(self) -> None:
+        import orjson
+
+        self._orjson = orjson
+        self._options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, obj: Any, *, default: Default = None) -> str:
+        return self.dumpb(obj, default=default).decode('utf-8')
+
+    def dumpb(self, obj: Any, *, default: Default = None) -> bytes:
+        try:
+            data = self._orjson.dumps(obj, default=default, option=self._options)
+        except self._orjson.JSONEncodeError:
+            pass
+        else:
+            if b'null' not in data or not _has_non_finite(obj):
+                return data
+
+        return _stdlib_dumps(obj, default).encode('utf-8')
+
+    def loads(self, data: JSONInput) -> Any:
+        # JSONDecodeError is a subclass of `json.JSONDecodeError` so no translation is needed
+        return self._orjson.loads(data)
+
+
+class MsgspecCodec(JSONCodec):
+    """msgspec backed codec.
+
+    msgspec always encodes datetimes itself, in a format that differs from our serializer,
+    so it is only used for decoding. Input that msgspec cannot decode is retried with the
+    standard library so that the same errors are raised.
+    """
+
+    name = 'msgspec'
+
+    __slots__ = ('_decode', '_decode_error')
+
+    def __init__(self) -> None:
+        import msgspec
+
+        self._decode = msgspec.json.Decoder().decode
+        self._decode_error = msgspec.DecodeError
+
+    def loads(self, data: JSONInput) -> Any:
+        try:
+            return self._decode(data)
+        except self._decode_error:
+            return super().loads(data)
+
+
+CODECS: Dict[str, Type[JSONCodec]] = {
+    'orjson': OrjsonCodec,
+    'msgspec': MsgspecCodec,
+    'stdlib': JSONCodec,
+}
+"""Available codecs, in order of preference"""
+
+
+def _detect() -> JSONCodec:
+    for name, cls in CODECS.items():
+        try:
+            codec = cls()
+        except ImportError:
+            log.debug('Not using the %s JSON codec as it is not installed', name)
+            continue
+
+        log.debug('Using the %s JSON codec', name)
+        return codec
+
+    return JSONCodec()
+
+
+_codec: JSONCodec = _detect()
+
+
+def get_codec() -> JSONCodec:
+    """Returns the codec that is currently in use"""
+    return _codec
+
+
+def set_codec(codec: JSONCodec | str) -> JSONCodec:
+    """Replace the codec that is currently in use, e.g. `set_codec('stdlib')`
+
+    Raises ImportError if the backend for the given codec is not installed.
+    Returns the previous codec.
+    """
+    global _codec
+
+    if isinstance(codec, str):
+        try:
+            cls = CODECS[codec]
+        except KeyError:
+            raise ValueError(f'Unknown JSON codec {codec!r}, expected one of {list(CODECS)}') from None
+        codec = cls()
+
+    previous = _codec
+    _codec = codec
+    return previous
+
+
+def dumps(obj: Any, *, default: Default = None) -> str:
+    return _codec.dumps(obj, default=default)
+
+
+def dumpb(obj: Any, *, default: Default = None) -> bytes:
+    return _codec.dumpb(obj, default=default)
+
+
+def loads(data: JSONInput) -> Any:
+    return _codec.loads(data)
+
+
+def clone(data: Any) -> Any:
+    """Deep copy a decoded engine response"""
+    # engine responses only contain JSON types so a round trip is an exact deep copy,
+    # and a much faster one than `copy.deepcopy()`
+    return _codec.loads(_codec.dumpb(data))
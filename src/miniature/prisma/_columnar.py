@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Dict, List, Type, Mapping, Optional
+from functools import lru_cache
+
+from ._compat import model_fields, model_field_type
+from ._builder import get_model_metadata
+from ._hydration import Converter, to_int, scalar_converter
+
+if TYPE_CHECKING:
+    from .bases import _PrismaModel as PrismaModel  # noqa: TID251
+
+__all__ = (
+    'Columns',
+    'DEFAULT_SEPARATOR',
+    'build_columns',
+)
+
+Columns = Dict[str, List[Any]]
+"""Mapping of column names to the values of every record, e.g. `{'id': [1, 2], 'name': ['a', 'b']}`
+
+This can be passed straight to `pandas.DataFrame()`.
+"""
+
+DEFAULT_SEPARATOR = '.'
+"""Joins relation names and their field names when flattening, e.g. `rank.name`"""
+
+
+def build_columns(
+    model: Type[PrismaModel],
+    rows: List[Dict[str, Any]],
+    *,
+    include: Optional[Mapping[str, Any]] = None,
+    sep: str = DEFAULT_SEPARATOR,
+) -> Columns:
+    """Transpose query engine records into columns without creating any model instances.
+
+    Scalar fields of to-one relations in `include` are flattened into `{relation}{sep}{field}`
+    columns, recursively, with None values for records where the relation is not set.
+    To-many relations cannot be flattened and are returned as a single column holding
+    the raw records of each relation.
+
+    The columns are derived from the model & `include`, not the records, so they are
+    present even if no records are found.
+    """
+    columns: Columns = {}
+    _add_columns(columns, model, rows, include=include, prefix='', sep=sep, nullable=False)
+    return columns
+
+
+def _add_columns(
+    columns: Columns,
+    model: Type[PrismaModel],
+    rows: List[Any],
+    *,
+    include: Optional[Mapping[str, Any]],
+    prefix: str,
+    sep: str,
+    nullable: bool,
+) -> None:
+    metadata = get_model_metadata(model)
+    converters = _column_converters(model)
+
+    for name in metadata.scalar_fields:
+        if nullable:
+            values = [None if row is None else row.get(name) for row in rows]
+        else:
+            values = [row.get(name) for row in rows]
+
+        converter = converters[name]
+        if converter is to_int:
+            # only BigInt columns are transported as strings
+            first = next((value for value in values if value is not None), None)
+            if isinstance(first, str):
+                values = [None if value is None else int(value) for value in values]
+        elif converter is not None:
+            values = [None if value is None else converter(value) for value in values]
+
+        columns[prefix + name] = values
+
+    if not include:
+        return
+
+    for key, value in include.items():
+        if value is False or value is None:
+            continue
+
+        if nullable:
+            related_rows = [None if row is None else row.get(key) for row in rows]
+        else:
+            related_rows = [row.get(key) for row in rows]
+
+        related = metadata.relations.get(key)
+        if related is None or key in metadata.list_relations:
+            # e.g. `_count` or to-many relations
+            columns[prefix + key] = related_rows
+            continue
+
+        nested = value.get('include') if isinstance(value, dict) else None
+        _add_columns(
+            columns,
+            related,
+            related_rows,
+            include=nested,
+            prefix=f'{prefix}{key}{sep}',
+            sep=sep,
+            nullable=True,
+        )
+
+
+@lru_cache(maxsize=None)
+def _column_converters(model: Type[PrismaModel]) -> Dict[str, Optional[Converter]]:
+    fields = model_fields(model)
+    use_enum_values = bool(getattr(model, 'model_config', {}).get('use_enum_values'))
+    return {
+        name: scalar_converter(model_field_type(fields[name]), use_enum_values=use_enum_values)
+        for name in get_model_metadata(model).scalar_fields
+    }
@@ -0,0 +1,301 @@
+from __future__ import annotations
+
+import time
+import asyncio
+import logging
+import threading
+import concurrent.futures
+from typing import TYPE_CHECKING, Any, Dict, Deque, Tuple, Hashable, Optional, NamedTuple
+from collections import deque
+
+from . import _codec
+from ._types import PrismaMethod, TransactionId
+
+if TYPE_CHECKING:
+    from .engine import AsyncAbstractEngine
+
+__all__ = (
+    'READ_METHODS',
+    'DispatchStats',
+    'QueryDispatcher',
+)
+
+log: logging.Logger = logging.getLogger(__name__)
+
+READ_METHODS: frozenset[PrismaMethod] = frozenset(
+    {
+        'count',
+        'group_by',
+        'find_many',
+        'find_first',
+        'find_first_or_raise',
+        'find_unique',
+        'find_unique_or_raise',
+    }
+)
+"""Methods that never write, identical concurrent queries for these can share a single response.
+
+Raw queries are not included as they can contain arbitrary statements.
+"""
+
+
+class DispatchStats(NamedTuple):
+    dispatched: int
+    """Number of queries that were sent to the query engine"""
+
+    coalesced: int
+    """Number of queries that shared the response of an identical in-flight query"""
+
+    in_flight: int
+    """Number of queries that are currently being executed by the query engine"""
+
+    queued: int
+    """Number of queries that are currently waiting for a free slot"""
+
+    max_queued: int
+    """The highest number of queries that have been waiting for a free slot at once"""
+
+    queue_time: float
+    """Total seconds that queries have spent waiting for a free slot"""
+
+
+class _LeaderCancelled(Exception):
+    """Set on a shared flight when the query that is executing it is cancelled"""
+
+
+class _Flight:
+    __slots__ = ('future', 'followers', 'generation')
+
+    def __init__(self, generation: int) -> None:
+        self.future: concurrent.futures.Future[Any] = concurrent.futures.Future()
+        self.followers = 0
+        self.generation = generation
+
+
+def _grant(waiter: asyncio.Future[None]) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+class QueryDispatcher:
+    """Sits in front of the query engine to coalesce identical reads & limit concurrency.
+
+    A dispatcher can be shared by any number of clients, across threads and event loops,
+    e.g. one per process for every Streamlit session:
+
+    ```py
+    dispatcher = QueryDispatcher(max_concurrency=16)
+    db = Prisma(dispatcher=dispatcher)
+    ```
+
+    Identical read queries to the same engine that are in-flight at the same time are
+    only sent once, every caller gets its own copy of the response. Mutations, raw
+    queries and queries within a transaction are always sent as-is.
+
+    A read never joins a query that was sent before the latest write made through a
+    client using the dispatcher finished, as it could miss that write, see `mutated()`.
+
+    If `max_concurrency` is given, at most that many queries are executed at once and
+    the rest wait in FIFO order.
+
+    Only queries made by the asyncio client are dispatched.
+    """
+
+    __slots__ = (
+        'coalesce',
+        'max_concurrency',
+        '_lock',
+        '_flights',
+        '_generation',
+        '_waiters',
+        '_active',
+        '_dispatched',
+        '_coalesced',
+        '_max_queued',
+        '_queue_time',
+    )
+
+    def __init__(self, *, max_concurrency: Optional[int] = None, coalesce: bool = True) -> None:
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError(f'max_concurrency must be at least 1, got {max_concurrency}')
+
+        self.coalesce = coalesce
+        self.max_concurrency = max_concurrency
+        self._lock = threading.Lock()
+        self._flights: Dict[Tuple[Hashable, ...], _Flight] = {}
+        self._generation = 0
+        self._waiters: Deque[Tuple[asyncio.AbstractEventLoop, asyncio.Future[None]]] = deque()
+        self._active = 0
+        self._dispatched = 0
+        self._coalesced = 0
+        self._max_queued = 0
+        self._queue_time = 0.0
+
+    def stats(self) -> DispatchStats:
+        with self._lock:
+            return DispatchStats(
+                dispatched=self._dispatched,
+                coalesced=self._coalesced,
+                in_flight=self._active,
+                queued=len(self._waiters),
+                max_queued=self._max_queued,
+                queue_time=self._queue_time,
+            )
+
+    @property
+    def generation(self) -> int:
+        """Incremented every time a write finishes, reads only share queries sent in the same generation"""
+        return self._generation
+
+    def mutated(self) -> None:
+        """Called once a write has finished, in-flight reads may not include it so they can no longer be joined"""
+        with self._lock:
+            self._generation += 1
+
+    async def query(
+        self,
+        engine: AsyncAbstractEngine,
+        content: str | bytes,
+        *,
+        tx_id: TransactionId | None,
+        method: PrismaMethod,
+        version: Hashable = None,
+    ) -> Any:
+        """Send the query, reads only share a query started with the same `version`.
+
+        Reads that will be cached pass the `QueryCache.version` they were sent at so that
+        they never share a query that was sent before the cache was last invalidated.
+        """
+        if not self.coalesce or tx_id is not None or method not in READ_METHODS:
+            return await self._send(engine, content, tx_id=tx_id)
+
+        key = (engine.endpoint, version, content)
+        while True:
+            with self._lock:
+                flight = self._flights.get(key)
+                if flight is None or flight.generation != self._generation:
+                    # a flight from an older generation is left to finish for its own followers
+                    flight = self._flights[key] = _Flight(self._generation)
+                    leader = True
+                else:
+                    flight.followers += 1
+                    self._coalesced += 1
+                    leader = False
+
+            if leader:
+                return await self._lead(engine, content, key, flight)
+
+            try:
+                # shielded as cancelling a follower must not cancel the shared query
+                result = await asyncio.shield(asyncio.wrap_future(flight.future))
+            except _LeaderCancelled:
+                log.debug('Retrying coalesced query as the query it was waiting on was cancelled')
+                continue
+
+            return _codec.clone(result)
+
+    async def _lead(
+        self,
+        engine: AsyncAbstractEngine,
+        content: str | bytes,
+        key: Tuple[Hashable, ...],
+        flight: _Flight,
+    ) -> Any:
+        try:
+            result = await self._send(engine, content, tx_id=None)
+        except asyncio.CancelledError:
+            self._land(key, flight)
+            flight.future.set_exception(_LeaderCancelled())
+            raise
+        except BaseException as exc:
+            self._land(key, flight)
+            flight.future.set_exception(exc)
+            raise
+
+        followers = self._land(key, flight)
+        flight.future.set_result(result)
+
+        # the shared response must stay untouched until every follower has copied it
+        return _codec.clone(result) if followers else result
+
+    def _land(self, key: Tuple[Hashable, ...], flight: _Flight) -> int:
+        with self._lock:
+            # the key may already belong to a newer flight
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+            return flight.followers
+
+    async def send(self, engine: AsyncAbstractEngine, content: str | bytes, *, tx_id: TransactionId | None) -> Any:
+        """Send `content` as-is, only applying the concurrency limit"""
+        return await self._send(engine, content, tx_id=tx_id)
+
+    async def _send(self, engine: AsyncAbstractEngine, content: str | bytes, *, tx_id: TransactionId | None) -> Any:
+        if self.max_concurrency is None:
+            with self._lock:
+                self._active += 1
+                self._dispatched += 1
+            try:
+                return await engine.query(content, tx_id=tx_id)
+            finally:
+                with self._lock:
+                    self._active -= 1
+
+        await self._acquire()
+        try:
+            return await engine.query(content, tx_id=tx_id)
+        finally:
+            self._release()
+
+    async def _acquire(self) -> None:
+        assert self.max_concurrency is not None
+
+        with self._lock:
+            if self._active < self.max_concurrency and not self._waiters:
+                self._active += 1
+                self._dispatched += 1
+                return
+
+            loop = asyncio.get_running_loop()
+            waiter: asyncio.Future[None] = loop.create_future()
+            entry = (loop, waiter)
+            self._waiters.append(entry)
+            self._max_queued = max(self._max_queued, len(self._waiters))
+
+        start = time.perf_counter()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            with self._lock:
+                try:
+                    self._waiters.remove(entry)
+                    granted = False
+                except ValueError:
+                    granted = True
+
+            if granted:
+                # the slot was handed over to us after we were cancelled, pass it on
+                self._release()
+            raise
+        finally:
+            with self._lock:
+                self._queue_time += time.perf_counter() - start
+
+        with self._lock:
+            self._dispatched += 1
+
+    def _release(self) -> None:
+        with self._lock:
+            while self._waiters:
+                loop, waiter = self._waiters.popleft()
+                try:
+                    # the slot is handed over directly so `_active` does not change
+                    loop.call_soon_threadsafe(_grant, waiter)
+                except RuntimeError:
+                    # the event loop of the waiter has been closed
+                    continue
+                return
+
+            self._active -= 1
+
+    def __repr__(self) -> str:
+        return f'<{self.__class__.__name__} max_concurrency={self.max_concurrency} coalesce={self.coalesce}>'
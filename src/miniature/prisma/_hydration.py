@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+import enum
+import logging
+import functools
+import threading
+from typing import TYPE_CHECKING, Any, Dict, List, Type, Callable, Iterable, Iterator, Optional, cast
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from ._types import Hydration
+from ._compat import PYDANTIC_V2, get_args, is_union, get_origin, model_parse, model_fields, model_field_type
+from ._typing import is_list_type
+from ._builder import get_model_metadata
+
+if TYPE_CHECKING:
+    from .bases import _PrismaModel as PrismaModel  # noqa: TID251
+
+__all__ = (
+    'hydration',
+    'current_hydration',
+    'get_hydrator',
+    'hydrate',
+    'hydrate_many',
+)
+
+log: logging.Logger = logging.getLogger(__name__)
+
+Converter = Callable[[Any], Any]
+
+# validators that only apply to raw query results, the query engine never triggers them
+_ENGINE_SAFE_VALIDATORS = frozenset({'_transform_required_list_fields'})
+
+_override: ContextVar[Optional[Hydration]] = ContextVar('prisma_hydration', default=None)
+
+_hydrators: Dict[type, Callable[[Dict[str, Any]], Any]] = {}
+_lock = threading.Lock()
+
+_object_new = object.__new__
+_object_setattr = object.__setattr__
+
+
+@contextmanager
+def hydration(mode: Hydration) -> Iterator[None]:
+    """Override how query results are converted to models for the current context.
+
+    This takes precedence over the `hydration` option of the client, e.g.
+
+    ```py
+    with hydration('trusted'):
+        players = await db.player.find_many(include={'rank': True})
+    ```
+    """
+    token = _override.set(mode)
+    try:
+        yield
+    finally:
+        _override.reset(token)
+
+
+def current_hydration(default: Hydration) -> Hydration:
+    """Returns the hydration mode set by `hydration()` or the given default if there is none"""
+    mode = _override.get()
+    return default if mode is None else mode
+
+
+def hydrate(model: Type[PrismaModel], data: Any, *, mode: Hydration) -> Any:
+    if mode == 'trusted':
+        return get_hydrator(model)(data)
+    return model_parse(model, data)
+
+
+def hydrate_many(model: Type[PrismaModel], items: Iterable[Any], *, mode: Hydration) -> List[Any]:
+    if mode == 'trusted':
+        hydrator = get_hydrator(model)
+        return [hydrator(data) for data in items]
+    return [model_parse(model, data) for data in items]
+
+
+def get_hydrator(model: Type[PrismaModel]) -> Callable[[Dict[str, Any]], Any]:
+    """Returns a function that builds `model` instances from query engine results without validation.
+
+    Data from the query engine already matches the schema, so only the values that are
+    transported as a different JSON type, e.g. `DateTime` strings, are converted and
+    relational fields are hydrated recursively. Models that cannot be trusted, e.g. ones
+    with custom validators, fall back to regular validation.
+
+    The given data is updated in place and used as the instance `__dict__` so it must
+    not be shared with anything else.
+    """
+    try:
+        return _hydrators[model]
+    except KeyError:
+        pass
+
+    with _lock:
+        hydrator = _hydrators.get(model)
+        if hydrator is None:
+            hydrator = _hydrators[model] = _create_hydrator(model)
+        return hydrator
+
+
+def _create_hydrator(model: Type[PrismaModel]) -> Callable[[Dict[str, Any]], Any]:
+    reason = _untrusted_reason(model)
+    if reason is not None:
+        log.debug('Validating %s results as %s', model.__name__, reason)
+        return lambda data: model_parse(model, data)
+
+    metadata = get_model_metadata(model)
+    use_enum_values = bool(model.model_config.get('use_enum_values'))
+
+    names: List[str] = []
+    defaults: Dict[str, Any] = {}
+    namespace: Dict[str, Any] = {
+        '_model': model,
+        '_names': names,
+        '_defaults': defaults,
+        '_parse': model_parse,
+        '_new': _object_new,
+        '_set': _object_setattr,
+    }
+    conversions: List[str] = []
+
+    for index, (name, info) in enumerate(model_fields(model).items()):
+        names.append(name)
+        if not info.is_required() and info.default_factory is None:
+            defaults[name] = info.default
+
+        related = metadata.relations.get(name)
+        if related is not None:
+            converter: Converter | None = _relation_converter(related, many=name in metadata.list_relations)
+        else:
+            converter = scalar_converter(model_field_type(info), use_enum_values=use_enum_values)
+
+        if converter is None:
+            continue
+
+        if converter is to_int:
+            # BigInt values are transported as strings
+            conversions.append(
+                f'    value = data[{name!r}]\n'
+                f'    if type(value) is not int and value is not None:\n'
+                f'        data[{name!r}] = int(value)\n'
+            )
+        else:
+            namespace[f'_convert_{index}'] = converter
+            conversions.append(
+                f'    value = data[{name!r}]\n'
+                f'    if value is not None:\n'
+                f'        data[{name!r}] = _convert_{index}(value)\n'
+            )
+
+    # the generated function updates the engine result in place and uses it as the
+    # instance `__dict__`, when fields are missing a new dict is built in field order
+    source = (
+        'def hydrate(data):\n'
+        '    fields_set = set(data)\n'
+        f'    if len(data) != {len(names)}:\n'
+        '        try:\n'
+        '            data = {name: data[name] if name in data else _defaults[name] for name in _names}\n'
+        '        except KeyError:\n'
+        '            # a required field is missing, let validation report it\n'
+        '            return _parse(_model, data)\n'
+        + ''.join(conversions)
+        + '    instance = _new(_model)\n'
+        "    _set(instance, '__dict__', data)\n"
+        "    _set(instance, '__pydantic_fields_set__', fields_set)\n"
+        "    _set(instance, '__pydantic_extra__', None)\n"
+        "    _set(instance, '__pydantic_private__', None)\n"
+        '    return instance\n'
+    )
+    exec(compile(source, f'<prisma hydrator {model.__name__}>', 'exec'), namespace)
+    return cast(Callable[[Dict[str, Any]], Any], namespace['hydrate'])
+
+
+def _untrusted_reason(model: Type[PrismaModel]) -> str | None:
+    if not PYDANTIC_V2:
+        return 'trusted hydration requires pydantic v2'
+
+    if model.__private_attributes__:
+        return 'it defines private attributes'
+
+    if model.model_config.get('extra') == 'allow':
+        return 'it allows extra fields'
+
+    decorators = model.__pydantic_decorators__
+    if decorators.model_validators or decorators.root_validators:
+        return 'it defines model validators'
+
+    field_validators = set(decorators.field_validators) | set(decorators.validators)
+    if field_validators - _ENGINE_SAFE_VALIDATORS:
+        return 'it defines field validators'
+
+    for name, info in model_fields(model).items():
+        if info.alias is not None and info.alias != name:
+            return 'it uses field aliases'
+
+    return None
+
+
+def _relation_converter(related: Type[PrismaModel], *, many: bool) -> Converter:
+    # the related hydrator is resolved on first use as relations can be cyclic
+    if many:
+
+        def convert_many(value: Any) -> Any:
+            hydrator = get_hydrator(related)
+            return [hydrator(item) for item in value]
+
+        return convert_many
+
+    def convert(value: Any) -> Any:
+        return get_hydrator(related)(value)
+
+    return convert
+
+
+def scalar_converter(type_: Any, *, use_enum_values: bool) -> Converter | None:
+    """Returns a function converting a JSON value from the query engine to the given field type
+
+    None is returned if the JSON value can be used as-is.
+    """
+    if is_union(get_origin(type_)):
+        args = [arg for arg in get_args(type_) if arg is not type(None)]
+        if len(args) == 1:
+            type_ = args[0]
+
+    if type_ is str or type_ is bool:
+        return None
+
+    if type_ is int:
+        return to_int
+
+    if type_ is float:
+        return to_float
+
+    if isinstance(type_, type) and issubclass(type_, enum.Enum) and use_enum_values:
+        return None
+
+    if is_list_type(type_):
+        args = get_args(type_)
+        if args and (args[0] is str or args[0] is bool):
+            return None
+
+    if PYDANTIC_V2:
+        from pydantic import TypeAdapter
+
+        return TypeAdapter(type_).validate_python
+
+    from pydantic import parse_obj_as  # pyright: ignore[reportDeprecated]
+
+    return functools.partial(parse_obj_as, type_)  # pyright: ignore[reportDeprecated]
+
+
+def to_int(value: Any) -> Any:
+    # only used as a marker, conversions for int fields are inlined into the generated hydrator
+    return value if type(value) is int else int(value)
+
+
+def to_float(value: Any) -> Any:
+    return value if type(value) is float else float(value)
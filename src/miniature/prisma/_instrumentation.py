@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import math
+import bisect
+import logging
+import itertools
+import threading
+from typing import Dict, List, Tuple, Union, Iterator, Optional, Sequence, NamedTuple
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing_extensions import Literal
+
+__all__ = (
+    'Phase',
+    'Instrumentation',
+    'HistogramSnapshot',
+    'instrumentation',
+    'current_instrumentation',
+)
+
+log: logging.Logger = logging.getLogger(__name__)
+
+Phase = Literal['build', 'serialize', 'execute', 'transport', 'parse', 'hydrate']
+"""The phases of a query, in order:
+
+- build: resolving the query shape & compiling or looking up its template
+- serialize: encoding the payload that is sent to the engine
+- execute: everything between the payload being built & the response being returned,
+  including time spent waiting in a `QueryDispatcher` or `AutoBatcher`
+- transport: the HTTP request to the engine, this is mostly time spent in the engine
+- parse: decoding the JSON response
+- hydrate: converting the response to model instances
+"""
+
+Size = Literal['request', 'response']
+
+LATENCY_BUCKETS: Tuple[float, ...] = tuple(0.00005 * 2**i for i in range(18))
+"""Upper bounds in seconds, from 50us to ~6.5s"""
+
+SIZE_BUCKETS: Tuple[float, ...] = tuple(float(4**i) for i in range(3, 14))
+"""Upper bounds in bytes, from 64B to 64MiB"""
+
+# (model, method) of the query that is being executed in the current context
+_labels: ContextVar[Tuple[str, str]] = ContextVar('prisma_instrumentation_labels', default=('-', '-'))
+
+# targets of the `instrumentation()` blocks that have been entered but not exited, in order,
+# the most recently entered one is enabled and cached in `_current` for the hot path
+_lock = threading.Lock()
+_blocks = itertools.count()
+_active: Dict[int, Optional[Instrumentation]] = {}
+_current: Optional[Instrumentation] = None
+
+
+class HistogramSnapshot(NamedTuple):
+    count: int
+    sum: float
+    max: float
+    buckets: Tuple[Tuple[float, int], ...]
+    """(upper bound, number of observations in the bucket), the last bound is infinity"""
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """Estimate the `q` quantile as the upper bound of the bucket it falls in"""
+        if not self.count:
+            return 0.0
+
+        rank = q * self.count
+        seen = 0
+        for upper, count in self.buckets:
+            seen += count
+            if seen >= rank:
+                return min(upper, self.max)
+        return self.max
+
+
+class _Histogram:
+    __slots__ = ('bounds', 'counts', 'count', 'sum', 'max')
+
+    def __init__(self, bounds: Sequence[float]) -> None:
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def snapshot(self) -> HistogramSnapshot:
+        bounds = (*self.bounds, math.inf)
+        return HistogramSnapshot(
+            count=self.count,
+            sum=self.sum,
+            max=self.max,
+            buckets=tuple(zip(bounds, self.counts)),
+        )
+
+
+class Instrumentation:
+    """Records latency histograms per query phase & payload size histograms, labelled by model and method.
+
+    Nothing is recorded unless it is enabled using `instrumentation()`, e.g.
+
+    ```py
+    stats = Instrumentation()
+    with instrumentation(stats):
+        await db.player.find_many(include={'rank': True})
+
+    print(stats.report())
+    ```
+
+    Raw queries are labelled with a model of `-` and batches with a method of `batch`.
+    """
+
+    __slots__ = ('_lock', '_latencies', '_sizes')
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._latencies: Dict[Tuple[Phase, str, str], _Histogram] = {}
+        self._sizes: Dict[Tuple[Size, str, str], _Histogram] = {}
+
+    def record(self, phase: Phase, seconds: float, *, model: str, method: str) -> None:
+        key = (phase, model, method)
+        with self._lock:
+            histogram = self._latencies.get(key)
+            if histogram is None:
+                histogram = self._latencies[key] = _Histogram(LATENCY_BUCKETS)
+            histogram.observe(seconds)
+
+    def record_size(self, kind: Size, size: int, *, model: str, method: str) -> None:
+        key = (kind, model, method)
+        with self._lock:
+            histogram = self._sizes.get(key)
+            if histogram is None:
+                histogram = self._sizes[key] = _Histogram(SIZE_BUCKETS)
+            histogram.observe(size)
+
+    def latencies(self) -> Dict[Tuple[Phase, str, str], HistogramSnapshot]:
+        """Returns the latency histograms in seconds keyed by (phase, model, method)"""
+        with self._lock:
+            return {key: histogram.snapshot() for key, histogram in self._latencies.items()}
+
+    def sizes(self) -> Dict[Tuple[Size, str, str], HistogramSnapshot]:
+        """Returns the payload size histograms in bytes keyed by ('request' | 'response', model, method)"""
+        with self._lock:
+            return {key: histogram.snapshot() for key, histogram in self._sizes.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._latencies.clear()
+            self._sizes.clear()
+
+    def report(self) -> str:
+        """Returns a table of the recorded latencies in milliseconds & sizes in bytes"""
+        rows: List[Tuple[str, ...]] = [('model', 'method', 'phase', 'count', 'mean', 'p50', 'p95', 'max')]
+        entries: List[Tuple[Tuple[str, str, str], HistogramSnapshot, float]] = [
+            *(((model, method, phase), snapshot, 1000.0) for (phase, model, method), snapshot in self.latencies().items()),
+            *(((model, method, f'{kind} bytes'), snapshot, 1.0) for (kind, model, method), snapshot in self.sizes().items()),
+        ]
+        for labels, snapshot, scale in sorted(entries, key=lambda entry: entry[0][:2]):
+            rows.append(
+                (
+                    *labels,
+                    str(snapshot.count),
+                    _format(snapshot.mean * scale),
+                    _format(snapshot.quantile(0.5) * scale),
+                    _format(snapshot.quantile(0.95) * scale),
+                    _format(snapshot.max * scale),
+                )
+            )
+
+        widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+        return '\n'.join('  '.join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip() for row in rows)
+
+    def __repr__(self) -> str:
+        return f'<{self.__class__.__name__} series={len(self._latencies) + len(self._sizes)}>'
+
+
+def _format(value: float) -> str:
+    return f'{value:.3f}' if value < 100 else f'{value:.0f}'
+
+
+@contextmanager
+def instrumentation(target: Union[Instrumentation, None]) -> Iterator[Optional[Instrumentation]]:
+    """Record every query made by any client, in any thread, to `target` until the block exits.
+
+    Passing None disables instrumentation within the block.
+
+    Blocks can overlap across threads & tasks and do not have to exit in the order they
+    were entered, the target of the most recently entered block that is still open is used.
+    """
+    global _current
+
+    with _lock:
+        block = next(_blocks)
+        _active[block] = target
+        _current = target
+    try:
+        yield target
+    finally:
+        with _lock:
+            del _active[block]
+            _current = next(reversed(_active.values()), None)
+
+
+def current_instrumentation() -> Optional[Instrumentation]:
+    """Returns the enabled instrumentation or None if queries are not being instrumented"""
+    return _current
+
+
+def set_labels(model: Optional[str], method: str) -> None:
+    """Attribute the engine requests & hydration that follow in the current context to a query"""
+    _labels.set((model or '-', method))
+
+
+def current_labels() -> Tuple[str, str]:
+    return _labels.get()
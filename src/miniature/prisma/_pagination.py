@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Dict, List, Union, TypeVar, Callable, Iterator, Optional, Awaitable, AsyncIterator
+
+__all__ = (
+    'DEFAULT_BATCH_SIZE',
+    'cursor_order',
+    'paginate',
+    'async_paginate',
+)
+
+log: logging.Logger = logging.getLogger(__name__)
+
+_T = TypeVar('_T')
+
+DEFAULT_BATCH_SIZE = 1000
+"""Number of records that are fetched per query by `iter_many()` & `iter_batches()`"""
+
+OrderInput = Union[Dict[str, Any], List[Dict[str, Any]], None]
+
+
+def cursor_order(order: OrderInput, key: str) -> List[Dict[str, Any]]:
+    """Returns the given order with `key` appended as a tie-breaker.
+
+    Cursor pagination is only stable if the order is unique, e.g. ordering by `rating`
+    alone would return players with the same rating in an arbitrary order on each page.
+    """
+    if order is None:
+        orders: List[Dict[str, Any]] = []
+    elif isinstance(order, dict):
+        orders = [order]
+    else:
+        orders = list(order)
+
+    if not any(key in item for item in orders):
+        orders.append({key: 'asc'})
+
+    return orders
+
+
+def _check_batch_size(batch_size: int) -> None:
+    if batch_size < 1:
+        raise ValueError(f'batch_size must be at least 1, got {batch_size}')
+
+
+def paginate(
+    fetch: Callable[[Optional[Dict[str, Any]]], List[_T]],
+    *,
+    key: str,
+    batch_size: int,
+) -> Iterator[List[_T]]:
+    """Yield every page returned by `fetch` until a page is not full.
+
+    `fetch` is called with the cursor to start *after*, or None for the first page.
+    """
+    _check_batch_size(batch_size)
+
+    page = fetch(None)
+    while page:
+        cursor = {key: getattr(page[-1], key)}
+        full = len(page) >= batch_size
+        yield page
+
+        if not full:
+            return
+
+        page = fetch(cursor)
+
+
+async def async_paginate(
+    fetch: Callable[[Optional[Dict[str, Any]]], Awaitable[List[_T]]],
+    *,
+    key: str,
+    batch_size: int,
+    prefetch: bool,
+) -> AsyncIterator[List[_T]]:
+    """Yield every page returned by `fetch` until a page is not full.
+
+    If `prefetch` is True the next page is requested while the current one is being
+    consumed, at most two pages are ever held at once. The pending request is cancelled
+    if iteration stops early, e.g. using `contextlib.aclosing()`.
+    """
+    _check_batch_size(batch_size)
+
+    pending: Optional[asyncio.Future[List[_T]]] = None
+    try:
+        page = await fetch(None)
+        while page:
+            cursor = {key: getattr(page[-1], key)}
+            full = len(page) >= batch_size
+            if full and prefetch:
+                pending = asyncio.ensure_future(fetch(cursor))
+
+            yield page
+
+            if not full:
+                return
+
+            if pending is not None:
+                page = await pending
+                pending = None
+            else:
+                page = await fetch(cursor)
+    finally:
+        if pending is not None:
+            if not pending.done():
+                log.debug('Cancelling prefetched page as iteration stopped early')
+                pending.cancel()
+            elif not pending.cancelled():
+                # the page is discarded, retrieve any error so that it is not logged as unhandled
+                pending.exception()
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 import json
-from typing import Any, Callable, overload
+import functools
+from typing import Any, Callable, Iterator, overload
 from typing_extensions import Literal
 
 from ._types import BaseModelT
@@ -63,6 +64,113 @@ class RawQueryResult:
         self.rows = rows
 
 
+Decoder = Callable[[Any], Any]
+"""Converts a non-null value of a column to its rich Python type"""
+
+
+# NOTE: this very weird `for_model` API is simply here as a workaround for
+# https://github.com/RobertCraigie/prisma-client-py/issues/638
+#
+# This should hopefully be removed soon.
+
+
+def compile_plan(result: RawQueryResult, *, for_model: bool) -> list[Decoder | None]:
+    """Returns the decoder for each column of the result, None if the values can be used as-is.
+
+    The column types are shared by every row so they only have to be resolved once per result.
+    """
+    return [
+        _compile_decoder(key, prisma_type, for_model=for_model)
+        for key, prisma_type in zip(result.columns, result.types)
+    ]
+
+
+def _compile_decoder(key: str, prisma_type: PrismaType, *, for_model: bool) -> Decoder | None:
+    if prisma_type.endswith('-array'):
+        item_type, _ = prisma_type.split('-')
+        deserializer = DESERIALIZERS.get(item_type)  # type: ignore[call-overload]
+
+        def decode_array(value: Any) -> Any:
+            if not isinstance(value, list):
+                raise TypeError(
+                    f'Expected array data for {key} column with internal type {prisma_type}',
+                )
+
+            if deserializer is None:
+                return list(value)  # pyright: ignore[reportUnknownArgumentType]
+
+            return [None if item is None else deserializer(item, for_model) for item in value]  # pyright: ignore[reportUnknownVariableType]
+
+        return decode_array
+
+    deserializer = DESERIALIZERS.get(prisma_type)
+    if deserializer is None:
+        return None
+
+    direct = _DIRECT_DECODERS.get(deserializer)
+    if direct is not None:
+        return direct
+
+    return functools.partial(_call_deserializer, deserializer, for_model)
+
+
+def _call_deserializer(deserializer: Callable[[Any, bool], object], for_model: bool, value: Any) -> object:
+    return deserializer(value, for_model)
+
+
+def _to_result(raw_result: dict[str, Any]) -> RawQueryResult:
+    return RawQueryResult(
+        columns=raw_result['columns'],
+        types=raw_result['types'],
+        rows=raw_result['rows'],
+    )
+
+
+def _decode_row(row: list[object], decoders: list[tuple[int, Decoder]]) -> list[object]:
+    row = list(row)
+    for i, decode in decoders:
+        value = row[i]
+        if value is not None:
+            row[i] = decode(value)
+    return row
+
+
+@overload
+def iter_raw_results(raw_result: dict[str, Any]) -> Iterator[dict[str, Any]]: ...
+
+
+@overload
+def iter_raw_results(
+    raw_result: dict[str, Any],
+    model: type[BaseModelT],
+) -> Iterator[BaseModelT]: ...
+
+
+def iter_raw_results(
+    raw_result: dict[str, Any],
+    model: type[BaseModelT] | None = None,
+) -> Iterator[BaseModelT] | Iterator[dict[str, Any]]:
+    """Lazily deserialize raw query results, one row at a time.
+
+    Rows are only converted as they are consumed so the deserialized results
+    never have to be held in memory at once.
+    """
+    result = _to_result(raw_result)
+    columns = result.columns
+    plan = compile_plan(result, for_model=model is not None)
+    decoders = [(i, decode) for i, decode in enumerate(plan) if decode is not None]
+
+    if decoders:
+        objects = (dict(zip(columns, _decode_row(row, decoders))) for row in result.rows)
+    else:
+        objects = (dict(zip(columns, row)) for row in result.rows)
+
+    if model is not None:
+        return (model_parse(model, obj) for obj in objects)
+
+    return objects
+
+
 @overload
 def deserialize_raw_results(raw_result: dict[str, Any]) -> list[dict[str, Any]]: ...
 
@@ -83,86 +191,78 @@ def deserialize_raw_results(
     If `model` is given, convert each result into the corresponding model.
     Otherwise results are returned as a dictionary
     """
-    result = RawQueryResult(
-        columns=raw_result['columns'],
-        types=raw_result['types'],
-        rows=raw_result['rows'],
-    )
     if model is not None:
-        return [_deserialize_prisma_object(obj, result=result, model=model, for_model=True) for obj in result.rows]
+        return list(iter_raw_results(raw_result, model=model))
 
-    return [_deserialize_prisma_object(obj, result=result, for_model=False) for obj in result.rows]
+    return list(iter_raw_results(raw_result))
 
 
-# NOTE: this very weird `for_model` API is simply here as a workaround for
-# https://github.com/RobertCraigie/prisma-client-py/issues/638
-#
-# This should hopefully be removed soon.
+def deserialize_raw_columns(raw_result: dict[str, Any]) -> dict[str, list[Any]]:
+    """Deserialize raw query results into a mapping of column names to their values.
 
+    Every value of a column shares the same type so each column is deserialized in one pass.
+    """
+    result = _to_result(raw_result)
+    plan = compile_plan(result, for_model=False)
+    if result.rows:
+        transposed: list[tuple[object, ...]] = list(zip(*result.rows))
+    else:
+        transposed = [() for _ in result.columns]
+
+    columns: dict[str, list[Any]] = {}
+    for key, decode, values in zip(result.columns, plan, transposed):
+        if decode is None:
+            columns[key] = list(values)
+        elif None not in values:
+            columns[key] = list(map(decode, values))
+        else:
+            columns[key] = [None if value is None else decode(value) for value in values]
 
-@overload
-def _deserialize_prisma_object(
-    fields: list[object],
-    *,
-    result: RawQueryResult,
-    for_model: bool,
-) -> dict[str, Any]: ...
+    return columns
 
 
-@overload
-def _deserialize_prisma_object(
-    fields: list[object],
-    *,
-    result: RawQueryResult,
-    for_model: bool,
-    model: type[BaseModelT],
-) -> BaseModelT: ...
+# numpy dtypes for columns that can be stored unboxed, other columns & columns with
+# null values use the `object` dtype, apart from floats which use NaN for null values
+_NUMPY_DTYPES: dict[str, str] = {
+    'int': 'int64',
+    'bigint': 'int64',
+    'float': 'float64',
+    'double': 'float64',
+    'decimal': 'float64',
+    'bool': 'bool',
+}
+_NUMPY_FLOAT_TYPES = frozenset({'float', 'double', 'decimal'})
 
 
-def _deserialize_prisma_object(
-    fields: list[object],
-    *,
-    result: RawQueryResult,
-    for_model: bool,
-    model: type[BaseModelT] | None = None,
-) -> BaseModelT | dict[str, Any]:
-    # create a local reference to avoid performance penalty of global
-    # lookups on some python versions
-    _deserializers = DESERIALIZERS
-
-    new_obj: dict[str, Any] = {}
-    for i, field in enumerate(fields):
-        key = result.columns[i]
-        prisma_type = result.types[i]
-
-        if field is None:
-            new_obj[key] = None
-            continue
-
-        if prisma_type.endswith('-array'):
-            if not isinstance(field, list):
-                raise TypeError(
-                    f'Expected array data for {key} column with internal type {prisma_type}',
-                )
+def deserialize_raw_arrays(raw_result: dict[str, Any]) -> dict[str, Any]:
+    """Deserialize raw query results into a mapping of column names to NumPy arrays.
 
-            item_type, _ = prisma_type.split('-')
+    Numeric & boolean columns are stored unboxed, see `_NUMPY_DTYPES`.
 
-            new_obj[key] = [
-                _deserializers[item_type](value, for_model)
-                #
-                if item_type in _deserializers
-                else value
-                for value in field
-            ]
+    Raises ImportError if NumPy is not installed.
+    """
+    import numpy
+
+    types: list[PrismaType] = raw_result['types']
+    arrays: dict[str, Any] = {}
+    for (key, values), prisma_type in zip(deserialize_raw_columns(raw_result).items(), types):
+        dtype = _NUMPY_DTYPES.get(prisma_type, 'object')
+        if dtype != 'object' and None in values:
+            if prisma_type in _NUMPY_FLOAT_TYPES:
+                values = [numpy.nan if value is None else value for value in values]
+            else:
+                dtype = 'object'
+
+        if dtype == 'object':
+            # filled item by item so that array columns are not treated as another dimension
+            array = numpy.empty(len(values), dtype=object)
+            for i, value in enumerate(values):
+                array[i] = value
+            arrays[key] = array
         else:
-            value = field
+            arrays[key] = numpy.asarray(values, dtype=dtype)
 
-            new_obj[key] = _deserializers[prisma_type](value, for_model) if prisma_type in _deserializers else value
-
-    if model is not None:
-        return model_parse(model, new_obj)
-
-    return new_obj
+    return arrays
 
 
 def _deserialize_bigint(value: str, _for_model: bool) -> int:
@@ -192,3 +292,9 @@ DESERIALIZERS: dict[PrismaType, Callable[[Any, bool], object]] = {
     'decimal': _deserialize_decimal,
     'json': _deserialize_json,
 }
+
+# deserializers that do not depend on `for_model`, mapped to builtins to skip a call per value
+_DIRECT_DECODERS: dict[Callable[[Any, bool], object], Decoder] = {
+    _deserialize_bigint: int,
+    _deserialize_decimal: float,
+}
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, List, Tuple, Union, Callable, Optional, Awaitable, NamedTuple
+from datetime import timedelta
+from urllib.parse import urlencode, parse_qsl
+from typing_extensions import Literal
+
+from .errors import SQLiteProfileError
+from ._builder import QueryBuilder
+from ._raw_query import deserialize_raw_results
+
+__all__ = (
+    'SQLiteProfile',
+    'SQLITE_DEFAULT',
+    'SQLITE_CONCURRENT',
+    'profile_url',
+    'pragma_statements',
+    'check_pragmas',
+    'apply_pragmas',
+    'async_apply_pragmas',
+)
+
+log: logging.Logger = logging.getLogger(__name__)
+
+JournalMode = Literal['delete', 'truncate', 'persist', 'memory', 'wal', 'off']
+Synchronous = Literal['off', 'normal', 'full', 'extra']
+
+_SYNCHRONOUS_LEVELS: Dict[str, int] = {'off': 0, 'normal': 1, 'full': 2, 'extra': 3}
+
+
+class SQLiteProfile(NamedTuple):
+    """Connection settings that are applied to SQLite datasources when the client connects.
+
+    Settings that are None are left as the engine & SQLite defaults. Every PRAGMA that is
+    set is read back afterwards and `SQLiteProfileError` is raised if it did not take effect,
+    e.g. WAL cannot be used for in-memory databases.
+
+    Most PRAGMAs only apply to the connection they are run on so they are only guaranteed
+    to apply to every query if `connection_limit` is 1. Use an engine pool to read from
+    multiple connections at once.
+    """
+
+    journal_mode: Optional[JournalMode] = None
+    """Persistent, WAL lets readers continue while a write is in progress"""
+
+    synchronous: Optional[Synchronous] = None
+    """How often SQLite waits for writes to reach the disk, `normal` is safe with WAL"""
+
+    mmap_size: Optional[int] = None
+    """Bytes of the database file that are memory mapped instead of read through the page cache"""
+
+    cache_size: Optional[int] = None
+    """Page cache size, positive values are pages and negative values are KiB"""
+
+    busy_timeout: Optional[timedelta] = None
+    """How long a query waits for a lock held by another connection before failing"""
+
+    connection_limit: Optional[int] = None
+    """Size of the connection pool of each query engine"""
+
+
+SQLITE_DEFAULT = SQLiteProfile()
+"""Leaves every setting as the engine & SQLite defaults"""
+
+SQLITE_CONCURRENT = SQLiteProfile(
+    journal_mode='wal',
+    synchronous='normal',
+    mmap_size=256 * 1024 * 1024,
+    cache_size=-64 * 1024,
+    busy_timeout=timedelta(seconds=5),
+    connection_limit=1,
+)
+"""Tuned for many concurrent readers & a single writer"""
+
+
+def profile_url(url: str, profile: SQLiteProfile) -> str:
+    """Returns the datasource URL with the connection parameters of the profile"""
+    if profile.connection_limit is None:
+        return url
+
+    path, _, query = url.partition('?')
+    params = dict(parse_qsl(query, keep_blank_values=True))
+    params['connection_limit'] = str(profile.connection_limit)
+    return f'{path}?{urlencode(params)}'
+
+
+def pragma_statements(profile: SQLiteProfile) -> List[Tuple[str, Union[str, int]]]:
+    """Returns the (pragma, value) pairs that should be set for the profile, in the order they are set"""
+    pragmas: List[Tuple[str, Union[str, int]]] = []
+
+    # the busy timeout is set first so that switching the journal mode waits for other connections
+    if profile.busy_timeout is not None:
+        pragmas.append(('busy_timeout', int(profile.busy_timeout.total_seconds() * 1000)))
+    if profile.journal_mode is not None:
+        pragmas.append(('journal_mode', profile.journal_mode))
+    if profile.synchronous is not None:
+        pragmas.append(('synchronous', profile.synchronous))
+    if profile.mmap_size is not None:
+        pragmas.append(('mmap_size', profile.mmap_size))
+    if profile.cache_size is not None:
+        pragmas.append(('cache_size', profile.cache_size))
+
+    for pragma, value in pragmas:
+        # values are interpolated into the statement as PRAGMAs do not support parameters
+        if not str(value).lstrip('-').isalnum():
+            raise ValueError(f'Invalid value for SQLite PRAGMA {pragma}: {value!r}')
+
+    return pragmas
+
+
+def apply_pragmas(send: Callable[[bytes], Any], pragmas: List[Tuple[str, Union[str, int]]]) -> None:
+    """Set the PRAGMAs using `send`, which must send a query to a single engine, then validate them"""
+    actual: Dict[str, Any] = {}
+    for pragma, value in pragmas:
+        send(_pragma_query(f'PRAGMA {pragma} = {value}'))
+        actual[pragma] = _read_pragma(send(_pragma_query(f'PRAGMA {pragma}')))
+
+    check_pragmas(pragmas, actual)
+
+
+async def async_apply_pragmas(
+    send: Callable[[bytes], Awaitable[Any]],
+    pragmas: List[Tuple[str, Union[str, int]]],
+) -> None:
+    """Like `apply_pragmas()` but for the asyncio client"""
+    actual: Dict[str, Any] = {}
+    for pragma, value in pragmas:
+        await send(_pragma_query(f'PRAGMA {pragma} = {value}'))
+        actual[pragma] = _read_pragma(await send(_pragma_query(f'PRAGMA {pragma}')))
+
+    check_pragmas(pragmas, actual)
+
+
+def _pragma_query(statement: str) -> bytes:
+    return QueryBuilder(
+        method='query_raw',
+        arguments={'query': statement, 'parameters': []},
+        prisma_models=set(),
+        relational_field_mappings={},
+    ).build()
+
+
+def _read_pragma(response: Any) -> Any:
+    # the column name does not always match the PRAGMA, e.g. `busy_timeout` returns `timeout`
+    rows = deserialize_raw_results(response['data']['result'])
+    if not rows:
+        return None
+    return next(iter(rows[0].values()), None)
+
+
+def check_pragmas(expected: List[Tuple[str, Union[str, int]]], actual: Dict[str, Any]) -> None:
+    """Raise `SQLiteProfileError` if a PRAGMA read back from the database does not match the profile"""
+    for pragma, value in expected:
+        got = actual.get(pragma)
+        if pragma == 'synchronous':
+            matches = _as_int(got) == _SYNCHRONOUS_LEVELS[str(value)]
+        elif isinstance(value, str):
+            matches = str(got).lower() == value
+        else:
+            matches = _as_int(got) == value
+
+        if not matches:
+            raise SQLiteProfileError(pragma=pragma, expected=value, got=got)
+
+    log.debug('Applied SQLite PRAGMAs: %s', actual)
+
+
+def _as_int(value: Any) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
@@ -3,6 +3,7 @@ from typing_extensions import override
 
 import httpx
 
+from . import _codec
 from ._types import Method
 from .http_abstract import AbstractHTTP, AbstractResponse
 
@@ -58,7 +59,9 @@ class Response(AbstractResponse[httpx.Response]):
 
     @override
     def json(self, **kwargs: Any) -> Any:
-        return self.original.json(**kwargs)
+        if kwargs:
+            return self.original.json(**kwargs)
+        return _codec.loads(self.original.content)
 
     @override
     def text(self, **kwargs: Any) -> str:
@@ -59,6 +59,7 @@ class AsyncTransactionManager(Generic[_AsyncPrismaT]):
         self._timeout = timeout
 
         self._tx_id: TransactionId | None = None
+        self._tx_client: _AsyncPrismaT | None = None
 
     async def start(self, *, _from_context: bool = False) -> _AsyncPrismaT:
         """Start the transaction and return the wrapped Prisma instance"""
@@ -82,6 +83,7 @@ class AsyncTransactionManager(Generic[_AsyncPrismaT]):
         self._tx_id = tx_id
         client = self.__client._copy()
         client._tx_id = tx_id
+        self._tx_client = client
         return client
 
     async def commit(self) -> None:
@@ -90,6 +92,8 @@ class AsyncTransactionManager(Generic[_AsyncPrismaT]):
             raise TransactionNotStartedError()
 
         await self.__client._engine.commit_transaction(self._tx_id)
+        if self._tx_client is not None:
+            self._tx_client._invalidate_committed()
 
     async def rollback(self) -> None:
         """Do not commit the changes to the database, this transaction will no longer be usable"""
@@ -161,6 +165,7 @@ class SyncTransactionManager(Generic[_SyncPrismaT]):
         self._timeout = timeout
 
         self._tx_id: TransactionId | None = None
+        self._tx_client: _SyncPrismaT | None = None
 
     def start(self, *, _from_context: bool = False) -> _SyncPrismaT:
         """Start the transaction and return the wrapped Prisma instance"""
@@ -184,6 +189,7 @@ class SyncTransactionManager(Generic[_SyncPrismaT]):
         self._tx_id = tx_id
         client = self.__client._copy()
         client._tx_id = tx_id
+        self._tx_client = client
         return client
 
     def commit(self) -> None:
@@ -192,6 +198,8 @@ class SyncTransactionManager(Generic[_SyncPrismaT]):
             raise TransactionNotStartedError()
 
         self.__client._engine.commit_transaction(self._tx_id)
+        if self._tx_client is not None:
+            self._tx_client._invalidate_committed()
 
     def rollback(self) -> None:
         """Do not commit the changes to the database, this transaction will no longer be usable"""
@@ -69,6 +69,19 @@ class HttpConfig(TypedDict, total=False):
     max_redirects: int
 
 
+EngineTransport = Literal['tcp', 'uds']
+"""How the client talks to the query engine process.
+
+`uds` uses a Unix domain socket when the engine binary supports it and falls back to `tcp` otherwise.
+"""
+
+Hydration = Literal['validate', 'trusted']
+"""How query engine results are converted to models.
+
+`validate` runs full pydantic validation for every record, `trusted` builds the models
+directly as the query engine output already matches the schema.
+"""
+
 SortMode = Literal['default', 'insensitive']
 SortOrder = Literal['asc', 'desc']
 
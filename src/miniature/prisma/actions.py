@@ -39,11 +39,12 @@ from typing_extensions import TypedDict, Literal
 
 LiteralString = str
 # -- template actions.py.jinja --
-from typing import TypeVar
+from typing import TypeVar, AsyncIterator
 import warnings
 
 from . import types, errors, bases
-from ._compat import model_parse
+from ._columnar import Columns, DEFAULT_SEPARATOR, build_columns
+from ._pagination import DEFAULT_BATCH_SIZE, cursor_order, paginate, async_paginate
 from ._constants import CREATE_MANY_SKIP_DUPLICATES_UNSUPPORTED
 
 if TYPE_CHECKING:
@@ -188,7 +189,7 @@ class PlayerActions(Generic[_PrismaModelT]):
                 'include': include,
             },
         )
-        return model_parse(self._model, resp['data']['result'])
+        return self._client._model_parse(self._model, resp['data']['result'])
 
     async def create_many(
         self,
@@ -305,7 +306,7 @@ class PlayerActions(Generic[_PrismaModelT]):
         except errors.RecordNotFoundError:
             return None
 
-        return model_parse(self._model, resp['data']['result'])
+        return self._client._model_parse(self._model, resp['data']['result'])
 
     async def find_unique(
         self,
@@ -356,7 +357,7 @@ class PlayerActions(Generic[_PrismaModelT]):
         result = resp['data']['result']
         if result is None:
             return None
-        return model_parse(self._model, result)
+        return self._client._model_parse(self._model, result)
 
     async def find_unique_or_raise(
         self,
@@ -404,7 +405,7 @@ class PlayerActions(Generic[_PrismaModelT]):
                 'include': include,
             },
         )
-        return model_parse(self._model, resp['data']['result'])
+        return self._client._model_parse(self._model, resp['data']['result'])
 
     async def find_many(
         self,
@@ -475,7 +476,178 @@ class PlayerActions(Generic[_PrismaModelT]):
                 'distinct': distinct,
             },
         )
-        return [model_parse(self._model, r) for r in resp['data']['result']]
+        return self._client._model_parse_many(self._model, resp['data']['result'])
+
+    async def find_many_columns(
+        self,
+        take: Optional[int] = None,
+        skip: Optional[int] = None,
+        where: Optional[types.PlayerWhereInput] = None,
+        cursor: Optional[types.PlayerWhereUniqueInput] = None,
+        include: Optional[types.PlayerInclude] = None,
+        order: Optional[Union[types.PlayerOrderByInput, List[types.PlayerOrderByInput]]] = None,
+        distinct: Optional[List[types.PlayerScalarFieldKeys]] = None,
+        sep: str = DEFAULT_SEPARATOR,
+    ) -> Columns:
+        """Find multiple Player records and return them as columns instead of models.
+
+        This is the same query as `find_many()` but the results are transposed into a mapping
+        of field names to the values of every record, which can be passed straight to
+        `pandas.DataFrame()`. No model instances are created.
+
+        To-one relations in `include` are flattened into `{relation}{sep}{field}` columns,
+        to-many relations are returned as a single column of raw records.
+
+        Parameters
+        ----------
+        take
+            Limit the maximum number of Player records returned
+        skip
+            Ignore the first N results
+        where
+            Player filter to select records
+        cursor
+            Specifies the position in the list to start returning results from, (typically an ID field)
+        include
+            Specifies which relations should be loaded & flattened into columns
+        order
+            Order the returned Player records by any field
+        distinct
+            Filter Player records by either a single distinct field or distinct combinations of fields
+        sep
+            Separator between relation and field names of flattened relations
+
+        Returns
+        -------
+        Dict[str, List[Any]]
+            The values of every Player record that could be found, keyed by column name
+
+        Raises
+        ------
+        prisma.errors.PrismaError
+            Catch all for every exception raised by Prisma Client Python
+
+        Example
+        -------
+        ```py
+        columns = await Player.prisma().find_many_columns(
+            order={
+                'rating': 'desc',
+            },
+        )
+        df = pandas.DataFrame(columns)
+        ```
+        """
+        resp = await self._client._execute(
+            method='find_many',
+            model=self._model,
+            arguments={
+                'take': take,
+                'skip': skip,
+                'where': where,
+                'order_by': order,
+                'cursor': cursor,
+                'include': include,
+                'distinct': distinct,
+            },
+        )
+        return build_columns(self._model, resp['data']['result'], include=include, sep=sep)
+
+    async def iter_many(
+        self,
+        where: Optional[types.PlayerWhereInput] = None,
+        include: Optional[types.PlayerInclude] = None,
+        order: Optional[Union[types.PlayerOrderByInput, List[types.PlayerOrderByInput]]] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        prefetch: bool = True,
+    ) -> AsyncIterator[_PrismaModelT]:
+        """Iterate over every Player record without loading all of them at once.
+
+        Records are fetched in pages of `batch_size` using cursor pagination on the `id`
+        field, which is appended to `order` as a tie-breaker if it is not already ordered by.
+        The next page is requested while the current one is being consumed.
+
+        Records that are deleted while iterating must not be the last record of a page.
+
+        Parameters
+        ----------
+        where
+            Player filter to select records
+        include
+            Specifies which relations should be loaded on the returned Player models
+        order
+            Order the returned Player records by any field
+        batch_size
+            Maximum number of Player records to fetch per query
+        prefetch
+            Whether to request the next page before the current one is consumed
+
+        Returns
+        -------
+        AsyncIterator[prisma.models.Player]
+            Every Player record that could be found
+
+        Raises
+        ------
+        prisma.errors.PrismaError
+            Catch all for every exception raised by Prisma Client Python
+
+        Example
+        -------
+        ```py
+        async for player in Player.prisma().iter_many(batch_size=500):
+            print(player)
+        ```
+        """
+        async for batch in self.iter_batches(
+            where=where,
+            include=include,
+            order=order,
+            batch_size=batch_size,
+            prefetch=prefetch,
+        ):
+            for record in batch:
+                yield record
+
+    def iter_batches(
+        self,
+        where: Optional[types.PlayerWhereInput] = None,
+        include: Optional[types.PlayerInclude] = None,
+        order: Optional[Union[types.PlayerOrderByInput, List[types.PlayerOrderByInput]]] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        prefetch: bool = True,
+    ) -> AsyncIterator[List[_PrismaModelT]]:
+        """Iterate over every Player record in lists of up to `batch_size` records.
+
+        See `iter_many()` for details.
+
+        Example
+        -------
+        ```py
+        async for players in Player.prisma().iter_batches(batch_size=500):
+            print(len(players))
+        ```
+        """
+        ordering = cursor_order(order, 'id')  # type: ignore[arg-type]
+
+        async def fetch(cursor: Optional[Dict[str, Any]]) -> List[_PrismaModelT]:
+            # pages are never read twice so caching them would only evict useful results
+            resp = await self._client._execute(
+                method='find_many',
+                model=self._model,
+                arguments={
+                    'take': batch_size,
+                    'skip': None if cursor is None else 1,
+                    'where': where,
+                    'order_by': ordering,
+                    'cursor': cursor,
+                    'include': include,
+                },
+                cache=False,
+            )
+            return self._client._model_parse_many(self._model, resp['data']['result'])
+
+        return async_paginate(fetch, key='id', batch_size=batch_size, prefetch=prefetch)
 
     async def find_first(
         self,
@@ -543,7 +715,7 @@ class PlayerActions(Generic[_PrismaModelT]):
         if result is None:
             return None
 
-        return model_parse(self._model, result)
+        return self._client._model_parse(self._model, result)
 
     async def find_first_or_raise(
         self,
@@ -607,7 +779,7 @@ class PlayerActions(Generic[_PrismaModelT]):
                 'distinct': distinct,
             },
         )
-        return model_parse(self._model, resp['data']['result'])
+        return self._client._model_parse(self._model, resp['data']['result'])
 
     async def update(
         self,
@@ -664,7 +836,7 @@ class PlayerActions(Generic[_PrismaModelT]):
         except errors.RecordNotFoundError:
             return None
 
-        return model_parse(self._model, resp['data']['result'])
+        return self._client._model_parse(self._model, resp['data']['result'])
 
     async def upsert(
         self,
@@ -724,7 +896,7 @@ class PlayerActions(Generic[_PrismaModelT]):
                 'update': data.get('update'),
             },
         )
-        return model_parse(self._model, resp['data']['result'])
+        return self._client._model_parse(self._model, resp['data']['result'])
 
     async def update_many(
         self,
@@ -1212,7 +1384,7 @@ class RankActions(Generic[_PrismaModelT]):
                 'include': include,
             },
         )
-        return model_parse(self._model, resp['data']['result'])
+        return self._client._model_parse(self._model, resp['data']['result'])
 
     async def create_many(
         self,
@@ -1331,7 +1503,7 @@ class RankActions(Generic[_PrismaModelT]):
         except errors.RecordNotFoundError:
             return None
 
-        return model_parse(self._model, resp['data']['result'])
+        return self._client._model_parse(self._model, resp['data']['result'])
 
     async def find_unique(
         self,
@@ -1382,7 +1554,7 @@ class RankActions(Generic[_PrismaModelT]):
         result = resp['data']['result']
         if result is None:
             return None
-        return model_parse(self._model, result)
+        return self._client._model_parse(self._model, result)
 
     async def find_unique_or_raise(
         self,
@@ -1430,7 +1602,7 @@ class RankActions(Generic[_PrismaModelT]):
                 'include': include,
             },
         )
-        return model_parse(self._model, resp['data']['result'])
+        return self._client._model_parse(self._model, resp['data']['result'])
 
     async def find_many(
         self,
@@ -1501,7 +1673,178 @@ class RankActions(Generic[_PrismaModelT]):
                 'distinct': distinct,
             },
         )
-        return [model_parse(self._model, r) for r in resp['data']['result']]
+        return self._client._model_parse_many(self._model, resp['data']['result'])
+
+    async def find_many_columns(
+        self,
+        take: Optional[int] = None,
+        skip: Optional[int] = None,
+        where: Optional[types.RankWhereInput] = None,
+        cursor: Optional[types.RankWhereUniqueInput] = None,
+        include: Optional[types.RankInclude] = None,
+        order: Optional[Union[types.RankOrderByInput, List[types.RankOrderByInput]]] = None,
+        distinct: Optional[List[types.RankScalarFieldKeys]] = None,
+        sep: str = DEFAULT_SEPARATOR,
+    ) -> Columns:
+        """Find multiple Rank records and return them as columns instead of models.
+
+        This is the same query as `find_many()` but the results are transposed into a mapping
+        of field names to the values of every record, which can be passed straight to
+        `pandas.DataFrame()`. No model instances are created.
+
+        To-one relations in `include` are flattened into `{relation}{sep}{field}` columns,
+        to-many relations are returned as a single column of raw records.
+
+        Parameters
+        ----------
+        take
+            Limit the maximum number of Rank records returned
+        skip
+            Ignore the first N results
+        where
+            Rank filter to select records
+        cursor
+            Specifies the position in the list to start returning results from, (typically an ID field)
+        include
+            Specifies which relations should be loaded & flattened into columns
+        order
+            Order the returned Rank records by any field
+        distinct
+            Filter Rank records by either a single distinct field or distinct combinations of fields
+        sep
+            Separator between relation and field names of flattened relations
+
+        Returns
+        -------
+        Dict[str, List[Any]]
+            The values of every Rank record that could be found, keyed by column name
+
+        Raises
+        ------
+        prisma.errors.PrismaError
+            Catch all for every exception raised by Prisma Client Python
+
+        Example
+        -------
+        ```py
+        columns = await Rank.prisma().find_many_columns(
+            order={
+                'min_rating': 'desc',
+            },
+        )
+        df = pandas.DataFrame(columns)
+        ```
+        """
+        resp = await self._client._execute(
+            method='find_many',
+            model=self._model,
+            arguments={
+                'take': take,
+                'skip': skip,
+                'where': where,
+                'order_by': order,
+                'cursor': cursor,
+                'include': include,
+                'distinct': distinct,
+            },
+        )
+        return build_columns(self._model, resp['data']['result'], include=include, sep=sep)
+
+    async def iter_many(
+        self,
+        where: Optional[types.RankWhereInput] = None,
+        include: Optional[types.RankInclude] = None,
+        order: Optional[Union[types.RankOrderByInput, List[types.RankOrderByInput]]] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        prefetch: bool = True,
+    ) -> AsyncIterator[_PrismaModelT]:
+        """Iterate over every Rank record without loading all of them at once.
+
+        Records are fetched in pages of `batch_size` using cursor pagination on the `id`
+        field, which is appended to `order` as a tie-breaker if it is not already ordered by.
+        The next page is requested while the current one is being consumed.
+
+        Records that are deleted while iterating must not be the last record of a page.
+
+        Parameters
+        ----------
+        where
+            Rank filter to select records
+        include
+            Specifies which relations should be loaded on the returned Rank models
+        order
+            Order the returned Rank records by any field
+        batch_size
+            Maximum number of Rank records to fetch per query
+        prefetch
+            Whether to request the next page before the current one is consumed
+
+        Returns
+        -------
+        AsyncIterator[prisma.models.Rank]
+            Every Rank record that could be found
+
+        Raises
+        ------
+        prisma.errors.PrismaError
+            Catch all for every exception raised by Prisma Client Python
+
+        Example
+        -------
+        ```py
+        async for rank in Rank.prisma().iter_many(batch_size=500):
+            print(rank)
+        ```
+        """
+        async for batch in self.iter_batches(
+            where=where,
+            include=include,
+            order=order,
+            batch_size=batch_size,
+            prefetch=prefetch,
+        ):
+            for record in batch:
+                yield record
+
+    def iter_batches(
+        self,
+        where: Optional[types.RankWhereInput] = None,
+        include: Optional[types.RankInclude] = None,
+        order: Optional[Union[types.RankOrderByInput, List[types.RankOrderByInput]]] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        prefetch: bool = True,
+    ) -> AsyncIterator[List[_PrismaModelT]]:
+        """Iterate over every Rank record in lists of up to `batch_size` records.
+
+        See `iter_many()` for details.
+
+        Example
+        -------
+        ```py
+        async for ranks in Rank.prisma().iter_batches(batch_size=500):
+            print(len(ranks))
+        ```
+        """
+        ordering = cursor_order(order, 'id')  # type: ignore[arg-type]
+
+        async def fetch(cursor: Optional[Dict[str, Any]]) -> List[_PrismaModelT]:
+            # pages are never read twice so caching them would only evict useful results
+            resp = await self._client._execute(
+                method='find_many',
+                model=self._model,
+                arguments={
+                    'take': batch_size,
+                    'skip': None if cursor is None else 1,
+                    'where': where,
+                    'order_by': ordering,
+                    'cursor': cursor,
+                    'include': include,
+                },
+                cache=False,
+            )
+            return self._client._model_parse_many(self._model, resp['data']['result'])
+
+        return async_paginate(fetch, key='id', batch_size=batch_size, prefetch=prefetch)
 
     async def find_first(
         self,
@@ -1569,7 +1912,7 @@ class RankActions(Generic[_PrismaModelT]):
         if result is None:
             return None
 
-        return model_parse(self._model, result)
+        return self._client._model_parse(self._model, result)
 
     async def find_first_or_raise(
         self,
@@ -1633,7 +1976,7 @@ class RankActions(Generic[_PrismaModelT]):
                 'distinct': distinct,
             },
         )
-        return model_parse(self._model, resp['data']['result'])
+        return self._client._model_parse(self._model, resp['data']['result'])
 
     async def update(
         self,
@@ -1690,7 +2033,7 @@ class RankActions(Generic[_PrismaModelT]):
         except errors.RecordNotFoundError:
             return None
 
-        return model_parse(self._model, resp['data']['result'])
+        return self._client._model_parse(self._model, resp['data']['result'])
 
     async def upsert(
         self,
@@ -1752,7 +2095,7 @@ class RankActions(Generic[_PrismaModelT]):
                 'update': data.get('update'),
             },
         )
-        return model_parse(self._model, resp['data']['result'])
+        return self._client._model_parse(self._model, resp['data']['result'])
 
     async def update_many(
         self,
@@ -51,16 +51,22 @@ from pydantic import BaseModel
 from . import types, models, errors, actions
 from ._base_client import BasePrisma, UseClientDefault, USE_CLIENT_DEFAULT
 from .types import DatasourceOverride, HttpConfig, MetricsFormat
-from ._types import BaseModelT, PrismaMethod, TransactionId, Datasource
+from ._types import BaseModelT, PrismaMethod, TransactionId, Datasource, EngineTransport, Hydration
 from .bases import _PrismaModel
-from ._builder import QueryBuilder, dumps
+from ._builder import QueryBuilder
+from ._batching import DEFAULT_CHUNK_SIZE, BatchResult, batch_payload
 from .generator.models import EngineType, OptionalValueFromEnvVar, BinaryPaths
 from ._compat import removeprefix, model_parse
 from ._constants import CREATE_MANY_SKIP_DUPLICATES_UNSUPPORTED, DEFAULT_CONNECT_TIMEOUT, DEFAULT_TX_MAX_WAIT, DEFAULT_TX_TIMEOUT
-from ._raw_query import deserialize_raw_results
+from ._cache import QueryCache
+from ._instrumentation import set_labels, current_instrumentation
+from ._sqlite import SQLiteProfile
+from ._dispatch import QueryDispatcher
+from ._raw_query import iter_raw_results, deserialize_raw_arrays, deserialize_raw_columns, deserialize_raw_results
 from ._metrics import Metrics
 from .metadata import PRISMA_MODELS, RELATIONAL_FIELD_MAPPINGS
 from ._transactions import AsyncTransactionManager, SyncTransactionManager
+from .engine.utils import response_error
 
 # re-exports
 from ._base_client import SyncBasePrisma, AsyncBasePrisma, load_env as load_env
@@ -111,6 +117,13 @@ class Prisma(AsyncBasePrisma):
         datasource: DatasourceOverride | None = None,
         connect_timeout: int | timedelta = DEFAULT_CONNECT_TIMEOUT,
         http: HttpConfig | None = None,
+        engine_transport: EngineTransport = 'tcp',
+        hydration: Hydration = 'validate',
+        dispatcher: Optional[QueryDispatcher] = None,
+        auto_batch: bool = False,
+        cache: Optional[QueryCache] = None,
+        engine_pool_size: int = 1,
+        sqlite_profile: Optional[SQLiteProfile] = None,
     ) -> None:
         super().__init__(
             http=http,
@@ -118,6 +131,13 @@ class Prisma(AsyncBasePrisma):
             log_queries=log_queries,
             datasource=datasource,
             connect_timeout=connect_timeout,
+            engine_transport=engine_transport,
+            hydration=hydration,
+            dispatcher=dispatcher,
+            auto_batch=auto_batch,
+            cache=cache,
+            engine_pool_size=engine_pool_size,
+            sqlite_profile=sqlite_profile,
         )
         self._set_generated_properties(
             schema_path=SCHEMA_PATH,
@@ -184,16 +204,10 @@ class Prisma(AsyncBasePrisma):
         If model is given, the returned record is converted to the pydantic model first,
         otherwise a raw dictionary will be returned.
         """
-        results: Sequence[Union[BaseModelT, dict[str, Any]]]
         if model is not None:
-            results = await self.query_raw(query, *args, model=model)
-        else:
-            results = await self.query_raw(query, *args)
-
-        if not results:
-            return None
+            return next(await self.query_raw_iter(query, *args, model=model), None)
 
-        return results[0]
+        return next(await self.query_raw_iter(query, *args), None)
 
     @overload
     async def query_raw(
@@ -237,9 +251,94 @@ class Prisma(AsyncBasePrisma):
 
         return deserialize_raw_results(result)
 
-    def batch_(self) -> Batch:
-        """Returns a context manager for grouping write queries into a single transaction."""
-        return Batch(client=self)
+    async def query_raw_columns(
+        self,
+        query: LiteralString,
+        *args: Any,
+    ) -> Dict[str, List[Any]]:
+        """Execute a raw SQL query against the database and return the results as columns.
+
+        The result maps every column name to a list of its values, which can be passed
+        straight to `pandas.DataFrame()`, no intermediate record dictionaries are created.
+        """
+        resp = await self._execute(
+            method='query_raw',
+            arguments={
+                'query': query,
+                'parameters': args,
+            },
+        )
+        return deserialize_raw_columns(resp['data']['result'])
+
+    async def query_raw_arrays(
+        self,
+        query: LiteralString,
+        *args: Any,
+    ) -> Dict[str, Any]:
+        """Execute a raw SQL query against the database and return the results as NumPy arrays.
+
+        Numeric & boolean columns are stored unboxed, e.g. as `int64` arrays, other columns
+        and integer or boolean columns containing null values use the `object` dtype.
+
+        NumPy must be installed to use this method.
+        """
+        resp = await self._execute(
+            method='query_raw',
+            arguments={
+                'query': query,
+                'parameters': args,
+            },
+        )
+        return deserialize_raw_arrays(resp['data']['result'])
+
+    @overload
+    async def query_raw_iter(
+        self,
+        query: LiteralString,
+        *args: Any,
+    ) -> Iterator[dict[str, Any]]:
+        ...
+
+    @overload
+    async def query_raw_iter(
+        self,
+        query: LiteralString,
+        *args: Any,
+        model: Type[BaseModelT],
+    ) -> Iterator[BaseModelT]:
+        ...
+
+    async def query_raw_iter(
+        self,
+        query: LiteralString,
+        *args: Any,
+        model: Optional[Type[BaseModelT]] = None,
+    ) -> Union[Iterator[BaseModelT], Iterator[dict[str, Any]]]:
+        """This function is the exact same as `query_raw()` but results are deserialized lazily.
+
+        Each record is only converted when it is consumed, so processing the results one
+        at a time never holds every converted record in memory at once.
+        """
+        resp = await self._execute(
+            method='query_raw',
+            arguments={
+                'query': query,
+                'parameters': args,
+            },
+            model=model,
+        )
+        result = resp['data']['result']
+        if model is not None:
+            return iter_raw_results(result, model=model)
+
+        return iter_raw_results(result)
+
+    def batch_(self, *, transaction: bool = True, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Batch:
+        """Returns a context manager for grouping write queries into a single transaction.
+
+        Pass `transaction=False` to execute the queries independently of each other.
+        """
+        return Batch(client=self, transaction=transaction, chunk_size=chunk_size)
 
     def tx(
         self,
@@ -279,50 +378,110 @@ class Prisma(AsyncBasePrisma):
 TransactionManager = AsyncTransactionManager[Prisma]
 
 
-# TODO: this should return the results as well
 # TODO: don't require copy-pasting arguments between actions and batch actions
 class Batch:
     player: 'PlayerBatchActions'
     rank: 'RankBatchActions'
 
-    def __init__(self, client: Prisma) -> None:
+    def __init__(
+        self,
+        client: Prisma,
+        *,
+        transaction: bool = True,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> None:
+        if chunk_size < 1:
+            raise ValueError(f'chunk_size must be at least 1, got {chunk_size}')
+
         self.__client = client
-        self.__queries: List[str] = []
+        self.__operations: List[Tuple[bytes, PrismaMethod, Optional[Type[BaseModel]], BatchResult[Any]]] = []
+        self._transaction = transaction
+        self._chunk_size = chunk_size
         self._active_provider = client._active_provider
         self.player = PlayerBatchActions(self)
         self.rank = RankBatchActions(self)
 
-    def _add(self, **kwargs: Any) -> None:
+    def _add(
+        self,
+        *,
+        method: PrismaMethod,
+        arguments: Dict[str, Any],
+        model: Optional[Type[BaseModel]] = None,
+        root_selection: Optional[List[str]] = None,
+    ) -> BatchResult[Any]:
         builder = QueryBuilder(
-            **kwargs,
+            method=method,
+            model=model,
+            arguments=arguments,
+            root_selection=root_selection,
             prisma_models=PRISMA_MODELS,
             relational_field_mappings=RELATIONAL_FIELD_MAPPINGS,
         )
-        self.__queries.append(builder.build_query())
-
-    async def commit(self) -> None:
-        """Execute the queries"""
-        # TODO: normalise this, we should still call client._execute
-        queries = self.__queries
-        self.__queries = []
-
-        payload = {
-            'batch': [
-                {
-                    'query': query,
-                    'variables': {},
-                }
-                for query in queries
-            ],
-            'transaction': True,
-        }
-        await self.__client._engine.query(
-            dumps(payload),
-            tx_id=self.__client._tx_id,
-        )
+        result: BatchResult[Any] = BatchResult()
+        self.__operations.append((builder.build(), method, model, result))
+        return result
+
+    async def commit(self) -> List[BatchResult[Any]]:
+        """Execute the queries
+
+        Returns the result of every operation in the order they were added, the same
+        objects that were returned when the operations were added.
+
+        By default the operations are executed in a single transaction and the first error
+        is raised. If the batch was created with `transaction=False` each operation succeeds
+        or fails on its own and errors are reported on the results instead.
 
-    def execute_raw(self, query: LiteralString, *args: Any) -> None:
-        self._add(
+        Batches with more than `chunk_size` operations are sent in multiple requests,
+        transactional batches are then wrapped in an interactive transaction.
+        """
+        operations = self.__operations
+        self.__operations = []
+        if not operations:
+            return []
+
+        size = self._chunk_size
+        chunks = [operations[i:i + size] for i in range(0, len(operations), size)]
+        client = self.__client
+        if self._transaction and len(chunks) > 1 and not client.is_transaction():
+            # every chunk must be committed or rolled back together
+            async with client.tx() as transaction:
+                for chunk in chunks:
+                    await self._send(transaction, chunk)
+        else:
+            for chunk in chunks:
+                await self._send(client, chunk)
+
+        return [result for *_, result in operations]
+
+    async def _send(
+        self,
+        client: Prisma,
+        operations: List[Tuple[bytes, PrismaMethod, Optional[Type[BaseModel]], BatchResult[Any]]],
+    ) -> None:
+        if current_instrumentation() is not None:
+            set_labels(None, 'batch')
+
+        try:
+            response = await client._send_batch(
+                batch_payload((content for content, *_ in operations), transaction=self._transaction),
+            )
+        finally:
+            for _, method, model, _ in operations:
+                client._invalidate_reads(method, model)
+
+        items = response['batchResult']
+        if len(items) != len(operations):
+            raise errors.BatchResultMismatchError(expected=len(operations), got=len(items))
+
+        for (_, method, model, result), item in zip(operations, items):
+            errors_data = item.get('errors')
+            if errors_data:
+                result._fail(response_error(None, errors_data))
+            else:
+                result._set(_parse_batch_result(client, method, model, item['data']['result']))
+
+    def execute_raw(self, query: LiteralString, *args: Any) -> BatchResult[int]:
+        return self._add(
             method='execute_raw',
             arguments={
                 'query': query,
@@ -343,6 +502,19 @@ class Batch:
             await self.commit()
 
 
+def _parse_batch_result(client: Prisma, method: PrismaMethod, model: Optional[Type[BaseModel]], data: Any) -> Any:
+    if method == 'execute_raw':
+        return int(data)
+
+    if method in {'create_many', 'update_many', 'delete_many'}:
+        return int(data['count'])
+
+    if data is None or model is None:
+        return data
+
+    return client._model_parse(model, data)
+
+
 # NOTE: some arguments are meaningless in this context but are included
 # for completeness sake
 class PlayerBatchActions:
@@ -353,8 +525,8 @@ class PlayerBatchActions:
         self,
         data: types.PlayerCreateInput,
         include: Optional[types.PlayerInclude] = None
-    ) -> None:
-        self._batcher._add(
+    ) -> BatchResult[models.Player]:
+        return self._batcher._add(
             method='create',
             model=models.Player,
             arguments={
@@ -368,11 +540,11 @@ class PlayerBatchActions:
         data: List[types.PlayerCreateWithoutRelationsInput],
         *,
         skip_duplicates: Optional[bool] = None,
-    ) -> None:
+    ) -> BatchResult[int]:
         if skip_duplicates and self._batcher._active_provider in CREATE_MANY_SKIP_DUPLICATES_UNSUPPORTED:
             raise errors.UnsupportedDatabaseError(self._batcher._active_provider, 'create_many_skip_duplicates')
 
-        self._batcher._add(
+        return self._batcher._add(
             method='create_many',
             model=models.Player,
             arguments={
@@ -386,8 +558,8 @@ class PlayerBatchActions:
         self,
         where: types.PlayerWhereUniqueInput,
         include: Optional[types.PlayerInclude] = None,
-    ) -> None:
-        self._batcher._add(
+    ) -> BatchResult[models.Player]:
+        return self._batcher._add(
             method='delete',
             model=models.Player,
             arguments={
@@ -401,8 +573,8 @@ class PlayerBatchActions:
         data: types.PlayerUpdateInput,
         where: types.PlayerWhereUniqueInput,
         include: Optional[types.PlayerInclude] = None
-    ) -> None:
-        self._batcher._add(
+    ) -> BatchResult[models.Player]:
+        return self._batcher._add(
             method='update',
             model=models.Player,
             arguments={
@@ -417,8 +589,8 @@ class PlayerBatchActions:
         where: types.PlayerWhereUniqueInput,
         data: types.PlayerUpsertInput,
         include: Optional[types.PlayerInclude] = None,
-    ) -> None:
-        self._batcher._add(
+    ) -> BatchResult[models.Player]:
+        return self._batcher._add(
             method='upsert',
             model=models.Player,
             arguments={
@@ -433,8 +605,8 @@ class PlayerBatchActions:
         self,
         data: types.PlayerUpdateManyMutationInput,
         where: types.PlayerWhereInput,
-    ) -> None:
-        self._batcher._add(
+    ) -> BatchResult[int]:
+        return self._batcher._add(
             method='update_many',
             model=models.Player,
             arguments={'data': data, 'where': where,},
@@ -444,8 +616,8 @@ class PlayerBatchActions:
     def delete_many(
         self,
         where: Optional[types.PlayerWhereInput] = None,
-    ) -> None:
-        self._batcher._add(
+    ) -> BatchResult[int]:
+        return self._batcher._add(
             method='delete_many',
             model=models.Player,
             arguments={'where': where},
@@ -464,8 +636,8 @@ class RankBatchActions:
         self,
         data: types.RankCreateInput,
         include: Optional[types.RankInclude] = None
-    ) -> None:
-        self._batcher._add(
+    ) -> BatchResult[models.Rank]:
+        return self._batcher._add(
             method='create',
             model=models.Rank,
             arguments={
@@ -479,11 +651,11 @@ class RankBatchActions:
         data: List[types.RankCreateWithoutRelationsInput],
         *,
         skip_duplicates: Optional[bool] = None,
-    ) -> None:
+    ) -> BatchResult[int]:
         if skip_duplicates and self._batcher._active_provider in CREATE_MANY_SKIP_DUPLICATES_UNSUPPORTED:
             raise errors.UnsupportedDatabaseError(self._batcher._active_provider, 'create_many_skip_duplicates')
 
-        self._batcher._add(
+        return self._batcher._add(
             method='create_many',
             model=models.Rank,
             arguments={
@@ -497,8 +669,8 @@ class RankBatchActions:
         self,
         where: types.RankWhereUniqueInput,
         include: Optional[types.RankInclude] = None,
-    ) -> None:
-        self._batcher._add(
+    ) -> BatchResult[models.Rank]:
+        return self._batcher._add(
             method='delete',
             model=models.Rank,
             arguments={
@@ -512,8 +684,8 @@ class RankBatchActions:
         data: types.RankUpdateInput,
         where: types.RankWhereUniqueInput,
         include: Optional[types.RankInclude] = None
-    ) -> None:
-        self._batcher._add(
+    ) -> BatchResult[models.Rank]:
+        return self._batcher._add(
             method='update',
             model=models.Rank,
             arguments={
@@ -528,8 +700,8 @@ class RankBatchActions:
         where: types.RankWhereUniqueInput,
         data: types.RankUpsertInput,
         include: Optional[types.RankInclude] = None,
-    ) -> None:
-        self._batcher._add(
+    ) -> BatchResult[models.Rank]:
+        return self._batcher._add(
             method='upsert',
             model=models.Rank,
             arguments={
@@ -544,8 +716,8 @@ class RankBatchActions:
         self,
         data: types.RankUpdateManyMutationInput,
         where: types.RankWhereInput,
-    ) -> None:
-        self._batcher._add(
+    ) -> BatchResult[int]:
+        return self._batcher._add(
             method='update_many',
             model=models.Rank,
             arguments={'data': data, 'where': where,},
@@ -555,8 +727,8 @@ class RankBatchActions:
     def delete_many(
         self,
         where: Optional[types.RankWhereInput] = None,
-    ) -> None:
-        self._batcher._add(
+    ) -> BatchResult[int]:
+        return self._batcher._add(
             method='delete_many',
             model=models.Rank,
             arguments={'where': where},
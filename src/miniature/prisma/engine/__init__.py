@@ -1,7 +1,12 @@
 from ._query import (
+    EngineAddress as EngineAddress,
     SyncQueryEngine as SyncQueryEngine,
     AsyncQueryEngine as AsyncQueryEngine,
 )
+from ._pool import (
+    SyncEnginePool as SyncEnginePool,
+    AsyncEnginePool as AsyncEnginePool,
+)
 from .errors import *
 from .._types import TransactionId as TransactionId
 from ._abstract import (
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING, Any, overload
+from typing import TYPE_CHECKING, Any, Hashable, overload
 from datetime import timedelta
 from typing_extensions import Literal
 
@@ -34,6 +34,11 @@ class BaseAbstractEngine(ABC):
             if not loop.is_closed():
                 loop.create_task(self.aclose(timeout=timeout))
 
+    @property
+    def endpoint(self) -> Hashable:
+        """Identifies where queries are sent to, engines with the same endpoint return the same results"""
+        return self
+
     @abstractmethod
     def close(self, *, timeout: timedelta | None = None) -> None:
         """Synchronous method for closing the engine, useful if the underlying engine uses a subprocess"""
@@ -57,7 +62,7 @@ class SyncAbstractEngine(BaseAbstractEngine):
         ...
 
     @abstractmethod
-    def query(self, content: str, *, tx_id: TransactionId | None) -> Any:
+    def query(self, content: str | bytes, *, tx_id: TransactionId | None) -> Any:
         """Execute a GraphQL query.
 
         This method expects a JSON object matching this structure:
@@ -123,7 +128,7 @@ class AsyncAbstractEngine(BaseAbstractEngine):
         ...
 
     @abstractmethod
-    async def query(self, content: str, *, tx_id: TransactionId | None) -> Any:
+    async def query(self, content: str | bytes, *, tx_id: TransactionId | None) -> Any:
         """Execute a GraphQL query.
 
         This method expects a JSON object matching this structure:
@@ -1,8 +1,8 @@
 from __future__ import annotations
 
-import json
+import time
 import logging
-from typing import Any, NoReturn
+from typing import Any, NoReturn, Hashable
 from datetime import timedelta
 from typing_extensions import override
 
@@ -10,7 +10,9 @@ import httpx
 
 from . import utils, errors
 from ..utils import is_dict
+from .. import _codec
 from .._types import Method
+from .._instrumentation import Instrumentation, current_labels, current_instrumentation
 from ._abstract import SyncAbstractEngine, AsyncAbstractEngine
 from .._sync_http import SyncHTTP
 from .._async_http import AsyncHTTP
@@ -34,6 +36,11 @@ class BaseHTTPEngine:
         super().__init__()
         self.url = url
         self.headers = headers if headers is not None else {}
+        self._uds: str | None = None
+
+    @property
+    def endpoint(self) -> Hashable:
+        return (self.url, self._uds)
 
     def _build_request(
         self,
@@ -77,7 +84,7 @@ class BaseHTTPEngine:
     ) -> Any:
         if isinstance(data, str):
             # workaround for https://github.com/prisma/prisma-engines/pull/4246
-            data = json.loads(data)
+            data = _codec.loads(data)
 
         if not is_dict(data):
             raise TypeError(f'Expected deserialised engine response to be a dictionary, got {type(data)} - {data}')
@@ -88,6 +95,19 @@ class BaseHTTPEngine:
 
         return data
 
+    def _record_response(
+        self,
+        instrumentation: Instrumentation,
+        response: AbstractResponse[httpx.Response],
+        start: float,
+        transported: float,
+    ) -> None:
+        parsed = time.perf_counter()
+        model, method = current_labels()
+        instrumentation.record('transport', transported - start, model=model, method=method)
+        instrumentation.record('parse', parsed - transported, model=model, method=method)
+        instrumentation.record_size('response', len(response.original.content), model=model, method=method)
+
     def _process_response_error(
         self,
         *,
@@ -108,10 +128,23 @@ class SyncHTTPEngine(BaseHTTPEngine, SyncAbstractEngine):
         self,
         url: str | None,
         headers: dict[str, str] | None = None,
+        *,
+        uds: str | None = None,
         **kwargs: Any,
     ) -> None:
         super().__init__(url=url, headers=headers)
+        self._session_kwargs = kwargs
         self.session = SyncHTTP(**kwargs)
+        if uds is not None:
+            self.use_unix_socket(uds)
+
+    def use_unix_socket(self, path: str) -> None:
+        """Send every request over the Unix domain socket at `path`.
+
+        This replaces the HTTP session so it must be called before any requests are made.
+        """
+        self._uds = path
+        self.session = SyncHTTP(**self._session_kwargs, transport=httpx.HTTPTransport(uds=path))
 
     @override
     def close(
@@ -147,6 +180,9 @@ class SyncHTTPEngine(BaseHTTPEngine, SyncAbstractEngine):
             parse_response=parse_response,
         )
 
+        instrumentation = current_instrumentation() if path == '/' else None
+        start = time.perf_counter() if instrumentation is not None else 0.0
+
         response = self.session.request(method, url, **kwargs)
         log.debug('%s %s returned status %s', method, url, response.status)
 
@@ -160,7 +196,13 @@ class SyncHTTPEngine(BaseHTTPEngine, SyncAbstractEngine):
                 log.debug('%s %s returned text: %s', method, url, text)
                 return text
 
-            data = response.json()
+            if instrumentation is None:
+                data = response.json()
+            else:
+                transported = time.perf_counter()
+                data = response.json()
+                self._record_response(instrumentation, response, start, transported)
+
             log.debug('%s %s returned %s', method, url, data)
 
             return self._process_response_data(data=data, response=response)
@@ -175,10 +217,23 @@ class AsyncHTTPEngine(BaseHTTPEngine, AsyncAbstractEngine):
         self,
         url: str | None,
         headers: dict[str, str] | None = None,
+        *,
+        uds: str | None = None,
         **kwargs: Any,
     ) -> None:
         super().__init__(url=url, headers=headers)
+        self._session_kwargs = kwargs
         self.session = AsyncHTTP(**kwargs)
+        if uds is not None:
+            self.use_unix_socket(uds)
+
+    def use_unix_socket(self, path: str) -> None:
+        """Send every request over the Unix domain socket at `path`.
+
+        This replaces the HTTP session so it must be called before any requests are made.
+        """
+        self._uds = path
+        self.session = AsyncHTTP(**self._session_kwargs, transport=httpx.AsyncHTTPTransport(uds=path))
 
     @override
     def close(self, *, timeout: timedelta | None = None) -> None:
@@ -214,6 +269,9 @@ class AsyncHTTPEngine(BaseHTTPEngine, AsyncAbstractEngine):
             parse_response=parse_response,
         )
 
+        instrumentation = current_instrumentation() if path == '/' else None
+        start = time.perf_counter() if instrumentation is not None else 0.0
+
         response = await self.session.request(method, url, **kwargs)
         log.debug('%s %s returned status %s', method, url, response.status)
 
@@ -227,7 +285,13 @@ class AsyncHTTPEngine(BaseHTTPEngine, AsyncAbstractEngine):
                 log.debug('%s %s returned text: %s', method, url, text)
                 return text
 
-            data = await response.json()
+            if instrumentation is None:
+                data = await response.json()
+            else:
+                transported = time.perf_counter()
+                data = await response.json()
+                self._record_response(instrumentation, response, start, transported)
+
             log.debug('%s %s returned %s', method, url, data)
 
             return self._process_response_data(data=data, response=response)
@@ -0,0 +1,380 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from typing import TYPE_CHECKING, Any, Dict, List, Tuple, Generic, TypeVar, Hashable, Sequence, overload
+from datetime import timedelta
+from collections import OrderedDict
+from typing_extensions import Literal, override
+
+from .._types import TransactionId
+from ._abstract import BaseAbstractEngine, SyncAbstractEngine, AsyncAbstractEngine
+from .._constants import DEFAULT_CONNECT_TIMEOUT
+
+if TYPE_CHECKING:
+    from ..types import MetricsFormat, DatasourceOverride  # noqa: TID251
+
+
+__all__ = (
+    'SyncEnginePool',
+    'AsyncEnginePool',
+)
+
+log: logging.Logger = logging.getLogger(__name__)
+
+_EngineT = TypeVar('_EngineT', bound=BaseAbstractEngine)
+
+
+class _Member(Generic[_EngineT]):
+    __slots__ = ('engine', 'outstanding')
+
+    def __init__(self, engine: _EngineT) -> None:
+        self.engine = engine
+        self.outstanding = 0
+
+
+class _BaseEnginePool(Generic[_EngineT]):
+    """Spreads queries over multiple query engines for the same datasource.
+
+    Every query is sent to the engine with the fewest outstanding requests, ties are
+    broken round-robin. Interactive transactions are pinned to the engine that started
+    them as the transaction only exists within that engine.
+
+    Every engine holds its own connections to the database, for SQLite this means
+    concurrent writers across engines wait on the database lock.
+    """
+
+    _members: List[_Member[_EngineT]]
+
+    def __init__(self, engines: Sequence[_EngineT]) -> None:
+        if not engines:
+            raise ValueError('An engine pool requires at least one engine')
+
+        self._members = [_Member(engine) for engine in engines]
+        self._lock = threading.Lock()
+        self._pinned: Dict[TransactionId, _Member[_EngineT]] = {}
+        self._next = 0
+
+    @property
+    def engines(self) -> List[_EngineT]:
+        return [member.engine for member in self._members]
+
+    @property
+    def endpoint(self) -> Hashable:
+        return tuple(member.engine.endpoint for member in self._members)
+
+    def outstanding(self) -> List[int]:
+        """Returns the number of in-flight requests for each engine"""
+        with self._lock:
+            return [member.outstanding for member in self._members]
+
+    def _acquire(self, tx_id: TransactionId | None) -> _Member[_EngineT]:
+        with self._lock:
+            member = self._pinned.get(tx_id) if tx_id is not None else None
+            if member is None:
+                if tx_id is not None:
+                    log.debug('Transaction %s was not started by this pool', tx_id)
+
+                member = self._least_outstanding()
+
+            member.outstanding += 1
+            return member
+
+    def _least_outstanding(self) -> _Member[_EngineT]:
+        members = self._members
+        count = len(members)
+        start = self._next
+        self._next = (start + 1) % count
+
+        best = members[start]
+        for offset in range(1, count):
+            member = members[(start + offset) % count]
+            if member.outstanding < best.outstanding:
+                best = member
+        return best
+
+    def _release(self, member: _Member[_EngineT]) -> None:
+        with self._lock:
+            member.outstanding -= 1
+
+    def _pin(self, tx_id: TransactionId, member: _Member[_EngineT]) -> None:
+        with self._lock:
+            self._pinned[tx_id] = member
+
+    def _unpin(self, tx_id: TransactionId) -> None:
+        with self._lock:
+            self._pinned.pop(tx_id, None)
+
+    def __repr__(self) -> str:
+        return f'<{self.__class__.__name__} size={len(self._members)}>'
+
+
+class SyncEnginePool(_BaseEnginePool[SyncAbstractEngine], SyncAbstractEngine):
+    @override
+    def close(self, *, timeout: timedelta | None = None) -> None:
+        for member in self._members:
+            member.engine.close(timeout=timeout)
+
+    @override
+    async def aclose(self, *, timeout: timedelta | None = None) -> None:
+        for member in self._members:
+            await member.engine.aclose(timeout=timeout)
+
+    @override
+    def connect(
+        self,
+        timeout: timedelta = DEFAULT_CONNECT_TIMEOUT,
+        datasources: list[DatasourceOverride] | None = None,
+    ) -> None:
+        try:
+            for member in self._members:
+                member.engine.connect(timeout=timeout, datasources=datasources)
+        except Exception:
+            self.close()
+            raise
+
+    @override
+    def query(self, content: str | bytes, *, tx_id: TransactionId | None) -> Any:
+        member = self._acquire(tx_id)
+        try:
+            return member.engine.query(content, tx_id=tx_id)
+        finally:
+            self._release(member)
+
+    @override
+    def start_transaction(self, *, content: str) -> TransactionId:
+        member = self._acquire(None)
+        try:
+            tx_id = member.engine.start_transaction(content=content)
+        finally:
+            self._release(member)
+
+        self._pin(tx_id, member)
+        return tx_id
+
+    @override
+    def commit_transaction(self, tx_id: TransactionId) -> None:
+        member = self._acquire(tx_id)
+        try:
+            member.engine.commit_transaction(tx_id)
+        finally:
+            self._release(member)
+            self._unpin(tx_id)
+
+    @override
+    def rollback_transaction(self, tx_id: TransactionId) -> None:
+        member = self._acquire(tx_id)
+        try:
+            member.engine.rollback_transaction(tx_id)
+        finally:
+            self._release(member)
+            self._unpin(tx_id)
+
+    @overload
+    def metrics(
+        self,
+        *,
+        format: Literal['json'],
+        global_labels: dict[str, str] | None,
+    ) -> dict[str, Any]: ...
+
+    @overload
+    def metrics(
+        self,
+        *,
+        format: Literal['prometheus'],
+        global_labels: dict[str, str] | None,
+    ) -> str: ...
+
+    @override
+    def metrics(
+        self,
+        *,
+        format: MetricsFormat,
+        global_labels: dict[str, str] | None,
+    ) -> str | dict[str, Any]:
+        if format == 'prometheus':
+            return merge_prometheus(
+                [
+                    member.engine.metrics(format='prometheus', global_labels=_engine_labels(global_labels, index))
+                    for index, member in enumerate(self._members)
+                ]
+            )
+
+        return merge_metrics(
+            [member.engine.metrics(format='json', global_labels=global_labels) for member in self._members]
+        )
+
+
+class AsyncEnginePool(_BaseEnginePool[AsyncAbstractEngine], AsyncAbstractEngine):
+    @override
+    def close(self, *, timeout: timedelta | None = None) -> None:
+        for member in self._members:
+            member.engine.close(timeout=timeout)
+
+    @override
+    async def aclose(self, *, timeout: timedelta | None = None) -> None:
+        for member in self._members:
+            await member.engine.aclose(timeout=timeout)
+
+    @override
+    async def connect(
+        self,
+        timeout: timedelta = DEFAULT_CONNECT_TIMEOUT,
+        datasources: list[DatasourceOverride] | None = None,
+    ) -> None:
+        # the engines are started concurrently as each one takes a while to boot
+        results = await asyncio.gather(
+            *(member.engine.connect(timeout=timeout, datasources=datasources) for member in self._members),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                await self.aclose()
+                raise result
+
+    @override
+    async def query(self, content: str | bytes, *, tx_id: TransactionId | None) -> Any:
+        member = self._acquire(tx_id)
+        try:
+            return await member.engine.query(content, tx_id=tx_id)
+        finally:
+            self._release(member)
+
+    @override
+    async def start_transaction(self, *, content: str) -> TransactionId:
+        member = self._acquire(None)
+        try:
+            tx_id = await member.engine.start_transaction(content=content)
+        finally:
+            self._release(member)
+
+        self._pin(tx_id, member)
+        return tx_id
+
+    @override
+    async def commit_transaction(self, tx_id: TransactionId) -> None:
+        member = self._acquire(tx_id)
+        try:
+            await member.engine.commit_transaction(tx_id)
+        finally:
+            self._release(member)
+            self._unpin(tx_id)
+
+    @override
+    async def rollback_transaction(self, tx_id: TransactionId) -> None:
+        member = self._acquire(tx_id)
+        try:
+            await member.engine.rollback_transaction(tx_id)
+        finally:
+            self._release(member)
+            self._unpin(tx_id)
+
+    @overload
+    async def metrics(
+        self,
+        *,
+        format: Literal['json'],
+        global_labels: dict[str, str] | None,
+    ) -> dict[str, Any]: ...
+
+    @overload
+    async def metrics(
+        self,
+        *,
+        format: Literal['prometheus'],
+        global_labels: dict[str, str] | None,
+    ) -> str: ...
+
+    @override
+    async def metrics(
+        self,
+        *,
+        format: MetricsFormat,
+        global_labels: dict[str, str] | None,
+    ) -> str | dict[str, Any]:
+        if format == 'prometheus':
+            texts = await asyncio.gather(
+                *(
+                    member.engine.metrics(format='prometheus', global_labels=_engine_labels(global_labels, index))
+                    for index, member in enumerate(self._members)
+                )
+            )
+            return merge_prometheus(texts)
+
+        responses = await asyncio.gather(
+            *(member.engine.metrics(format='json', global_labels=global_labels) for member in self._members)
+        )
+        return merge_metrics(responses)
+
+
+def _engine_labels(global_labels: dict[str, str] | None, index: int) -> dict[str, str]:
+    return {**(global_labels or {}), 'engine': str(index)}
+
+
+def merge_metrics(responses: Sequence[dict[str, Any]]) -> dict[str, Any]:
+    """Combine the JSON metrics of multiple engines, values of the same metric are summed"""
+    merged: dict[str, Any] = {}
+    for kind in ('counters', 'gauges', 'histograms'):
+        metrics: OrderedDict[Tuple[str, Tuple[Tuple[str, str], ...]], dict[str, Any]] = OrderedDict()
+        for response in responses:
+            for metric in response.get(kind, []):
+                key = (metric['key'], tuple(sorted(metric['labels'].items())))
+                existing = metrics.get(key)
+                if existing is None:
+                    metrics[key] = {**metric, 'value': _copy_value(metric['value'])}
+                else:
+                    existing['value'] = _add_values(existing['value'], metric['value'])
+
+        merged[kind] = list(metrics.values())
+
+    return merged
+
+
+def _copy_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {**value, 'buckets': [list(bucket) for bucket in value['buckets']]}
+    return value
+
+
+def _add_values(left: Any, right: Any) -> Any:
+    if not isinstance(left, dict):
+        return left + right
+
+    # histograms, the engines use the same bucket boundaries
+    left['sum'] += right['sum']
+    left['count'] += right['count']
+    for bucket, other in zip(left['buckets'], right['buckets']):
+        bucket[1] += other[1]
+    return left
+
+
+def merge_prometheus(texts: Sequence[str]) -> str:
+    """Combine the Prometheus metrics of multiple engines, grouping the samples of each metric"""
+    families: OrderedDict[str, Tuple[List[str], List[str]]] = OrderedDict()
+    family: Tuple[List[str], List[str]] | None = None
+    for text in texts:
+        for line in text.splitlines():
+            if not line:
+                continue
+
+            if line.startswith('#'):
+                parts = line.split(maxsplit=3)
+                if len(parts) >= 3 and parts[1] in {'HELP', 'TYPE'}:
+                    family = families.get(parts[2])
+                    if family is None:
+                        family = families[parts[2]] = ([], [])
+                    if line not in family[0]:
+                        family[0].append(line)
+                continue
+
+            if family is None:
+                family = families[''] = ([], [])
+            family[1].append(line)
+
+    lines: List[str] = []
+    for comments, samples in families.values():
+        lines.extend(comments)
+        lines.extend(samples)
+    return '\n'.join(lines) + '\n'
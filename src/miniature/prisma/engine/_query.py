@@ -1,23 +1,23 @@
 from __future__ import annotations
 
 import os
-import sys
 import json
 import time
 import atexit
 import signal
-import asyncio
+import socket
 import logging
 import subprocess
-from typing import TYPE_CHECKING, Any, overload
+from typing import TYPE_CHECKING, Any, Optional, NamedTuple, overload
 from pathlib import Path
 from datetime import timedelta
-from typing_extensions import Literal, override
+from typing_extensions import Self, Literal, override
 
 from . import utils, errors
 from ._http import SyncHTTPEngine, AsyncHTTPEngine
+from ._readiness import MAX_BACKOFF, INITIAL_BACKOFF, EngineLogWatcher
 from ..utils import DEBUG, _env_bool, time_since
-from .._types import HttpConfig, TransactionId
+from .._types import HttpConfig, TransactionId, EngineTransport
 from .._builder import dumps
 from ..binaries import platform
 from .._constants import DEFAULT_CONNECT_TIMEOUT
@@ -27,6 +27,7 @@ if TYPE_CHECKING:
 
 
 __all__ = (
+    'EngineAddress',
     'SyncQueryEngine',
     'AsyncQueryEngine',
 )
@@ -34,22 +35,80 @@ __all__ = (
 log: logging.Logger = logging.getLogger(__name__)
 
 
+class EngineAddress(NamedTuple):
+    """Where a running query engine process can be reached"""
+
+    url: str
+    socket_path: Optional[str] = None
+    """The Unix domain socket the engine listens on, if it does not use TCP"""
+
+
 class BaseQueryEngine:
     dml_path: Path
     url: str | None
     file: Path | None
     process: subprocess.Popen[bytes] | subprocess.Popen[str] | None
+    watcher: EngineLogWatcher | None
+    transport: EngineTransport
 
     def __init__(
         self,
         *,
         dml_path: Path,
         log_queries: bool = False,
+        transport: EngineTransport = 'tcp',
     ) -> None:
         self.dml_path = dml_path
         self._log_queries = log_queries
+        self.transport = transport
         self.process = None
+        self.watcher = None
         self.file = None
+        self._socket_path: str | None = None
+        self._port_reservation: socket.socket | None = None
+
+    if TYPE_CHECKING:
+        # provided by the HTTP engine classes we are mixed into
+        _uds: str | None
+
+        def use_unix_socket(self, path: str) -> None: ...
+
+        def __init__(
+            self,
+            *,
+            dml_path: Path,
+            log_queries: bool = False,
+            http_config: HttpConfig | None = None,
+            transport: EngineTransport = 'tcp',
+        ) -> None: ...
+
+    @classmethod
+    def attach(
+        cls,
+        address: EngineAddress,
+        *,
+        dml_path: Path,
+        http_config: HttpConfig | None = None,
+    ) -> Self:
+        """Returns an engine that sends queries to an engine process that is owned by something else.
+
+        The returned engine is already connected, closing it only closes its HTTP session
+        and leaves the process running.
+        """
+        engine = cls(dml_path=dml_path, http_config=http_config)
+        # there is no process to stop at exit
+        atexit.unregister(engine.stop)
+        engine.url = address.url
+        if address.socket_path is not None:
+            engine.use_unix_socket(address.socket_path)
+        return engine
+
+    @property
+    def address(self) -> EngineAddress:
+        """Where the engine process can be reached, see `attach()`"""
+        if self.url is None:
+            raise errors.NotConnectedError('Not connected to the query engine')
+        return EngineAddress(url=self.url, socket_path=self._uds)
 
     def _ensure_file(self) -> Path:
         # circular import
@@ -63,23 +122,37 @@ class BaseQueryEngine:
         file: Path,
         datasources: list[DatasourceOverride] | None,
     ) -> tuple[str, subprocess.Popen[bytes] | subprocess.Popen[str]]:
-        port = utils.get_open_port()
-        log.debug('Running query engine on port %i', port)
+        listen_args: list[str]
+        if self.transport == 'uds' and utils.supports_unix_socket(file):
+            self._socket_path = path = utils.unix_socket_path()
+            log.debug('Running query engine on unix socket %s', path)
+
+            # the host is meaningless here but httpx requires one
+            self.url = 'http://localhost'
+            self.use_unix_socket(path)
+            listen_args = ['--unix-path', path]
+        else:
+            if self.transport == 'uds':
+                log.debug('Query engine does not support unix sockets, falling back to TCP')
+
+            self._port_reservation = reservation = utils.reserve_port()
+            port = reservation.getsockname()[1]
+            log.debug('Running query engine on port %i', port)
 
-        self.url = f'http://localhost:{port}'
+            self.url = f'http://localhost:{port}'
+            listen_args = ['-p', str(port)]
 
         env = os.environ.copy()
         env.update(
             PRISMA_DML_PATH=str(self.dml_path.absolute()),
-            RUST_LOG='error',
+            # info level is required for the engine to log when its server is
+            # listening, the log watcher only forwards warnings and errors
+            RUST_LOG='info',
             RUST_LOG_FORMAT='json',
             PRISMA_CLIENT_ENGINE_TYPE='binary',
             PRISMA_ENGINE_PROTOCOL='graphql',
         )
 
-        if DEBUG:
-            env.update(RUST_LOG='info')
-
         if datasources is not None:
             env.update(OVERWRITE_DATASOURCES=dumps(datasources))
 
@@ -89,20 +162,19 @@ class BaseQueryEngine:
 
         args: list[str] = [
             str(file.absolute()),
-            '-p',
-            str(port),
+            *listen_args,
             '--enable-metrics',
             '--enable-raw-queries',
         ]
-        if _env_bool('__PRISMA_PY_PLAYGROUND'):
-            env.update(RUST_LOG='info')
+        playground = _env_bool('__PRISMA_PY_PLAYGROUND')
+        if playground:
             args.append('--enable-playground')
 
         log.debug('Starting query engine...')
         popen_kwargs: dict[str, Any] = {
             'env': env,
-            'stdout': sys.stdout,
-            'stderr': sys.stderr,
+            'stdout': subprocess.PIPE,
+            'stderr': subprocess.PIPE,
             'text': False,
         }
         if platform.name() != 'windows':
@@ -111,13 +183,35 @@ class BaseQueryEngine:
             popen_kwargs['preexec_fn'] = lambda: signal.pthread_sigmask(
                 signal.SIG_UNBLOCK, [signal.SIGINT, signal.SIGTERM]
             )
-
-        self.process = subprocess.Popen(args, **popen_kwargs)
+        else:
+            # SO_REUSEADDR lets anyone steal a bound port on Windows so we
+            # cannot hold on to the reservation while the engine starts
+            self._release_port()
+
+        self.process = process = subprocess.Popen(args, **popen_kwargs)
+        self.watcher = EngineLogWatcher(
+            stdout=process.stdout,  # type: ignore[arg-type]
+            stderr=process.stderr,  # type: ignore[arg-type]
+            forward_all=DEBUG or playground or self._log_queries,
+        )
 
         return self.url, self.process
 
+    def _release_port(self) -> None:
+        """Stop holding the TCP port reservation, the engine is listening on it by now"""
+        if self._port_reservation is not None:
+            self._port_reservation.close()
+            self._port_reservation = None
+
+    def _check_exited(self) -> None:
+        watcher = self.watcher
+        if watcher is not None and watcher.exited and not watcher.ready:
+            details = f': {watcher.errors[-1]}' if watcher.errors else ''
+            raise errors.EngineConnectionError(f'The query engine exited before it was ready{details}')
+
     def _kill_process(self, timeout: timedelta | None) -> None:
         if self.process is None:
+            self._release_port()
             return
 
         if timeout is not None:
@@ -136,6 +230,15 @@ class BaseQueryEngine:
                 self.process.send_signal(signal.SIGKILL)
 
         self.process = None
+        self.watcher = None
+        self._release_port()
+
+        if self._socket_path is not None:
+            try:
+                os.unlink(self._socket_path)
+            except OSError:
+                pass
+            self._socket_path = None
 
 
 class SyncQueryEngine(BaseQueryEngine, SyncHTTPEngine):
@@ -147,10 +250,11 @@ class SyncQueryEngine(BaseQueryEngine, SyncHTTPEngine):
         dml_path: Path,
         log_queries: bool = False,
         http_config: HttpConfig | None = None,
+        transport: EngineTransport = 'tcp',
     ) -> None:
         # this is a little weird but it's needed to distinguish between
         # the different required arguments for our two base classes
-        BaseQueryEngine.__init__(self, dml_path=dml_path, log_queries=log_queries)
+        BaseQueryEngine.__init__(self, dml_path=dml_path, log_queries=log_queries, transport=transport)
         SyncHTTPEngine.__init__(self, url=None, **(http_config or {}))
 
         # ensure the query engine process is terminated when we are
@@ -201,9 +305,18 @@ class SyncQueryEngine(BaseQueryEngine, SyncHTTPEngine):
         datasources: list[DatasourceOverride] | None = None,
     ) -> None:
         self._spawn_process(file=file, datasources=datasources)
+        watcher = self.watcher
+        assert watcher is not None
 
+        # We wake up as soon as the engine logs that it is listening and fall back
+        # to probing `/status` with exponential backoff in case that log line is missed.
+        deadline = time.monotonic() + timeout.total_seconds()
+        delay = INITIAL_BACKOFF
         last_exc = None
-        for _ in range(int(timeout.total_seconds() / 0.1)):
+        while True:
+            watcher.wait(min(delay, max(deadline - time.monotonic(), 0)))
+            self._check_exited()
+
             try:
                 data = self.request('GET', '/status')
             except Exception as exc:
@@ -216,22 +329,22 @@ class SyncQueryEngine(BaseQueryEngine, SyncHTTPEngine):
                     'Could not connect to query engine due to %s; retrying...',
                     exc,
                 )
-                time.sleep(0.1)
-                continue
+            else:
+                if data.get('Errors') is None:
+                    self._release_port()
+                    break
 
-            if data.get('Errors') is not None:
                 log.debug('Could not connect due to gql errors; retrying...')
-                time.sleep(0.1)
-                continue
 
-            break
-        else:
-            raise errors.EngineConnectionError('Could not connect to the query engine') from last_exc
+            if time.monotonic() >= deadline:
+                raise errors.EngineConnectionError('Could not connect to the query engine') from last_exc
+
+            delay = min(delay * 2, MAX_BACKOFF)
 
     @override
     def query(
         self,
-        content: str,
+        content: str | bytes,
         *,
         tx_id: TransactionId | None,
     ) -> Any:
@@ -308,10 +421,11 @@ class AsyncQueryEngine(BaseQueryEngine, AsyncHTTPEngine):
         dml_path: Path,
         log_queries: bool = False,
         http_config: HttpConfig | None = None,
+        transport: EngineTransport = 'tcp',
     ) -> None:
         # this is a little weird but it's needed to distinguish between
         # the different required arguments for our two base classes
-        BaseQueryEngine.__init__(self, dml_path=dml_path, log_queries=log_queries)
+        BaseQueryEngine.__init__(self, dml_path=dml_path, log_queries=log_queries, transport=transport)
         AsyncHTTPEngine.__init__(self, url=None, **(http_config or {}))
 
         # ensure the query engine process is terminated when we are
@@ -361,9 +475,18 @@ class AsyncQueryEngine(BaseQueryEngine, AsyncHTTPEngine):
         datasources: list[DatasourceOverride] | None = None,
     ) -> None:
         self._spawn_process(file=file, datasources=datasources)
+        watcher = self.watcher
+        assert watcher is not None
 
+        # We wake up as soon as the engine logs that it is listening and fall back
+        # to probing `/status` with exponential backoff in case that log line is missed.
+        deadline = time.monotonic() + timeout.total_seconds()
+        delay = INITIAL_BACKOFF
         last_exc = None
-        for _ in range(int(timeout.total_seconds() / 0.1)):
+        while True:
+            await watcher.wait_async(min(delay, max(deadline - time.monotonic(), 0)))
+            self._check_exited()
+
             try:
                 data = await self.request('GET', '/status')
             except Exception as exc:
@@ -376,22 +499,22 @@ class AsyncQueryEngine(BaseQueryEngine, AsyncHTTPEngine):
                     'Could not connect to query engine due to %s; retrying...',
                     exc,
                 )
-                await asyncio.sleep(0.1)
-                continue
+            else:
+                if data.get('Errors') is None:
+                    self._release_port()
+                    break
 
-            if data.get('Errors') is not None:
                 log.debug('Could not connect due to gql errors; retrying...')
-                await asyncio.sleep(0.1)
-                continue
 
-            break
-        else:
-            raise errors.EngineConnectionError('Could not connect to the query engine') from last_exc
+            if time.monotonic() >= deadline:
+                raise errors.EngineConnectionError('Could not connect to the query engine') from last_exc
+
+            delay = min(delay * 2, MAX_BACKOFF)
 
     @override
     async def query(
         self,
-        content: str,
+        content: str | bytes,
         *,
         tx_id: TransactionId | None,
     ) -> Any:
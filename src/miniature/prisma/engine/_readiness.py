@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import sys
+import json
+import asyncio
+import logging
+import threading
+from typing import IO, Any
+
+from ..utils import is_dict
+
+__all__ = ('EngineLogWatcher',)
+
+log: logging.Logger = logging.getLogger(__name__)
+
+# delays used when probing `/status` while no readiness event has been seen yet
+INITIAL_BACKOFF = 0.005
+MAX_BACKOFF = 0.25
+
+_READY_MESSAGES = ('Started query engine http server', 'listening on')
+_FORWARDED_LEVELS = {'ERROR', 'WARN'}
+_MAX_ERRORS = 10
+
+
+class EngineLogWatcher:
+    """Consumes the query engine's stdout / stderr streams in background threads.
+
+    Lines are forwarded to our own stdout / stderr (info level JSON logs are
+    only forwarded when `forward_all` is set) and the watcher is signalled as
+    soon as the engine logs that its HTTP server is listening, or when the
+    process closes its output because it exited.
+    """
+
+    def __init__(self, *, stdout: IO[bytes] | None, stderr: IO[bytes] | None, forward_all: bool = False) -> None:
+        self.forward_all = forward_all
+        self.errors: list[str] = []
+        self._ready = False
+        self._open_streams = 0
+        self._lock = threading.Lock()
+        self._signal = threading.Event()
+        self._waiters: list[tuple[asyncio.AbstractEventLoop, asyncio.Future[None]]] = []
+
+        for stream, target in ((stdout, sys.stdout), (stderr, sys.stderr)):
+            if stream is None:
+                continue
+
+            self._open_streams += 1
+            thread = threading.Thread(
+                target=self._watch,
+                args=(stream, target),
+                name='prisma-engine-log',
+                daemon=True,
+            )
+            thread.start()
+
+    @property
+    def ready(self) -> bool:
+        """True once the engine has logged that it is listening for requests"""
+        return self._ready
+
+    @property
+    def exited(self) -> bool:
+        """True once every output stream of the engine has been closed"""
+        return self._open_streams == 0
+
+    def wait(self, timeout: float) -> bool:
+        """Block until the watcher is signalled or `timeout` seconds elapse.
+
+        Returns True if it was signalled, the signal is consumed either way.
+        """
+        signalled = self._signal.wait(timeout)
+        self._signal.clear()
+        return signalled
+
+    async def wait_async(self, timeout: float) -> bool:
+        """Asynchronous counterpart to `wait()` that does not block the event loop"""
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[None] = loop.create_future()
+
+        with self._lock:
+            if self._signal.is_set():
+                self._signal.clear()
+                return True
+
+            waiter = (loop, future)
+            self._waiters.append(waiter)
+
+        try:
+            await asyncio.wait_for(future, timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            with self._lock:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+            self._signal.clear()
+
+    def _notify(self) -> None:
+        with self._lock:
+            self._signal.set()
+            waiters = list(self._waiters)
+
+        for loop, future in waiters:
+            try:
+                loop.call_soon_threadsafe(_resolve, future)
+            except RuntimeError:
+                # the loop waiting on us has already been closed
+                pass
+
+    def _watch(self, stream: IO[bytes], target: IO[str]) -> None:
+        try:
+            for raw in iter(stream.readline, b''):
+                line = raw.decode('utf-8', errors='replace')
+                if self._handle_line(line):
+                    try:
+                        target.write(line)
+                        target.flush()
+                    except ValueError:  # pragma: no cover
+                        # our own stream was closed during interpreter shutdown
+                        pass
+        except Exception as exc:  # pragma: no cover
+            log.debug('Stopped watching query engine output due to %s', exc)
+        finally:
+            stream.close()
+            with self._lock:
+                self._open_streams -= 1
+            self._notify()
+
+    def _handle_line(self, line: str) -> bool:
+        """Inspect a single line of engine output, returns whether or not it should be forwarded"""
+        try:
+            data: Any = json.loads(line)
+        except ValueError:
+            return True
+
+        if not is_dict(data):
+            return True
+
+        fields = data.get('fields')
+        message = fields.get('message', '') if is_dict(fields) else ''
+        level = data.get('level')
+
+        if not self._ready and isinstance(message, str) and message.startswith(_READY_MESSAGES):
+            log.debug('Query engine reported it is ready: %s', message)
+            self._ready = True
+            self._notify()
+
+        if level == 'ERROR' and isinstance(message, str):
+            self.errors.append(message)
+            del self.errors[:-_MAX_ERRORS]
+
+        return self.forward_all or level in _FORWARDED_LEVELS
+
+
+def _resolve(future: asyncio.Future[None]) -> None:
+    if not future.done():
+        future.set_result(None)
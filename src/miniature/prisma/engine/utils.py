@@ -3,11 +3,14 @@ from __future__ import annotations
 import os
 import sys
 import time
+import uuid
 import socket
 import logging
+import tempfile
 import subprocess
 from typing import Any, Dict, Type, NoReturn
 from pathlib import Path
+from functools import lru_cache
 
 from . import errors
 from .. import config, errors as prisma_errors
@@ -137,7 +140,52 @@ def get_open_port() -> int:
     return int(port)
 
 
+def reserve_port() -> socket.socket:
+    """Bind (but do not listen on) an open port and return the socket holding it.
+
+    While the socket is open no other `bind(('', 0))` call can be handed the same
+    port, and as `SO_REUSEADDR` is set the query engine can still bind to it as long
+    as the reservation is not listening, this closes the race in `get_open_port()`.
+    """
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind(('', 0))
+    return sock
+
+
+@lru_cache(maxsize=None)
+def supports_unix_socket(file: Path) -> bool:
+    """Whether or not the given query engine binary can listen on a Unix domain socket"""
+    if platform.name() == 'windows':
+        return False
+
+    try:
+        process = subprocess.run(
+            [str(file.absolute()), '--help'],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            check=False,
+        )
+    except OSError as exc:
+        log.debug('Could not check query engine options due to %s', exc)
+        return False
+
+    return b'--unix-path' in process.stdout
+
+
+def unix_socket_path() -> str:
+    return os.path.join(tempfile.gettempdir(), f'prisma-query-engine-{uuid.uuid4().hex[:12]}.sock')
+
+
 def handle_response_errors(resp: AbstractResponse[Any], data: Any) -> NoReturn:
+    raise response_error(resp, data)
+
+
+def response_error(resp: AbstractResponse[Any] | None, data: Any) -> Exception:
+    """Returns the exception for the given engine errors without raising it.
+
+    `resp` is None for the errors of a single query within a batch request.
+    """
     for error in data:
         try:
             base_error_message = error.get('error', '')
@@ -156,11 +204,11 @@ def handle_response_errors(resp: AbstractResponse[Any], data: Any) -> NoReturn:
 
             if code == 'P2028':
                 if base_error_message.startswith('Transaction already closed'):
-                    raise prisma_errors.TransactionExpiredError(base_error_message)
-                raise prisma_errors.TransactionError(message)
+                    return prisma_errors.TransactionExpiredError(base_error_message)
+                return prisma_errors.TransactionError(message)
 
             if 'A value is required but not set' in message:
-                raise prisma_errors.MissingRequiredValueError(error)
+                return prisma_errors.MissingRequiredValueError(error)
 
             exc: type[Exception] | None = None
 
@@ -172,14 +220,17 @@ def handle_response_errors(resp: AbstractResponse[Any], data: Any) -> NoReturn:
                 exc = ERROR_MAPPING.get(code)
 
             if exc is not None:
-                raise exc(error)
+                return exc(error)
         except (KeyError, TypeError) as err:
             log.debug('Ignoring error while constructing specialized error %s', err)
             continue
 
     try:
-        raise prisma_errors.DataError(data[0])
+        return prisma_errors.DataError(data[0])
     except (IndexError, TypeError):
         pass
 
-    raise errors.EngineRequestError(resp, f'Could not process erroneous response: {data}')
+    if resp is None:
+        return errors.EngineError(f'Could not process erroneous response: {data}')
+
+    return errors.EngineRequestError(resp, f'Could not process erroneous response: {data}')
@@ -13,6 +13,8 @@ __all__ = (
     'RecordNotFoundError',
     'HTTPClientClosedError',
     'ClientNotConnectedError',
+    'SQLiteProfileError',
+    'BatchResultMismatchError',
     'PrismaWarning',
     'UnsupportedSubclassWarning',
 )
@@ -141,6 +143,28 @@ class TransactionNotStartedError(TransactionError):
         )
 
 
+class SQLiteProfileError(PrismaError):
+    pragma: str
+    expected: Any
+    got: Any
+
+    def __init__(self, *, pragma: str, expected: Any, got: Any) -> None:
+        super().__init__(f'Could not set SQLite PRAGMA {pragma} to {expected!r}, it is {got!r}')
+        self.pragma = pragma
+        self.expected = expected
+        self.got = got
+
+
+class BatchResultMismatchError(PrismaError):
+    expected: int
+    got: int
+
+    def __init__(self, *, expected: int, got: int) -> None:
+        super().__init__(f'The query engine returned {got} results for a batch of {expected} queries')
+        self.expected = expected
+        self.got = got
+
+
 class BuilderError(PrismaError):
     pass
 
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import json
+import asyncio
+from typing import Any, Dict, List, Callable, Optional
+from datetime import timedelta
+
+from miniature.prisma.engine import AsyncAbstractEngine
+
+
+def default_result(query: str) -> Any:
+    if 'findMany' in query:
+        return []
+    if 'aggregate' in query:
+        return {'_count': {'_all': 0}}
+    if 'updateMany' in query or 'deleteMany' in query:
+        return {'count': 0}
+    if 'executeRaw' in query:
+        return 0
+    return None
+
+
+class Failure:
+    """Returned by `respond` to make a single operation of a batch fail with an engine error"""
+
+    def __init__(self, code: str, message: str = 'failed') -> None:
+        self.code = code
+        self.message = message
+
+
+class FakeEngine(AsyncAbstractEngine):
+    """Answers queries without a query engine process & records every request it receives.
+
+    `respond` maps the GraphQL query of a single operation to its result, raising an
+    exception from it makes the whole request fail.
+    """
+
+    def __init__(self, respond: Optional[Callable[[str], Any]] = None, *, delay: float = 0.0) -> None:
+        self.respond = respond or default_result
+        self.delay = delay
+        self.requests: List[Dict[str, Any]] = []
+        self.tx_ids: List[Optional[str]] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.closed = False
+        self._transactions = 0
+
+    @property
+    def queries(self) -> List[str]:
+        """The GraphQL query of every operation that was sent, batches are flattened"""
+        queries: List[str] = []
+        for request in self.requests:
+            if 'batch' in request:
+                queries.extend(item['query'] for item in request['batch'])
+            else:
+                queries.append(request['query'])
+        return queries
+
+    async def connect(self, timeout: timedelta = timedelta(seconds=10), datasources: Any = None) -> None:
+        pass
+
+    def close(self, *, timeout: Optional[timedelta] = None) -> None:
+        self.closed = True
+
+    async def aclose(self, *, timeout: Optional[timedelta] = None) -> None:
+        self.closed = True
+
+    async def query(self, content: str | bytes, *, tx_id: Optional[str]) -> Any:
+        request = json.loads(content)
+        self.requests.append(request)
+        self.tx_ids.append(tx_id)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            if 'batch' in request:
+                return {'batchResult': [self._answer(item) for item in request['batch']]}
+            return self._answer(request)
+        finally:
+            self.in_flight -= 1
+
+    def _answer(self, request: Dict[str, Any]) -> Any:
+        result = self.respond(request['query'])
+        if isinstance(result, Failure):
+            error = {'error': result.message, 'user_facing_error': {'error_code': result.code, 'message': result.message}}
+            return {'errors': [error]}
+        return {'data': {'result': result}}
+
+    async def start_transaction(self, *, content: str) -> str:
+        self._transactions += 1
+        return f'tx-{self._transactions}'
+
+    async def commit_transaction(self, tx_id: str) -> None:
+        pass
+
+    async def rollback_transaction(self, tx_id: str) -> None:
+        pass
+
+    async def metrics(self, *, format: Any, global_labels: Any) -> Any:
+        return '' if format == 'prometheus' else {'counters': [], 'gauges': [], 'histograms': []}
@@ -0,0 +1,79 @@
+import random
+from itertools import combinations
+from typing import List, NamedTuple
+
+import pytest
+
+from miniature.libs.balancing import SOLVERS, balance_teams
+
+
+class Player(NamedTuple):
+    id: int
+    rating: int
+
+
+def players(ratings: List[int]) -> List[Player]:
+    return [Player(id=i, rating=rating) for i, rating in enumerate(ratings)]
+
+
+def brute_force(ratings: List[int]) -> int:
+    total = sum(ratings)
+    return min(abs(total - 2 * sum(team)) for team in combinations(ratings, len(ratings) // 2))
+
+
+def assert_valid(lobby: List[Player], team_1: List[Player], team_2: List[Player]) -> None:
+    assert abs(len(team_1) - len(team_2)) <= 1
+    assert sorted(team_1 + team_2) == sorted(lobby)
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_exact_solver_matches_brute_force(seed: int) -> None:
+    rng = random.Random(seed)
+    lobby = players([rng.randint(0, 3000) for _ in range(rng.randint(2, 12))])
+
+    result = balance_teams(lobby, mode='exact', time_budget_ms=10_000)
+
+    assert_valid(lobby, result.team_1, result.team_2)
+    assert result.diff == brute_force([player.rating for player in lobby])
+    assert result.diff == abs(sum(p.rating for p in result.team_1) - sum(p.rating for p in result.team_2))
+
+
+@pytest.mark.parametrize('mode', sorted(SOLVERS))
+@pytest.mark.parametrize('size', [1, 2, 7, 30])
+def test_every_solver_splits_the_whole_lobby(mode: str, size: int) -> None:
+    rng = random.Random(size)
+    lobby = players([rng.randint(0, 3000) for _ in range(size)])
+
+    result = balance_teams(lobby, mode=mode)
+
+    assert result.solver == mode
+    assert_valid(lobby, result.team_1, result.team_2)
+
+
+def test_auto_picks_the_solver_by_lobby_size() -> None:
+    assert balance_teams(players([1] * 24)).solver == 'exact'
+    assert balance_teams(players([1] * 25)).solver == 'karmarkar_karp'
+
+
+def test_heuristics_find_perfect_splits() -> None:
+    lobby = players([1500, 1400, 1300, 1200, 1100, 1000, 900, 800])
+
+    assert balance_teams(lobby, mode='karmarkar_karp').diff == 0
+
+
+def test_empty_lobby() -> None:
+    result = balance_teams([])
+
+    assert (result.team_1, result.team_2, result.diff) == ([], [], 0)
+
+
+def test_custom_key() -> None:
+    result = balance_teams([3, 1, 2, 2], key=lambda rating: rating)
+
+    assert sorted(result.team_1) in ([1, 3], [2, 2])
+    assert result.diff == 0
+
+
+def test_unknown_mode() -> None:
+    with pytest.raises(ValueError, match="Unknown balancing mode 'optimal'"):
+        balance_teams(players([1, 2]), mode='optimal')
@@ -0,0 +1,171 @@
+import asyncio
+from typing import Any, Union, Optional
+
+import pytest
+
+from miniature.prisma import Prisma, QueryDispatcher, errors
+from miniature.prisma._batching import AutoBatcher
+
+from .fakes import Failure, FakeEngine
+
+PLAYER = {'id': 1, 'name': 'a', 'rating': 1, 'rank_id': None}
+
+
+def client(engine: FakeEngine, **kwargs) -> Prisma:
+    db = Prisma(hydration='trusted', **kwargs)
+    db.attach(engine)
+    return db
+
+
+def test_identical_reads_of_many_clients_are_coalesced() -> None:
+    async def main() -> None:
+        engine = FakeEngine(delay=0.01)
+        dispatcher = QueryDispatcher()
+        clients = [client(engine, dispatcher=dispatcher, auto_batch=True) for _ in range(5)]
+
+        results = await asyncio.gather(*(db.player.find_many(where={'rating': {'gt': 1}}) for db in clients))
+
+        assert results == [[]] * 5
+        assert len(engine.requests) == 1
+        assert dispatcher.stats().coalesced == 4
+
+    asyncio.run(main())
+
+
+def test_identical_reads_in_one_tick_are_sent_once() -> None:
+    async def main() -> None:
+        engine = FakeEngine(lambda query: [PLAYER])
+        db = client(engine, auto_batch=True)
+
+        first, second, third = await asyncio.gather(
+            db.player.find_many(),
+            db.player.find_many(),
+            db.player.find_many(take=1),
+        )
+
+        assert len(engine.requests) == 1
+        assert len(engine.requests[0]['batch']) == 2
+        assert first == second == third
+        # every caller gets its own models
+        assert first[0] is not second[0]
+
+    asyncio.run(main())
+
+
+def test_batches_are_sent_through_the_dispatcher() -> None:
+    async def main() -> None:
+        engine = FakeEngine()
+        dispatcher = QueryDispatcher(max_concurrency=1)
+        db = client(engine, dispatcher=dispatcher)
+
+        async with db.batch_() as batch:
+            first = batch.player.update_many(data={'rating': 1}, where={})
+            second = batch.rank.delete_many(where={})
+
+        assert dispatcher.stats().dispatched == 1
+        assert engine.requests[0]['transaction'] is True
+        assert first.value == second.value == 0
+
+    asyncio.run(main())
+
+
+def test_results_are_routed_to_their_callers() -> None:
+    def respond(query: str) -> Any:
+        return [{'id': 2, 'name': 'rank', 'min_rating': 0}] if 'Rank' in query else [PLAYER]
+
+    async def main() -> None:
+        engine = FakeEngine(respond)
+        db = client(engine, auto_batch=True)
+
+        players, ranks = await asyncio.gather(db.player.find_many(), db.rank.find_many())
+
+        assert len(engine.requests) == 1
+        assert [player.id for player in players] == [1]
+        assert [rank.id for rank in ranks] == [2]
+
+    asyncio.run(main())
+
+
+def test_a_single_query_is_not_batched() -> None:
+    async def main() -> None:
+        engine = FakeEngine()
+        db = client(engine, auto_batch=True)
+
+        assert await db.player.find_many() == []
+        assert 'batch' not in engine.requests[0]
+
+    asyncio.run(main())
+
+
+def test_full_batches_are_sent_immediately() -> None:
+    async def main() -> None:
+        engine = FakeEngine()
+        batcher = AutoBatcher(max_batch_size=2)
+
+        async def send(content: bytes) -> Any:
+            return await engine.query(content, tx_id=None)
+
+        queries = [f'{{"query": "query {{result: findManyPlayer(take: {i}){{id}}}}"}}'.encode() for i in range(5)]
+        await asyncio.gather(*(batcher.query(query, send=send, send_batch=send) for query in queries))
+
+        assert [len(request['batch']) if 'batch' in request else 1 for request in engine.requests] == [2, 2, 1]
+
+    asyncio.run(main())
+
+
+def test_errors_only_fail_their_own_query() -> None:
+    def respond(query: str) -> Any:
+        return Failure('P2025') if 'Rank' in query else []
+
+    async def main() -> None:
+        engine = FakeEngine(respond)
+        db = client(engine, auto_batch=True)
+
+        players, ranks = await asyncio.gather(db.player.find_many(), db.rank.find_many(), return_exceptions=True)
+
+        assert players == []
+        assert isinstance(ranks, errors.RecordNotFoundError)
+
+    asyncio.run(main())
+
+
+def test_batch_operations_fail_on_their_own_without_a_transaction() -> None:
+    def respond(query: str) -> Any:
+        return Failure('P2025') if 'Rank' in query else {'count': 3}
+
+    async def main() -> None:
+        db = client(FakeEngine(respond))
+
+        async with db.batch_(transaction=False) as batch:
+            players = batch.player.update_many(data={'rating': 1}, where={})
+            ranks = batch.rank.delete_many(where={})
+
+        assert players.ok and players.value == 3
+        assert isinstance(ranks.error, errors.RecordNotFoundError)
+        with pytest.raises(errors.RecordNotFoundError):
+            ranks.value
+
+    asyncio.run(main())
+
+
+class ShortEngine(FakeEngine):
+    async def query(self, content: Union[str, bytes], *, tx_id: Optional[str]) -> Any:
+        response = await super().query(content, tx_id=tx_id)
+        if 'batchResult' in response:
+            response['batchResult'].pop()
+        return response
+
+
+def test_missing_batch_results_are_an_error() -> None:
+    async def main() -> None:
+        db = client(ShortEngine(), auto_batch=True)
+
+        results = await asyncio.gather(db.player.find_many(), db.rank.find_many(), return_exceptions=True)
+        assert all(isinstance(result, errors.BatchResultMismatchError) for result in results)
+
+        with pytest.raises(errors.BatchResultMismatchError, match='returned 1 results for a batch of 2'):
+            async with db.batch_() as batch:
+                batch.player.update_many(data={'rating': 1}, where={})
+                batch.rank.delete_many(where={})
+
+    asyncio.run(main())
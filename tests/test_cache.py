@@ -0,0 +1,148 @@
+import time
+import asyncio
+
+import pytest
+from pydantic import BaseModel
+
+from miniature.prisma import Prisma, QueryCache
+from miniature.prisma._cache import related_models
+from miniature.prisma.models import Rank, Player
+
+from .fakes import FakeEngine
+
+
+def client(engine: FakeEngine, cache: QueryCache) -> Prisma:
+    db = Prisma(hydration='trusted', cache=cache)
+    db.attach(engine)
+    return db
+
+
+class Renamed(BaseModel):
+    id: int
+
+
+def test_raw_query_with_model_invalidates_every_model() -> None:
+    async def main() -> None:
+        engine = FakeEngine(lambda query: [] if 'findMany' in query else {'columns': [], 'types': [], 'rows': []})
+        cache = QueryCache()
+        db = client(engine, cache)
+
+        await db.rank.find_many()
+        await db.rank.find_many()
+        assert len(engine.requests) == 1
+
+        # the statement is unrelated to the model its results are parsed into
+        await db.query_raw('UPDATE Rank SET name = name RETURNING id', model=Renamed)
+        await db.rank.find_many()
+        assert len(engine.requests) == 3
+        assert cache.stats().invalidations == 1
+
+    asyncio.run(main())
+
+
+def test_results_expire(monkeypatch: pytest.MonkeyPatch) -> None:
+    now = time.monotonic()
+    monkeypatch.setattr(time, 'monotonic', lambda: now)
+    cache = QueryCache(ttl=10)
+    cache.set(('key',), {'data': 1}, model='Player', version=cache.version)
+
+    now += 9
+    assert cache.get(('key',)) == {'data': 1}
+
+    now += 1
+    assert cache.get(('key',)) is None
+    assert cache.stats().evictions == 1
+
+
+def test_least_recently_used_results_are_evicted() -> None:
+    cache = QueryCache(max_size=2)
+    for key in ('a', 'b'):
+        cache.set((key,), key, model='Player', version=cache.version)
+
+    cache.get(('a',))
+    cache.set(('c',), 'c', model='Player', version=cache.version)
+
+    assert cache.get(('a',)) == 'a'
+    assert cache.get(('b',)) is None
+    assert cache.get(('c',)) == 'c'
+    assert cache.stats().size == 2
+
+
+def test_results_fetched_during_an_invalidation_are_not_stored() -> None:
+    cache = QueryCache()
+    version = cache.version
+    # e.g. a write finished while the read was in-flight
+    cache.invalidate(['Player'])
+    cache.set(('key',), 'stale', model='Player', version=version)
+
+    assert cache.get(('key',)) is None
+    assert cache.stats().size == 0
+
+
+def test_invalidation_only_drops_the_given_models() -> None:
+    cache = QueryCache()
+    cache.set(('player',), 1, model='Player', version=cache.version)
+    cache.set(('rank',), 2, model='Rank', version=cache.version)
+
+    cache.invalidate(['Player'])
+
+    assert cache.get(('player',)) is None
+    assert cache.get(('rank',)) == 2
+    assert cache.stats().invalidations == 1
+
+
+def test_cached_results_are_copies() -> None:
+    cache = QueryCache()
+    cache.set(('key',), {'rows': [1]}, model='Player', version=cache.version)
+
+    cache.get(('key',))['rows'].append(2)  # type: ignore[index]
+
+    assert cache.get(('key',)) == {'rows': [1]}
+
+
+def test_related_models() -> None:
+    assert related_models(Player) == related_models(Rank) == {'Player', 'Rank'}
+
+
+def test_mutations_invalidate_related_reads() -> None:
+    async def main() -> None:
+        engine = FakeEngine()
+        db = client(engine, QueryCache())
+
+        await db.rank.find_many()
+        await db.player.update_many(data={'rating': 1}, where={})
+        await db.rank.find_many()
+
+        assert len(engine.requests) == 3
+
+    asyncio.run(main())
+
+
+def test_reads_within_transactions_are_not_cached() -> None:
+    async def main() -> None:
+        engine = FakeEngine()
+        cache = QueryCache()
+        db = client(engine, cache)
+
+        async with db.tx() as tx:
+            await tx.player.find_many()
+            await tx.player.find_many()
+
+        assert len(engine.requests) == 2
+        assert cache.stats().size == 0
+
+    asyncio.run(main())
+
+
+def test_pages_are_not_cached() -> None:
+    async def main() -> None:
+        engine = FakeEngine(lambda query: [] if 'cursor' in query else [{'id': 1, 'name': 'a', 'rating': 1, 'rank_id': None}])
+        cache = QueryCache()
+        db = client(engine, cache)
+
+        pages = [page async for page in db.player.iter_batches(batch_size=1)]
+
+        assert [len(page) for page in pages] == [1]
+        assert cache.stats() == (0, 0, 0, 0, 0)
+
+    asyncio.run(main())
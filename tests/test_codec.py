@@ -0,0 +1,49 @@
+import math
+from typing import Any
+
+import pytest
+
+from miniature.prisma import _codec
+from miniature.prisma._codec import CODECS, JSONCodec
+
+
+def codec(name: str) -> JSONCodec:
+    try:
+        return CODECS[name]()
+    except ImportError:
+        pytest.skip(f'{name} is not installed')
+
+
+@pytest.fixture(params=sorted(CODECS))
+def any_codec(request: Any) -> JSONCodec:
+    return codec(request.param)
+
+
+@pytest.mark.parametrize('value', [math.nan, math.inf, -math.inf])
+@pytest.mark.parametrize('shape', [lambda v: v, lambda v: {'where': {'rating': v}}, lambda v: [1, [None, v]]])
+def test_non_finite_floats_are_rejected(any_codec: JSONCodec, value: float, shape: Any) -> None:
+    with pytest.raises(ValueError, match='Out of range float values are not JSON compliant'):
+        any_codec.dumpb(shape(value))
+    with pytest.raises(ValueError, match='Out of range float values are not JSON compliant'):
+        any_codec.dumps(shape(value))
+
+
+def test_codecs_encode_the_same_values(any_codec: JSONCodec) -> None:
+    data = {'name': 'ünïcode', 'rating': 1.5, 'rank': None, 'ids': [1, 2**70], 'text': 'null'}
+
+    assert any_codec.loads(any_codec.dumpb(data)) == data
+    assert any_codec.loads(any_codec.dumps(data)) == JSONCodec().loads(JSONCodec().dumpb(data))
+
+
+def test_default_is_used(any_codec: JSONCodec) -> None:
+    assert any_codec.loads(any_codec.dumpb({'value': {1, 2}}, default=sorted)) == {'value': [1, 2]}
+
+
+def test_set_codec() -> None:
+    previous = _codec.set_codec('stdlib')
+    try:
+        assert _codec.get_codec().name == 'stdlib'
+        with pytest.raises(ValueError, match="Unknown JSON codec 'simdjson'"):
+            _codec.set_codec('simdjson')
+    finally:
+        _codec.set_codec(previous)
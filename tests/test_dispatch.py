@@ -0,0 +1,150 @@
+import asyncio
+
+import pytest
+
+from miniature.prisma import QueryDispatcher
+
+from .fakes import FakeEngine
+
+QUERY = b'{"query": "query {result: findManyPlayer{id}}"}'
+
+
+def read(dispatcher: QueryDispatcher, engine: FakeEngine, content: bytes = QUERY, **kwargs):
+    kwargs.setdefault('tx_id', None)
+    kwargs.setdefault('method', 'find_many')
+    return dispatcher.query(engine, content, **kwargs)
+
+
+def test_identical_reads_are_coalesced() -> None:
+    async def main() -> None:
+        engine = FakeEngine(lambda query: [{'id': 1}], delay=0.01)
+        dispatcher = QueryDispatcher()
+
+        results = await asyncio.gather(*(read(dispatcher, engine) for _ in range(5)))
+
+        assert len(engine.requests) == 1
+        assert dispatcher.stats().coalesced == 4
+        assert all(result == {'data': {'result': [{'id': 1}]}} for result in results)
+        # every caller gets its own copy
+        assert len({id(result) for result in results}) == 5
+
+    asyncio.run(main())
+
+
+def test_different_reads_are_not_coalesced() -> None:
+    async def main() -> None:
+        engine = FakeEngine(delay=0.01)
+        dispatcher = QueryDispatcher()
+
+        await asyncio.gather(
+            read(dispatcher, engine),
+            read(dispatcher, engine, b'{"query": "query {result: findManyRank{id}}"}'),
+        )
+
+        assert len(engine.requests) == 2
+
+    asyncio.run(main())
+
+
+def test_reads_with_different_versions_are_not_coalesced() -> None:
+    async def main() -> None:
+        engine = FakeEngine(delay=0.01)
+        dispatcher = QueryDispatcher()
+
+        await asyncio.gather(read(dispatcher, engine, version=1), read(dispatcher, engine, version=2))
+
+        assert len(engine.requests) == 2
+
+    asyncio.run(main())
+
+
+def test_reads_do_not_join_queries_sent_before_a_write() -> None:
+    async def main() -> None:
+        engine = FakeEngine(delay=0.02)
+        dispatcher = QueryDispatcher()
+
+        before = asyncio.ensure_future(read(dispatcher, engine))
+        await asyncio.sleep(0.005)
+        dispatcher.mutated()
+        after = [asyncio.ensure_future(read(dispatcher, engine)) for _ in range(2)]
+        await asyncio.gather(before, *after)
+
+        # the reads after the write share a new query
+        assert len(engine.requests) == 2
+        assert dispatcher.stats().coalesced == 1
+        assert dispatcher.stats().in_flight == 0
+
+    asyncio.run(main())
+
+
+def test_writes_and_transactions_are_never_coalesced() -> None:
+    async def main() -> None:
+        engine = FakeEngine(delay=0.01)
+        dispatcher = QueryDispatcher()
+
+        await asyncio.gather(
+            read(dispatcher, engine, method='update_many'),
+            read(dispatcher, engine, method='update_many'),
+            read(dispatcher, engine, tx_id='tx-1'),
+            read(dispatcher, engine, tx_id='tx-1'),
+        )
+
+        assert len(engine.requests) == 4
+        assert sorted(engine.tx_ids, key=str) == [None, None, 'tx-1', 'tx-1']
+
+    asyncio.run(main())
+
+
+def test_concurrency_is_limited() -> None:
+    async def main() -> None:
+        engine = FakeEngine(delay=0.01)
+        dispatcher = QueryDispatcher(max_concurrency=2)
+
+        await asyncio.gather(*(read(dispatcher, engine, method='update_many') for _ in range(6)))
+
+        stats = dispatcher.stats()
+        assert engine.max_in_flight == 2
+        assert stats.dispatched == 6
+        assert stats.max_queued == 4
+        assert stats.queued == stats.in_flight == 0
+
+    asyncio.run(main())
+
+
+def test_followers_retry_when_the_leader_is_cancelled() -> None:
+    async def main() -> None:
+        engine = FakeEngine(delay=0.02)
+        dispatcher = QueryDispatcher()
+
+        leader = asyncio.ensure_future(read(dispatcher, engine))
+        await asyncio.sleep(0.005)
+        follower = asyncio.ensure_future(read(dispatcher, engine))
+        await asyncio.sleep(0.005)
+        leader.cancel()
+
+        assert await follower == {'data': {'result': []}}
+        assert leader.cancelled()
+        assert len(engine.requests) == 2
+
+    asyncio.run(main())
+
+
+def test_errors_are_raised_to_every_caller() -> None:
+    def respond(query: str) -> None:
+        raise RuntimeError('engine failed')
+
+    async def main() -> None:
+        engine = FakeEngine(respond, delay=0.01)
+        dispatcher = QueryDispatcher()
+
+        results = await asyncio.gather(read(dispatcher, engine), read(dispatcher, engine), return_exceptions=True)
+
+        assert len(engine.requests) == 1
+        assert all(isinstance(result, RuntimeError) for result in results)
+
+    asyncio.run(main())
+
+
+def test_max_concurrency_must_be_positive() -> None:
+    with pytest.raises(ValueError):
+        QueryDispatcher(max_concurrency=0)
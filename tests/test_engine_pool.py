@@ -0,0 +1,130 @@
+import asyncio
+from typing import Any, List, Optional
+
+import pytest
+
+from miniature.prisma.engine._pool import AsyncEnginePool, merge_metrics
+
+from .fakes import FakeEngine
+
+QUERY = b'{"query": "query {result: findManyPlayer{id}}"}'
+
+
+class Member(FakeEngine):
+    def __init__(self, name: str, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.name = name
+        self.finished: List[str] = []
+
+    async def start_transaction(self, *, content: str) -> str:
+        return f'{self.name}-{await super().start_transaction(content=content)}'
+
+    async def commit_transaction(self, tx_id: str) -> None:
+        self.finished.append(tx_id)
+
+    async def rollback_transaction(self, tx_id: str) -> None:
+        self.finished.append(tx_id)
+
+
+class Failing(Member):
+    async def query(self, content: Any, *, tx_id: Optional[str]) -> Any:
+        await super().query(content, tx_id=tx_id)
+        raise RuntimeError('engine crashed')
+
+
+def test_an_empty_pool_is_rejected() -> None:
+    with pytest.raises(ValueError, match='at least one engine'):
+        AsyncEnginePool([])
+
+
+def test_queries_go_to_the_least_busy_engine() -> None:
+    async def main() -> None:
+        engines = [Member('a', delay=0.05), Member('b', delay=0.05), Member('c', delay=0.05)]
+        pool = AsyncEnginePool(engines)
+
+        await asyncio.gather(*(pool.query(QUERY, tx_id=None) for _ in range(6)))
+
+        assert [len(engine.requests) for engine in engines] == [2, 2, 2]
+        assert [engine.max_in_flight for engine in engines] == [2, 2, 2]
+        assert pool.outstanding() == [0, 0, 0]
+
+    asyncio.run(main())
+
+
+def test_a_busy_engine_is_skipped() -> None:
+    async def main() -> None:
+        slow, fast = Member('slow', delay=0.1), Member('fast')
+        pool = AsyncEnginePool([slow, fast])
+
+        pending = asyncio.ensure_future(pool.query(QUERY, tx_id=None))
+        await asyncio.sleep(0.01)
+        assert pool.outstanding() == [1, 0]
+
+        for _ in range(3):
+            await pool.query(QUERY, tx_id=None)
+        await pending
+
+        assert len(slow.requests) == 1
+        assert len(fast.requests) == 3
+
+    asyncio.run(main())
+
+
+def test_transactions_are_pinned_to_their_engine() -> None:
+    async def main() -> None:
+        engines = [Member('a'), Member('b')]
+        pool = AsyncEnginePool(engines)
+
+        first = await pool.start_transaction(content='{}')
+        second = await pool.start_transaction(content='{}')
+        assert (first, second) == ('a-tx-1', 'b-tx-1')
+
+        for _ in range(3):
+            await pool.query(QUERY, tx_id=second)
+        await pool.commit_transaction(second)
+        await pool.rollback_transaction(first)
+
+        assert engines[0].tx_ids == []
+        assert engines[1].tx_ids == [second] * 3
+        assert [engine.finished for engine in engines] == [[first], [second]]
+        assert pool._pinned == {}
+
+    asyncio.run(main())
+
+
+def test_failed_queries_are_released() -> None:
+    async def main() -> None:
+        pool = AsyncEnginePool([Failing('a'), Failing('b')])
+
+        for _ in range(4):
+            with pytest.raises(RuntimeError, match='engine crashed'):
+                await pool.query(QUERY, tx_id=None)
+
+        assert pool.outstanding() == [0, 0]
+
+    asyncio.run(main())
+
+
+def test_metrics_of_every_engine_are_summed() -> None:
+    def metrics(counter: int, count: int) -> Any:
+        return {
+            'counters': [{'key': 'queries', 'labels': {'x': '1'}, 'value': counter, 'description': ''}],
+            'gauges': [],
+            'histograms': [
+                {
+                    'key': 'duration',
+                    'labels': {},
+                    'value': {'sum': 1.5, 'count': count, 'buckets': [[0, 1], [10, count]]},
+                    'description': '',
+                }
+            ],
+        }
+
+    first, second = metrics(2, 3), metrics(5, 1)
+    merged = merge_metrics([first, second])
+
+    assert merged['counters'][0]['value'] == 7
+    assert merged['histograms'][0]['value'] == {'sum': 3.0, 'count': 4, 'buckets': [[0, 2], [10, 4]]}
+    assert merged['gauges'] == []
+    # the responses of the engines are left untouched
+    assert first['histograms'][0]['value']['buckets'] == [[0, 1], [10, 3]]
@@ -0,0 +1,110 @@
+import asyncio
+from typing import Any, Dict, List, Optional, NamedTuple
+
+import pytest
+
+from miniature.prisma._pagination import paginate, cursor_order, async_paginate
+
+
+class Record(NamedTuple):
+    id: int
+
+
+RECORDS = [Record(i) for i in range(1, 8)]
+
+
+def fetch_page(cursor: Optional[Dict[str, Any]], batch_size: int) -> List[Record]:
+    start = 0 if cursor is None else next(i for i, r in enumerate(RECORDS) if r.id == cursor['id']) + 1
+    return RECORDS[start : start + batch_size]
+
+
+def test_cursor_order_appends_the_key_as_a_tie_breaker() -> None:
+    assert cursor_order(None, 'id') == [{'id': 'asc'}]
+    assert cursor_order({'rating': 'desc'}, 'id') == [{'rating': 'desc'}, {'id': 'asc'}]
+    assert cursor_order([{'id': 'desc'}], 'id') == [{'id': 'desc'}]
+
+
+def test_pages_continue_after_the_previous_cursor() -> None:
+    cursors: List[Optional[Dict[str, Any]]] = []
+
+    def fetch(cursor: Optional[Dict[str, Any]]) -> List[Record]:
+        cursors.append(cursor)
+        return fetch_page(cursor, 3)
+
+    pages = list(paginate(fetch, key='id', batch_size=3))
+
+    assert [[r.id for r in page] for page in pages] == [[1, 2, 3], [4, 5, 6], [7]]
+    assert cursors == [None, {'id': 3}, {'id': 6}]
+
+
+def test_an_exactly_full_last_page_needs_one_more_fetch() -> None:
+    calls = []
+
+    def fetch(cursor: Optional[Dict[str, Any]]) -> List[Record]:
+        calls.append(cursor)
+        return fetch_page(cursor, 7)
+
+    assert [len(page) for page in paginate(fetch, key='id', batch_size=7)] == [7]
+    assert calls == [None, {'id': 7}]
+
+
+def test_batch_size_must_be_positive() -> None:
+    with pytest.raises(ValueError):
+        list(paginate(lambda cursor: [], key='id', batch_size=0))
+
+
+def test_async_pages_match_sync_pages() -> None:
+    async def fetch(cursor: Optional[Dict[str, Any]]) -> List[Record]:
+        await asyncio.sleep(0)
+        return fetch_page(cursor, 3)
+
+    async def main() -> None:
+        for prefetch in (True, False):
+            pages = [page async for page in async_paginate(fetch, key='id', batch_size=3, prefetch=prefetch)]
+            assert [[r.id for r in page] for page in pages] == [[1, 2, 3], [4, 5, 6], [7]]
+
+    asyncio.run(main())
+
+
+def test_the_next_page_is_prefetched() -> None:
+    started: List[Optional[Dict[str, Any]]] = []
+
+    async def fetch(cursor: Optional[Dict[str, Any]]) -> List[Record]:
+        started.append(cursor)
+        await asyncio.sleep(0)
+        return fetch_page(cursor, 3)
+
+    async def main() -> None:
+        pages = async_paginate(fetch, key='id', batch_size=3, prefetch=True)
+        await pages.__anext__()
+        await asyncio.sleep(0)
+
+        # the second page was requested while the first one was being consumed
+        assert started == [None, {'id': 3}]
+        await pages.aclose()
+
+    asyncio.run(main())
+
+
+def test_the_prefetched_page_is_cancelled_when_iteration_stops() -> None:
+    cancelled = []
+
+    async def fetch(cursor: Optional[Dict[str, Any]]) -> List[Record]:
+        if cursor is not None:
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(cursor)
+                raise
+        return fetch_page(cursor, 3)
+
+    async def main() -> None:
+        pages = async_paginate(fetch, key='id', batch_size=3, prefetch=True)
+        await pages.__anext__()
+        await asyncio.sleep(0)
+        await pages.aclose()
+        await asyncio.sleep(0)
+
+        assert cancelled == [{'id': 3}]
+
+    asyncio.run(main())
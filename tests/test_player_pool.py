@@ -0,0 +1,120 @@
+import random
+import threading
+from typing import List, Optional
+
+import pytest
+
+from miniature.libs.pool import PlayerPool, PoolPlayer
+
+
+def player(id: int, rating: int, rank_id: Optional[int] = None) -> PoolPlayer:
+    return PoolPlayer(id=id, name=f'player {id}', rating=rating, rank_id=rank_id, rank_name='Unranked')
+
+
+def ids(players: List[PoolPlayer]) -> List[int]:
+    return [p.id for p in players]
+
+
+def test_players_are_ordered_by_rating_then_id() -> None:
+    pool = PlayerPool([player(3, 1500), player(1, 1500), player(2, 900), player(4, 2500)])
+    pool.insert(player(0, 1500))
+
+    assert ids(list(pool)) == [2, 0, 1, 3, 4]
+    assert list(pool.ratings) == [900, 1500, 1500, 1500, 2500]
+    assert list(pool.ids) == [2, 0, 1, 3, 4]
+    assert len(pool) == 5
+
+
+def test_windows_are_inclusive() -> None:
+    pool = PlayerPool(player(i, rating) for i, rating in enumerate([500, 999, 1000, 2000, 2001, 3000]))
+
+    assert ids(pool.window(999, 2000)) == [1, 2, 3]
+    assert ids(pool.window(high=999)) == [0, 1]
+    assert ids(pool.window(low=2001)) == [4, 5]
+    assert pool.window(2500, 1000) == []
+    assert pool.count(1000, 2001) == 3
+    assert pool.count(2500, 1000) == 0
+    assert pool.count() == 6
+
+
+def test_buckets() -> None:
+    pool = PlayerPool(player(i, rating) for i, rating in enumerate([500, 999, 1000, 2000, 2001]))
+
+    assert ids(pool.bucket('All')) == [0, 1, 2, 3, 4]
+    assert ids(pool.bucket('Low')) == [0, 1]
+    assert ids(pool.bucket('Mid')) == [2, 3]
+    assert ids(pool.bucket('High')) == [4]
+    with pytest.raises(ValueError, match="Unknown rating bucket 'Top'"):
+        pool.bucket('Top')
+
+
+def test_inserting_a_pooled_player_replaces_it() -> None:
+    pool = PlayerPool([player(1, 1000), player(2, 1200)])
+
+    pool.insert(player(1, 1500))
+    pool.update(player(2, 1200, rank_id=7))
+
+    assert len(pool) == 2
+    assert list(pool.ratings) == [1200, 1500]
+    assert pool.get(2) == player(2, 1200, rank_id=7)
+
+
+def test_patch() -> None:
+    pool = PlayerPool([player(1, 1000), player(2, 1200)])
+
+    patched = pool.patch(1, rating=1300, name='renamed')
+
+    assert patched == pool.get(1)
+    assert patched is not None and (patched.name, patched.rating) == ('renamed', 1300)
+    assert ids(list(pool)) == [2, 1]
+    assert pool.patch(3, rating=1) is None
+    assert 3 not in pool
+
+
+def test_delete() -> None:
+    pool = PlayerPool([player(1, 1000), player(2, 1000), player(3, 1000)])
+
+    assert pool.delete(2) == player(2, 1000)
+    assert pool.delete(2) is None
+    assert ids(list(pool)) == [1, 3]
+    assert 2 not in pool and 1 in pool
+
+
+def test_reads_are_copies() -> None:
+    pool = PlayerPool([player(1, 1000)])
+    ratings, players = pool.ratings, pool.window()
+
+    pool.insert(player(2, 500))
+
+    assert list(ratings) == [1000]
+    assert ids(players) == [1]
+
+
+def test_concurrent_mutations() -> None:
+    pool = PlayerPool(player(i, 1000) for i in range(200))
+
+    def mutate(seed: int) -> None:
+        rng = random.Random(seed)
+        for _ in range(500):
+            player_id = rng.randrange(200)
+            action = rng.random()
+            if action < 0.4:
+                pool.patch(player_id, rating=rng.randint(0, 3000))
+            elif action < 0.6:
+                pool.delete(player_id)
+            elif action < 0.8:
+                pool.insert(player(player_id, rng.randint(0, 3000)))
+            else:
+                pool.count(rng.randint(0, 1500), rng.randint(1500, 3000))
+
+    threads = [threading.Thread(target=mutate, args=(seed,)) for seed in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    players = list(pool)
+    assert sorted(ids(players)) == sorted(set(ids(players)))
+    assert [(p.rating, p.id) for p in players] == sorted((p.rating, p.id) for p in players)
+    assert list(pool.ratings) == [p.rating for p in players]
+    assert all(pool.get(p.id) == p for p in players)